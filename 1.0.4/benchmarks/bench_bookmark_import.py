@@ -0,0 +1,67 @@
+"""
+Aether Browser - Bookmark Import Benchmark
+Times bulk import and export of a large generated bookmark file
+
+Usage: python benchmarks/bench_bookmark_import.py [count]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.storage import Storage
+
+
+def write_netscape_file(path: str, count: int, per_folder: int = 500):
+    """Write a Netscape bookmark file with count bookmarks spread over folders"""
+    now = int(time.time())
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("<!DOCTYPE NETSCAPE-Bookmark-file-1>\n<TITLE>Bookmarks</TITLE>\n"
+                "<H1>Bookmarks</H1>\n<DL><p>\n")
+        for i in range(count):
+            if i % per_folder == 0:
+                if i:
+                    f.write("    </DL><p>\n")
+                f.write(f'    <DT><H3 ADD_DATE="{now}">Folder {i // per_folder}</H3>\n    <DL><p>\n')
+            f.write(f'        <DT><A HREF="https://site{i % 5000}.example.com/page/{i}" '
+                    f'ADD_DATE="{now - i}">Bookmark number {i}</A>\n')
+        f.write("    </DL><p>\n</DL><p>\n")
+
+
+def timed(label: str, func):
+    """Run func and print how long it took"""
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<28} {time.perf_counter() - start:8.3f} s")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        source = os.path.join(work_dir, "bookmarks.html")
+        write_netscape_file(source, count)
+        print(f"{count} bookmarks, {os.path.getsize(source) / 1e6:.1f} MB source file")
+
+        storage = Storage(os.path.join(work_dir, "html"))
+        added = timed("import Netscape HTML", lambda: storage.import_bookmarks(source))
+        assert added == count, added
+
+        exported_html = os.path.join(work_dir, "export.html")
+        exported_json = os.path.join(work_dir, "export.json")
+        timed("export Netscape HTML", lambda: storage.export_bookmarks(exported_html))
+        timed("export JSON", lambda: storage.export_bookmarks(exported_json))
+
+        storage = Storage(os.path.join(work_dir, "json"))
+        added = timed("import JSON", lambda: storage.import_bookmarks(exported_json))
+        assert added == count, added
+
+        timed("reload store from disk", lambda: Storage(os.path.join(work_dir, "json")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Aether Browser - Storage Benchmark
+Simulates browsing against each storage backend at several history sizes and
+reports per-operation latency percentiles, bytes written and startup time
+
+Usage: python benchmarks/bench_storage.py [--sizes 1000,100000,1000000]
+                                          [--ops 2000] [--backends sqlite,json]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.storage import Storage
+from core.autocomplete import AutocompleteIndex
+
+
+# The JSON backend rewrites whole files on every change; past this size a
+# run takes hours, so it is skipped unless --json-max is raised
+JSON_MAX_ENTRIES = 100000
+
+# Share of each operation in the simulated session
+OPERATION_MIX = (
+    ("visit", 0.45),
+    ("title_update", 0.15),
+    ("is_bookmarked", 0.15),
+    ("get_setting", 0.15),
+    ("bookmark_toggle", 0.05),
+    ("search_history", 0.05),
+)
+
+
+class JsonStorage:
+    """The JSON-file storage of earlier versions, for comparison.
+
+    Every change loads the whole file, modifies it and writes it back. Unlike
+    the original it keeps all history instead of the last 1000 entries, so
+    its cost at larger sizes is visible.
+    """
+
+    def __init__(self, storage_dir: str):
+        self.storage_dir = Path(storage_dir)
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.settings_file = self.storage_dir / "settings.json"
+        self.history_file = self.storage_dir / "history.json"
+        self.bookmarks_file = self.storage_dir / "bookmarks.json"
+        if not self.settings_file.exists():
+            self._write(self.settings_file, {"dark_mode": False, "default_zoom": 1.0})
+
+    def _read(self, path: Path, default):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return default
+
+    def _write(self, path: Path, data):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def load_settings(self) -> dict:
+        return self._read(self.settings_file, {})
+
+    def get_setting(self, key: str, default=None):
+        return self.load_settings().get(key, default)
+
+    def load_history(self) -> list:
+        return self._read(self.history_file, [])
+
+    def add_history_entry(self, url: str, title: str, typed: bool = False):
+        history = self.load_history()
+        history.insert(0, {"url": url, "title": title,
+                           "timestamp": datetime.now().isoformat()})
+        self._write(self.history_file, history)
+
+    def update_history_title(self, url: str, title: str):
+        history = self.load_history()
+        for entry in history:
+            if entry["url"] == url:
+                entry["title"] = title
+                break
+        self._write(self.history_file, history)
+
+    def search_history(self, query: str, limit: int = 50) -> list:
+        query = query.lower()
+        return [
+            entry for entry in self.load_history()
+            if query in entry["url"].lower() or query in entry["title"].lower()
+        ][:limit]
+
+    def load_bookmarks(self) -> list:
+        return self._read(self.bookmarks_file, [])
+
+    def add_bookmark(self, url: str, title: str):
+        bookmarks = self.load_bookmarks()
+        bookmarks.append({"url": url, "title": title})
+        self._write(self.bookmarks_file, bookmarks)
+
+    def remove_bookmark(self, url: str):
+        bookmarks = [b for b in self.load_bookmarks() if b["url"] != url]
+        self._write(self.bookmarks_file, bookmarks)
+
+    def is_bookmarked(self, url: str) -> bool:
+        return any(b["url"] == url for b in self.load_bookmarks())
+
+
+def open_sqlite(storage_dir: str):
+    """Open the SQLite storage the way the browser does at startup"""
+    storage = Storage(storage_dir)
+    AutocompleteIndex(storage).load()
+    return storage
+
+
+def open_json(storage_dir: str):
+    """Open the JSON storage the way earlier versions did at startup"""
+    storage = JsonStorage(storage_dir)
+    storage.load_settings()
+    storage.load_history()
+    storage.load_bookmarks()
+    return storage
+
+
+def generated_history(count: int, sites: int):
+    """Legacy-format history entries, newest first, over a fixed set of sites"""
+    now = time.time()
+    for i in range(count):
+        site = int(random.paretovariate(1.2)) % sites
+        yield {
+            "url": f"https://site{site}.example.com/page/{i % 50}",
+            "title": f"Page {i % 50} of site {site}",
+            "timestamp": now - i * 30,
+        }
+
+
+def populate_sqlite(storage_dir: str, count: int, sites: int):
+    """Fill a fresh SQLite store with count visits"""
+    storage = Storage(storage_dir)
+    batch = []
+    for entry in generated_history(count, sites):
+        batch.append(entry)
+        if len(batch) >= 10000:
+            storage.history.import_entries(batch)
+            batch = []
+    storage.history.import_entries(batch)
+    storage.database.close()
+
+
+def populate_json(storage_dir: str, count: int, sites: int):
+    """Fill a fresh JSON store with count visits"""
+    storage = JsonStorage(storage_dir)
+    storage._write(storage.history_file, list(generated_history(count, sites)))
+
+
+BACKENDS = {
+    "sqlite": (populate_sqlite, open_sqlite),
+    "json": (populate_json, open_json),
+}
+
+
+def bytes_written() -> int:
+    """Bytes this process has passed to write() so far (Linux), else 0"""
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples"""
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, max(0, round(fraction * len(samples)) - 1))
+    return samples[index]
+
+
+def simulate(storage, operations: int, sites: int) -> dict:
+    """Run a browsing session; returns {operation: [latency seconds]}"""
+    names = [name for name, _ in OPERATION_MIX]
+    weights = [weight for _, weight in OPERATION_MIX]
+    latencies = {name: [] for name in names}
+    bookmarked = set()
+    recent = ["https://site0.example.com/page/0"]
+
+    for i in range(operations):
+        name = random.choices(names, weights)[0]
+        site = int(random.paretovariate(1.2)) % sites
+        url = f"https://site{site}.example.com/page/{i % 50}"
+
+        start = time.perf_counter()
+        if name == "visit":
+            storage.add_history_entry(url, "", typed=random.random() < 0.2)
+        elif name == "title_update":
+            storage.update_history_title(recent[-1], f"Title {i}")
+        elif name == "is_bookmarked":
+            storage.is_bookmarked(url)
+        elif name == "get_setting":
+            storage.get_setting("default_zoom", 1.0)
+        elif name == "bookmark_toggle":
+            if url in bookmarked:
+                storage.remove_bookmark(url)
+                bookmarked.discard(url)
+            else:
+                storage.add_bookmark(url, f"Bookmark {i}")
+                bookmarked.add(url)
+        elif name == "search_history":
+            storage.search_history(f"site{site}")
+        latencies[name].append(time.perf_counter() - start)
+
+        if name == "visit":
+            recent.append(url)
+    return latencies
+
+
+def run(backend: str, size: int, operations: int, work_dir: str) -> dict:
+    """Populate, time startup, then simulate a session for one backend and size"""
+    populate, open_storage = BACKENDS[backend]
+    sites = max(100, size // 20)
+    storage_dir = os.path.join(work_dir, f"{backend}-{size}")
+
+    start = time.perf_counter()
+    populate(storage_dir, size, sites)
+    populate_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    storage = open_storage(storage_dir)
+    startup = time.perf_counter() - start
+
+    written = bytes_written()
+    session_start = time.perf_counter()
+    latencies = simulate(storage, operations, sites)
+    session_time = time.perf_counter() - session_start
+    written = bytes_written() - written
+
+    if backend == "sqlite":
+        storage.database.close()
+    return {
+        "populate": populate_time,
+        "startup": startup,
+        "session": session_time,
+        "written": written,
+        "latencies": latencies,
+    }
+
+
+def report(backend: str, size: int, operations: int, result: dict):
+    """Print the results of one run"""
+    print(f"\n== {backend}, {size} history entries, {operations} operations ==")
+    print(f"populate {result['populate']:.2f} s   startup {result['startup'] * 1000:.1f} ms   "
+          f"session {result['session']:.2f} s   "
+          f"written {result['written'] / 1e6:.2f} MB "
+          f"({result['written'] / max(1, operations) / 1e3:.1f} KB/op)")
+    print(f"{'operation':<16} {'count':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, samples in result["latencies"].items():
+        samples = sorted(samples)
+        if not samples:
+            continue
+        print(f"{name:<16} {len(samples):>6} "
+              f"{percentile(samples, 0.50) * 1000:>9.3f} "
+              f"{percentile(samples, 0.90) * 1000:>9.3f} "
+              f"{percentile(samples, 0.99) * 1000:>9.3f} "
+              f"{samples[-1] * 1000:>9.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the storage backends")
+    parser.add_argument("--sizes", default="1000,100000,1000000",
+                        help="comma-separated history sizes")
+    parser.add_argument("--ops", type=int, default=2000,
+                        help="operations per simulated session")
+    parser.add_argument("--backends", default="sqlite,json",
+                        help="comma-separated backends: " + ", ".join(BACKENDS))
+    parser.add_argument("--json-max", type=int, default=JSON_MAX_ENTRIES,
+                        help="largest history size to run the JSON backend at")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    backends = args.backends.split(",")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in sizes:
+            for backend in backends:
+                if backend == "json" and size > args.json_max:
+                    print(f"\n== {backend}, {size} history entries: skipped (--json-max) ==")
+                    continue
+                random.seed(args.seed)
+                # Full-file rewrites make every JSON operation cost O(size)
+                operations = args.ops if backend != "json" else min(
+                    args.ops, max(50, args.ops * 1000 // size)
+                )
+                report(backend, size, operations, run(backend, size, operations, work_dir))
+
+
+if __name__ == "__main__":
+    main()
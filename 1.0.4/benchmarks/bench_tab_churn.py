@@ -0,0 +1,190 @@
+"""
+Aether Browser - Tab Churn Benchmark
+Opens and closes pages across several local sites under each renderer process
+model and reports load latency, renderer process count and renderer memory
+
+Each configuration runs in its own process because Chromium reads its flags
+once at startup. Sites are served from 127.0.0.1, 127.0.0.2, ... so Chromium
+sees them as different sites.
+
+Usage: python benchmarks/bench_tab_churn.py [--models per-site-instance,per-site,per-site-instance:4]
+                                            [--tabs 20] [--churn 100] [--sites 4]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core import process_stats
+from core.process_model import ProcessModel, FLAGS_VARIABLE
+
+
+# A page with enough DOM and script to give its renderer a realistic footprint
+PAGE = """<!DOCTYPE html>
+<html><head><title>Page {path}</title></head><body>
+<h1>Page {path}</h1>
+<div id="items"></div>
+<script>
+const items = document.getElementById("items");
+for (let i = 0; i < 2000; i++) {{
+    const row = document.createElement("p");
+    row.textContent = "Row " + i + " of {path}";
+    items.appendChild(row);
+}}
+window.cache = new Array(200000).fill(0).map((_, i) => i * 2);
+</script>
+</body></html>
+"""
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = PAGE.format(path=self.path).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_sites(count: int) -> list:
+    """Serve the test page from count loopback addresses; returns their base URLs"""
+    urls = []
+    for site in range(1, count + 1):
+        server = HTTPServer((f"127.0.0.{site}", 0), _PageHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        urls.append(f"http://127.0.0.{site}:{server.server_port}")
+    return urls
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples"""
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, max(0, round(fraction * len(samples)) - 1))
+    return samples[index]
+
+
+def churn(sites: list, tabs: int, iterations: int, seed: int) -> dict:
+    """Open tabs pages, then repeatedly close the oldest and open another (child process)"""
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QEventLoop, QTimer, QUrl
+    from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
+
+    app = QApplication([sys.argv[0]])
+    profile = QWebEngineProfile()
+    random.seed(seed)
+    open_pages = []
+    latencies = []
+    process_counts = []
+    memory = []
+
+    def load(page, url: str) -> float:
+        loop = QEventLoop()
+        page.loadFinished.connect(loop.quit)
+        QTimer.singleShot(30000, loop.quit)
+        start = time.perf_counter()
+        page.setUrl(QUrl(url))
+        loop.exec()
+        page.loadFinished.disconnect(loop.quit)
+        return time.perf_counter() - start
+
+    def sample():
+        pids = {page.renderProcessPid() for page in open_pages}
+        pids.discard(0)
+        process_counts.append(len(pids))
+        used = process_stats.total_rss_bytes(pids)
+        if used is not None:
+            memory.append(used)
+
+    for step in range(tabs + iterations):
+        if len(open_pages) >= tabs:
+            open_pages.pop(0).deleteLater()
+        page = QWebEnginePage(profile)
+        open_pages.append(page)
+        latencies.append(load(page, f"{random.choice(sites)}/page/{step}"))
+        sample()
+
+    for page in open_pages:
+        page.deleteLater()
+    app.processEvents()
+    return {
+        "latencies": latencies,
+        "process_counts": process_counts,
+        "memory": memory,
+    }
+
+
+def run(config: str, sites: list, args) -> dict:
+    """Run one configuration ("model" or "model:limit") in a fresh process"""
+    model, _, limit = config.partition(":")
+    flags = ProcessModel.flags(model, int(limit or 0))
+    env = dict(os.environ)
+    env[FLAGS_VARIABLE] = " ".join(env.get(FLAGS_VARIABLE, "").split() + flags)
+    command = [sys.executable, __file__, "--child", "--sites-urls", ",".join(sites),
+               "--tabs", str(args.tabs), "--churn", str(args.churn), "--seed", str(args.seed)]
+    child = subprocess.run(command, env=env, capture_output=True, text=True)
+    if child.returncode != 0:
+        errors = child.stderr.strip().splitlines()
+        raise RuntimeError(errors[-1] if errors else f"exit status {child.returncode}")
+    return json.loads(child.stdout.strip().splitlines()[-1])
+
+
+def report(config: str, result: dict):
+    """Print the results of one configuration"""
+    latencies = sorted(result["latencies"])
+    counts = result["process_counts"]
+    memory = result["memory"]
+    # The open-tabs phase ramps up; steady state is what churn settles at
+    steady_counts = counts[len(counts) // 2:]
+    steady_memory = memory[len(memory) // 2:]
+    print(f"{config:<26} "
+          f"{percentile(latencies, 0.50) * 1000:>8.1f} "
+          f"{percentile(latencies, 0.95) * 1000:>8.1f} "
+          f"{sum(steady_counts) / max(1, len(steady_counts)):>9.1f} "
+          f"{(sum(steady_memory) / max(1, len(steady_memory))) / 1e6:>9.0f} "
+          f"{max(memory, default=0) / 1e6:>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark renderer process models")
+    parser.add_argument("--models", default="per-site-instance,per-site,per-site-instance:4",
+                        help="comma-separated process models, each optionally :process-limit")
+    parser.add_argument("--tabs", type=int, default=20, help="pages open at once")
+    parser.add_argument("--churn", type=int, default=100,
+                        help="pages opened (and oldest closed) after the first --tabs")
+    parser.add_argument("--sites", type=int, default=4, help="distinct sites to load from")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--sites-urls", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = churn(args.sites_urls.split(","), args.tabs, args.churn, args.seed)
+        print(json.dumps(result))
+        return
+
+    sites = start_sites(args.sites)
+    print(f"{args.tabs} open pages, {args.churn} churned, {args.sites} sites")
+    print(f"{'process model':<26} {'p50 ms':>8} {'p95 ms':>8} {'processes':>9} "
+          f"{'mean MB':>9} {'peak MB':>9}")
+    for config in args.models.split(","):
+        try:
+            report(config, run(config, sites, args))
+        except RuntimeError as e:
+            print(f"{config:<26} failed: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Aether Browser - Address Bar Autocomplete
+Keeps a URL trie over history and bookmarks in sync with storage
+"""
+
+import threading
+import time
+
+from core import frecency
+from core.url_trie import UrlTrie
+
+
+class AutocompleteIndex:
+    """Frecency-ranked URL completions over history and bookmarks.
+
+    Registers itself as a storage observer so visits and bookmark changes are
+    applied to the trie as they happen instead of rebuilding it.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.trie = UrlTrie()
+        self.lock = threading.Lock()
+
+        # url -> title, and the two score sources kept per URL
+        self._titles = {}
+        self._history_scores = {}
+        self._bookmark_scores = {}
+
+        storage.add_observer(self)
+
+    def load(self):
+        """Fill the index from storage"""
+        batch = []
+        for place in self.storage.history.iter_places():
+            if place["frecency"] is not None:
+                batch.append(place)
+            if len(batch) >= 5000:
+                self._load_places(batch)
+                batch = []
+        self._load_places(batch)
+
+        for bookmark in self.storage.load_bookmarks():
+            self._set_bookmark(bookmark["url"], bookmark["title"], bookmark["date_added"])
+
+    def _load_places(self, places: list):
+        """Add a batch of history rows, rebuilding only the caches they touch"""
+        with self.lock:
+            items = []
+            for place in places:
+                url, score = place["url"], place["frecency"]
+                previous = self._history_scores.get(url)
+                if previous is not None and previous >= score:
+                    # A visit recorded while loading is newer than this row
+                    continue
+                self._history_scores[url] = score
+                if place["title"]:
+                    self._titles.setdefault(url, place["title"])
+                bookmark_score = self._bookmark_scores.get(url)
+                if bookmark_score is not None:
+                    score = max(score, bookmark_score)
+                items.append((url, score))
+            self.trie.insert_many(items)
+
+    def load_in_background(self):
+        """Fill the index without blocking the caller"""
+        thread = threading.Thread(target=self.load, daemon=True)
+        thread.start()
+        return thread
+
+    def complete(self, text: str, limit: int = 8) -> list:
+        """Best completions for typed text as {url, title, score} dicts"""
+        if not text.strip():
+            return []
+        with self.lock:
+            matches = self.trie.complete(text, limit)
+            return [
+                {
+                    "url": url,
+                    "title": self._titles.get(url, ""),
+                    "score": frecency.current_score(score)
+                }
+                for score, url in matches
+            ]
+
+    # Storage observer hooks
+    def visit_recorded(self, url: str, title: str, score: float):
+        """Apply a new visit"""
+        self._set_history(url, title, score)
+
+    def history_imported(self, places: list):
+        """Apply places ({url, title, frecency}) added in bulk"""
+        self._load_places([place for place in places if place["frecency"] is not None])
+
+    def bookmark_added(self, url: str, title: str):
+        """Apply a new bookmark"""
+        self._set_bookmark(url, title)
+
+    def bookmarks_imported(self, bookmarks: list):
+        """Apply a bulk import of (url, title, date_added)"""
+        with self.lock:
+            items = []
+            for url, title, date_added in bookmarks:
+                if url in self._bookmark_scores:
+                    continue
+                self._bookmark_scores[url] = frecency.visit_key(
+                    date_added or time.time(), frecency.VISIT_WEIGHTS["bookmark"]
+                )
+                if title:
+                    self._titles.setdefault(url, title)
+                history_score = self._history_scores.get(url)
+                score = self._bookmark_scores[url]
+                if history_score is not None:
+                    score = max(score, history_score)
+                items.append((url, score))
+            self.trie.insert_many(items)
+
+    def bookmark_removed(self, url: str):
+        """Apply a removed bookmark"""
+        with self.lock:
+            if self._bookmark_scores.pop(url, None) is None:
+                return
+            self._reindex(url)
+
+    def history_title_changed(self, url: str, title: str):
+        """Apply a late title update"""
+        with self.lock:
+            if url in self.trie and title:
+                self._titles[url] = title
+
+    def history_removed(self, urls: list):
+        """Apply URLs dropped from history by pruning"""
+        with self.lock:
+            for url in urls:
+                if self._history_scores.pop(url, None) is not None:
+                    self._reindex(url)
+
+    def history_cleared(self):
+        """Apply a full history wipe"""
+        with self.lock:
+            for url in list(self._history_scores):
+                del self._history_scores[url]
+                self._reindex(url)
+
+    def _set_history(self, url: str, title: str, score: float):
+        """Record a history score; stored frecency only grows, so keep the max"""
+        if score is None:
+            return
+        with self.lock:
+            previous = self._history_scores.get(url)
+            if previous is None or score > previous:
+                self._history_scores[url] = score
+            if title:
+                self._titles[url] = title
+            self._reindex(url)
+
+    def _set_bookmark(self, url: str, title: str, date_added: float = None):
+        """Give a bookmark a score as if it were visited when bookmarked"""
+        if date_added is None:
+            date_added = time.time()
+        with self.lock:
+            if url not in self._bookmark_scores:
+                self._bookmark_scores[url] = frecency.visit_key(
+                    date_added, frecency.VISIT_WEIGHTS["bookmark"]
+                )
+            if title and url not in self._titles:
+                self._titles[url] = title
+            self._reindex(url)
+
+    def _reindex(self, url: str):
+        """Put a URL in the trie with its best score, or drop it"""
+        scores = [
+            score for score in
+            (self._history_scores.get(url), self._bookmark_scores.get(url))
+            if score is not None
+        ]
+        if scores:
+            self.trie.insert(url, max(scores))
+        else:
+            self.trie.remove(url)
+            self._titles.pop(url, None)
@@ -0,0 +1,226 @@
+"""
+Aether Browser - Bookmark Import/Export
+Streaming readers and writers for Netscape HTML and JSON bookmark files
+"""
+
+import html
+import json
+from html.parser import HTMLParser
+
+from core.jsonstream import iter_array_items, ArrayWriter
+
+
+# Import events, consumed by BookmarkStore.import_events:
+#   ("folder", title, date_added)         opens a folder inside the current one
+#   ("end",)                              closes the current folder
+#   ("bookmark", url, title, date_added)  adds a bookmark to the current folder
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _NetscapeParser(HTMLParser):
+    """Turns Netscape bookmark HTML into import events as it is fed"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.events = []
+        # One entry per open <DL>: True if it belongs to a folder we emitted
+        self._lists = []
+        self._pending_folder = None
+        self._text = None
+        self._link = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "h3":
+            self._text = []
+            self._pending_folder = {"date_added": _to_timestamp(dict(attrs).get("add_date"))}
+        elif tag == "a":
+            attributes = dict(attrs)
+            if attributes.get("href"):
+                self._text = []
+                self._link = {
+                    "url": attributes["href"],
+                    "date_added": _to_timestamp(attributes.get("add_date"))
+                }
+        elif tag == "dl":
+            opens_folder = self._pending_folder is not None and "title" in self._pending_folder
+            if opens_folder:
+                folder = self._pending_folder
+                self.events.append(("folder", folder["title"], folder["date_added"]))
+            self._pending_folder = None
+            self._lists.append(opens_folder)
+
+    def handle_endtag(self, tag):
+        if tag == "h3" and self._pending_folder is not None:
+            self._pending_folder["title"] = "".join(self._text or []).strip()
+            self._text = None
+        elif tag == "a" and self._link is not None:
+            title = "".join(self._text or []).strip()
+            self.events.append(("bookmark", self._link["url"], title, self._link["date_added"]))
+            self._link = None
+            self._text = None
+        elif tag == "dl" and self._lists:
+            if self._lists.pop():
+                self.events.append(("end",))
+
+    def handle_data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+
+
+def iter_netscape_html(file):
+    """Yield import events from a Netscape bookmark file, reading it in chunks"""
+    parser = _NetscapeParser()
+    while True:
+        chunk = file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        parser.feed(chunk)
+        if parser.events:
+            yield from parser.events
+            parser.events = []
+    parser.close()
+    yield from parser.events
+
+
+def iter_json(file):
+    """Yield import events from a JSON bookmark export.
+
+    Our own export (a flat array of records in tree order) is streamed item by
+    item. Chrome's "Bookmarks" file and Firefox's JSON backup are nested objects
+    without a streamable layout, so those are decoded whole and then walked.
+    """
+    first = _peek_non_space(file)
+    if first == "[":
+        yield from _iter_flat_records(iter_array_items(file))
+        return
+
+    data = json.load(file)
+    if isinstance(data, dict) and "roots" in data:
+        # Chrome / Chromium-based browsers
+        for root in data["roots"].values():
+            if isinstance(root, dict):
+                yield from _iter_chrome_node(root)
+    elif isinstance(data, dict):
+        # Firefox backup
+        yield from _iter_firefox_node(data)
+
+
+def _iter_flat_records(records):
+    """Convert flat {type, id, parent, ...} records into nested events"""
+    open_folders = []
+    for record in records:
+        parent = record.get("parent")
+        while open_folders and open_folders[-1] != parent:
+            open_folders.pop()
+            yield ("end",)
+        if record.get("type") == "folder":
+            yield ("folder", record.get("title", ""), record.get("date_added"))
+            open_folders.append(record.get("id"))
+        elif record.get("url"):
+            yield ("bookmark", record["url"], record.get("title", ""), record.get("date_added"))
+    for _ in open_folders:
+        yield ("end",)
+
+
+def _iter_chrome_node(node):
+    """Walk a Chrome bookmark node"""
+    # Chrome stores times as microseconds since 1601-01-01
+    date_added = None
+    if node.get("date_added"):
+        date_added = int(node["date_added"]) / 1_000_000 - 11644473600
+    if node.get("type") == "url":
+        yield ("bookmark", node.get("url", ""), node.get("name", ""), date_added)
+    elif node.get("type") == "folder":
+        yield ("folder", node.get("name", ""), date_added)
+        for child in node.get("children", []):
+            yield from _iter_chrome_node(child)
+        yield ("end",)
+
+
+def _iter_firefox_node(node):
+    """Walk a Firefox JSON backup node"""
+    # Firefox stores times as microseconds since the Unix epoch
+    date_added = node["dateAdded"] / 1_000_000 if node.get("dateAdded") else None
+    if node.get("uri"):
+        if not node["uri"].startswith("place:"):
+            yield ("bookmark", node["uri"], node.get("title", ""), date_added)
+    elif "children" in node:
+        yield ("folder", node.get("title", ""), date_added)
+        for child in node["children"]:
+            yield from _iter_firefox_node(child)
+        yield ("end",)
+
+
+def iter_file(path):
+    """Yield import events from a bookmark file, picking the format by content"""
+    with open(path, "r", encoding="utf-8-sig") as file:
+        first = _peek_non_space(file)
+        if first in ("[", "{"):
+            yield from iter_json(file)
+        else:
+            yield from iter_netscape_html(file)
+
+
+def write_netscape_html(store, file):
+    """Stream the bookmark tree out as Netscape bookmark HTML"""
+    file.write(
+        "<!DOCTYPE NETSCAPE-Bookmark-file-1>\n"
+        '<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n'
+        "<TITLE>Bookmarks</TITLE>\n"
+        "<H1>Bookmarks</H1>\n"
+        "<DL><p>\n"
+    )
+    for depth, kind, node in store.walk():
+        indent = "    " * depth
+        if kind == "end":
+            file.write(f"{indent}</DL><p>\n")
+        elif kind == "folder":
+            file.write(
+                f'{indent}<DT><H3 ADD_DATE="{int(node["date_added"])}">'
+                f'{html.escape(node["title"])}</H3>\n{indent}<DL><p>\n'
+            )
+        else:
+            file.write(
+                f'{indent}<DT><A HREF="{html.escape(node["url"])}" '
+                f'ADD_DATE="{int(node["date_added"])}">{html.escape(node["title"])}</A>\n'
+            )
+    file.write("</DL><p>\n")
+
+
+def write_json(store, file):
+    """Stream the bookmark tree out as a flat JSON array in tree order"""
+    with ArrayWriter(file) as writer:
+        for _, kind, node in store.walk():
+            if kind == "end":
+                continue
+            record = {
+                "type": kind,
+                "id": node["id"],
+                "parent": node["parent_id"] if node["parent_id"] != store.root_id else None,
+                "title": node["title"],
+                "date_added": node["date_added"],
+            }
+            if kind == "bookmark":
+                record["url"] = node["url"]
+            writer.write(record)
+    return writer.count
+
+
+def _to_timestamp(value):
+    """Parse an ADD_DATE attribute (seconds since the epoch)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _peek_non_space(file) -> str:
+    """Return the first non-whitespace character without consuming it"""
+    position = file.tell()
+    while True:
+        char = file.read(1)
+        if not char or not char.isspace():
+            file.seek(position)
+            return char
+        position = file.tell()
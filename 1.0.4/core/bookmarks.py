@@ -0,0 +1,325 @@
+"""
+Aether Browser - Bookmark Store
+Bookmarks and folders kept in SQLite with in-memory indexes
+"""
+
+import threading
+import time
+from typing import Optional
+
+from core.database import Database
+
+
+FOLDER = "folder"
+BOOKMARK = "bookmark"
+
+ROOT_TITLE = "Bookmarks"
+
+
+class BookmarkStore:
+    """Bookmark tree with stable ids and an O(1) URL index.
+
+    The whole tree is held in memory; every change writes only the rows it
+    touches, so nothing is ever reloaded or rewritten wholesale.
+    """
+
+    def __init__(self, database: Database):
+        self.db = database
+        self.lock = threading.RLock()
+
+        # id -> node dict, folder id -> ordered child ids, url -> bookmark ids
+        self._nodes = {}
+        self._children = {}
+        self._by_url = {}
+
+        self._load()
+        self.root_id = self._ensure_root()
+
+    def _load(self):
+        """Read the tree into memory"""
+        rows = self.db.query(
+            "SELECT id, parent_id, kind, title, url, position, date_added "
+            "FROM bookmarks ORDER BY parent_id, position"
+        )
+        for row in rows:
+            node = dict(row)
+            self._nodes[node["id"]] = node
+            if node["kind"] == FOLDER:
+                self._children.setdefault(node["id"], [])
+        for row in rows:
+            if row["parent_id"] is not None:
+                self._children.setdefault(row["parent_id"], []).append(row["id"])
+            if row["kind"] == BOOKMARK:
+                self._by_url.setdefault(row["url"], []).append(row["id"])
+
+    def _ensure_root(self) -> int:
+        """Return the id of the root folder, creating it if needed"""
+        for node in self._nodes.values():
+            if node["parent_id"] is None and node["kind"] == FOLDER:
+                return node["id"]
+        with self.db.transaction() as conn:
+            return self._insert(conn, None, FOLDER, ROOT_TITLE, None)
+
+    def _insert(self, conn, parent_id: Optional[int], kind: str, title: str,
+                url: Optional[str], date_added: float = None) -> int:
+        """Insert a row and register it in the in-memory indexes"""
+        if date_added is None:
+            date_added = time.time()
+        siblings = self._children.setdefault(parent_id, []) if parent_id else []
+        position = len(siblings)
+
+        cursor = conn.execute(
+            "INSERT INTO bookmarks (parent_id, kind, title, url, position, date_added) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (parent_id, kind, title, url, position, date_added)
+        )
+        node_id = cursor.lastrowid
+        self._nodes[node_id] = {
+            "id": node_id, "parent_id": parent_id, "kind": kind, "title": title,
+            "url": url, "position": position, "date_added": date_added
+        }
+        if parent_id:
+            siblings.append(node_id)
+        if kind == FOLDER:
+            self._children.setdefault(node_id, [])
+        else:
+            self._by_url.setdefault(url, []).append(node_id)
+        return node_id
+
+    # Queries
+    def is_bookmarked(self, url: str) -> bool:
+        """Check whether a URL is bookmarked anywhere"""
+        return url in self._by_url
+
+    def find(self, url: str) -> list:
+        """All bookmarks for a URL"""
+        with self.lock:
+            return [dict(self._nodes[node_id]) for node_id in self._by_url.get(url, [])]
+
+    def get(self, node_id: int) -> Optional[dict]:
+        """A bookmark or folder by id"""
+        with self.lock:
+            node = self._nodes.get(node_id)
+            return dict(node) if node else None
+
+    def children(self, folder_id: int = None) -> list:
+        """Direct children of a folder, in order"""
+        if folder_id is None:
+            folder_id = self.root_id
+        with self.lock:
+            return [dict(self._nodes[node_id]) for node_id in self._children.get(folder_id, [])]
+
+    def all_bookmarks(self) -> list:
+        """Every bookmark (not folders) in tree order"""
+        with self.lock:
+            result = []
+            stack = list(reversed(self._children.get(self.root_id, [])))
+            while stack:
+                node = self._nodes[stack.pop()]
+                if node["kind"] == FOLDER:
+                    stack.extend(reversed(self._children.get(node["id"], [])))
+                else:
+                    result.append(dict(node))
+            return result
+
+    def walk(self, folder_id: int = None):
+        """Yield (depth, kind, node) in tree order, with ("end") after each folder.
+
+        Nodes are yielded as they are reached so large trees can be streamed.
+        """
+        if folder_id is None:
+            folder_id = self.root_id
+        with self.lock:
+            stack = [(0, node_id) for node_id in reversed(self._children.get(folder_id, []))]
+            while stack:
+                depth, node_id = stack.pop()
+                if node_id is None:
+                    yield depth, "end", None
+                    continue
+                node = self._nodes[node_id]
+                yield depth, node["kind"], dict(node)
+                if node["kind"] == FOLDER:
+                    stack.append((depth, None))
+                    stack.extend(
+                        (depth + 1, child_id)
+                        for child_id in reversed(self._children.get(node_id, []))
+                    )
+
+    def search(self, text: str, limit: int = 8) -> list:
+        """Bookmarks whose title or URL contains the text"""
+        needle = text.lower()
+        results = []
+        with self.lock:
+            for url, node_ids in self._by_url.items():
+                node = self._nodes[node_ids[0]]
+                if needle in url.lower() or needle in node["title"].lower():
+                    results.append(dict(node))
+                    if len(results) >= limit:
+                        break
+        return results
+
+    # Changes
+    def add_bookmark(self, url: str, title: str, folder_id: int = None) -> int:
+        """Bookmark a URL in a folder; returns the existing id if already there"""
+        if folder_id is None:
+            folder_id = self.root_id
+        with self.lock:
+            for node_id in self._by_url.get(url, []):
+                if self._nodes[node_id]["parent_id"] == folder_id:
+                    return node_id
+            with self.db.transaction() as conn:
+                return self._insert(conn, folder_id, BOOKMARK, title, url)
+
+    def import_events(self, events, folder_id: int = None) -> list:
+        """Insert a stream of import events (see core.bookmark_io) in one transaction.
+
+        Folders with the same title in the same place are merged and bookmarks
+        already present in a folder are skipped, so importing a file twice adds
+        nothing. Returns the newly added bookmarks as (url, title, date_added).
+        """
+        if folder_id is None:
+            folder_id = self.root_id
+        added = []
+        # parent id -> {folder title: folder id}, filled in as folders are visited
+        subfolders = {}
+        with self.lock:
+            try:
+                with self.db.transaction() as conn:
+                    folders = [folder_id]
+                    for event in events:
+                        kind = event[0]
+                        if kind == "folder":
+                            parent_id, title = folders[-1], event[1] or ""
+                            if parent_id not in subfolders:
+                                subfolders[parent_id] = {
+                                    self._nodes[child_id]["title"]: child_id
+                                    for child_id in self._children.get(parent_id, [])
+                                    if self._nodes[child_id]["kind"] == FOLDER
+                                }
+                            existing = subfolders[parent_id].get(title)
+                            if existing is None:
+                                existing = self._insert(conn, parent_id, FOLDER, title, None, event[2])
+                                subfolders[parent_id][title] = existing
+                            folders.append(existing)
+                        elif kind == "end":
+                            if len(folders) > 1:
+                                folders.pop()
+                        elif kind == "bookmark":
+                            _, url, title, date_added = event
+                            parent_id = folders[-1]
+                            if not url or any(
+                                self._nodes[node_id]["parent_id"] == parent_id
+                                for node_id in self._by_url.get(url, [])
+                            ):
+                                continue
+                            self._insert(conn, parent_id, BOOKMARK, title or "", url, date_added)
+                            added.append((url, title or "", date_added))
+            except Exception:
+                # The transaction rolled back; resync memory with the database
+                self._nodes, self._children, self._by_url = {}, {}, {}
+                self._load()
+                raise
+        return added
+
+    def add_folder(self, title: str, parent_id: int = None) -> int:
+        """Create a folder"""
+        if parent_id is None:
+            parent_id = self.root_id
+        with self.lock:
+            with self.db.transaction() as conn:
+                return self._insert(conn, parent_id, FOLDER, title, None)
+
+    def rename(self, node_id: int, title: str):
+        """Change the title of a bookmark or folder"""
+        with self.lock:
+            node = self._nodes.get(node_id)
+            if node is None or node["title"] == title:
+                return
+            self.db.execute("UPDATE bookmarks SET title = ? WHERE id = ?", (title, node_id))
+            node["title"] = title
+
+    def move(self, node_id: int, folder_id: int, position: int = None):
+        """Move a node into a folder at a position (default: the end)"""
+        with self.lock:
+            node = self._nodes.get(node_id)
+            if node is None or node_id == self.root_id or folder_id in self._subtree(node_id):
+                return
+            old_siblings = self._children[node["parent_id"]]
+            old_siblings.remove(node_id)
+            new_siblings = self._children.setdefault(folder_id, [])
+            if position is None or position > len(new_siblings):
+                position = len(new_siblings)
+            new_siblings.insert(position, node_id)
+            node["parent_id"] = folder_id
+
+            with self.db.transaction() as conn:
+                conn.execute(
+                    "UPDATE bookmarks SET parent_id = ? WHERE id = ?", (folder_id, node_id)
+                )
+                self._write_positions(conn, old_siblings)
+                if new_siblings is not old_siblings:
+                    self._write_positions(conn, new_siblings)
+
+    def remove(self, node_id: int):
+        """Delete a bookmark, or a folder with everything in it"""
+        with self.lock:
+            node = self._nodes.get(node_id)
+            if node is None or node_id == self.root_id:
+                return
+            siblings = self._children[node["parent_id"]]
+            siblings.remove(node_id)
+
+            # Rows below a folder go with it through ON DELETE CASCADE
+            with self.db.transaction() as conn:
+                conn.execute("DELETE FROM bookmarks WHERE id = ?", (node_id,))
+                self._write_positions(conn, siblings)
+            for removed_id in self._subtree(node_id):
+                self._forget(removed_id)
+
+    def remove_url(self, url: str) -> int:
+        """Delete every bookmark of a URL; returns how many were removed"""
+        with self.lock:
+            node_ids = list(self._by_url.get(url, []))
+            for node_id in node_ids:
+                self.remove(node_id)
+            return len(node_ids)
+
+    def clear(self):
+        """Delete everything except the root folder"""
+        with self.lock:
+            for node_id in list(self._children.get(self.root_id, [])):
+                self.remove(node_id)
+
+    def _subtree(self, node_id: int) -> list:
+        """A node and all of its descendants"""
+        result = []
+        stack = [node_id]
+        while stack:
+            current = stack.pop()
+            result.append(current)
+            stack.extend(self._children.get(current, []))
+        return result
+
+    def _forget(self, node_id: int):
+        """Drop a deleted node from the in-memory indexes"""
+        node = self._nodes.pop(node_id, None)
+        if node is None:
+            return
+        self._children.pop(node_id, None)
+        if node["kind"] == BOOKMARK:
+            ids = self._by_url.get(node["url"], [])
+            if node_id in ids:
+                ids.remove(node_id)
+            if not ids:
+                self._by_url.pop(node["url"], None)
+
+    def _write_positions(self, conn, siblings: list):
+        """Persist positions of a folder's children whose index changed"""
+        updates = []
+        for position, node_id in enumerate(siblings):
+            node = self._nodes[node_id]
+            if node["position"] != position:
+                node["position"] = position
+                updates.append((position, node_id))
+        if updates:
+            conn.executemany("UPDATE bookmarks SET position = ? WHERE id = ?", updates)
@@ -0,0 +1,89 @@
+"""
+Aether Browser - Database
+Shared SQLite connection used by the storage backends
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class Database:
+    """Thread-safe wrapper around a single SQLite connection"""
+
+    def __init__(self, path):
+        """Open (or create) the database at the given path"""
+        self.path = Path(path)
+        self.is_new = not self.path.exists()
+
+        # One connection shared by every store; access is serialised by the lock
+        self.connection = sqlite3.connect(
+            str(self.path),
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self.connection.row_factory = sqlite3.Row
+        self.lock = threading.RLock()
+
+        # Let history pruning hand freed pages back a few at a time; this only
+        # takes effect before the first table is created
+        if self.is_new:
+            self.connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+
+        # WAL keeps readers from blocking on the writer and makes commits cheap
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+
+    def enable_incremental_vacuum(self) -> bool:
+        """Switch a database created without incremental vacuum over to it.
+
+        That takes a full VACUUM, rewriting the whole file, so it is done
+        once at startup before anything else uses the database rather than
+        by the history pruner while the browser runs. Returns whether it ran.
+        """
+        with self.lock:
+            if self.connection.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                return False
+            self.connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            self.connection.execute("VACUUM")
+            return True
+
+    def execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        """Execute a single statement"""
+        with self.lock:
+            return self.connection.execute(sql, params)
+
+    def executescript(self, script: str):
+        """Execute several statements at once"""
+        with self.lock:
+            self.connection.executescript(script)
+
+    def query(self, sql: str, params=()) -> list:
+        """Execute a query and return all rows"""
+        with self.lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def query_one(self, sql: str, params=()):
+        """Execute a query and return the first row (or None)"""
+        with self.lock:
+            return self.connection.execute(sql, params).fetchone()
+
+    @contextmanager
+    def transaction(self):
+        """Run a block of statements inside a single transaction"""
+        with self.lock:
+            self.connection.execute("BEGIN")
+            try:
+                yield self.connection
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+            else:
+                self.connection.execute("COMMIT")
+
+    def close(self):
+        """Close the connection"""
+        with self.lock:
+            self.connection.close()
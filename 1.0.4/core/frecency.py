@@ -0,0 +1,55 @@
+"""
+Aether Browser - Frecency Scoring
+Combines how often and how recently a URL was visited into a single score
+"""
+
+import math
+import time
+
+
+# A visit loses half of its weight every 30 days
+HALF_LIFE_DAYS = 30.0
+DECAY_RATE = math.log(2) / (HALF_LIFE_DAYS * 24 * 60 * 60)
+
+# Weight of a single visit by how it happened
+VISIT_WEIGHTS = {
+    "link": 1.0,
+    "typed": 2.0,
+    "bookmark": 1.5,
+}
+
+
+def visit_weight(typed: bool = False) -> float:
+    """Weight of a visit"""
+    return VISIT_WEIGHTS["typed"] if typed else VISIT_WEIGHTS["link"]
+
+
+def visit_key(visit_time: float, weight: float = 1.0) -> float:
+    """Log-domain contribution of one visit.
+
+    The decayed score of a URL at time ``now`` is
+    ``sum(w * exp(-DECAY_RATE * (now - t)))``. Factoring out ``exp(-DECAY_RATE * now)``
+    leaves ``sum(w * exp(DECAY_RATE * t))``, which never changes once a visit is
+    recorded, so it can be stored and indexed. It is kept as a logarithm to stay
+    inside float range, and because decay is the same for every URL, ordering by
+    the stored value is the same as ordering by the current score.
+    """
+    return math.log(weight) + DECAY_RATE * visit_time
+
+
+def add_visit(stored: float, visit_time: float, weight: float = 1.0) -> float:
+    """Fold one more visit into a stored frecency value"""
+    key = visit_key(visit_time, weight)
+    if stored is None:
+        return key
+    high, low = (stored, key) if stored >= key else (key, stored)
+    return high + math.log1p(math.exp(low - high))
+
+
+def current_score(stored: float, now: float = None) -> float:
+    """Decayed score of a stored frecency value at a point in time"""
+    if stored is None:
+        return 0.0
+    if now is None:
+        now = time.time()
+    return math.exp(stored - DECAY_RATE * now)
@@ -0,0 +1,311 @@
+"""
+Aether Browser - History Store
+Keeps browsing history in SQLite with a full-text index over URLs and titles
+"""
+
+import re
+import sqlite3
+import time
+from datetime import datetime
+from typing import Optional
+
+from core import frecency
+from core.database import Database
+
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Tables and indexes holding history, including the FTS5 index's shadow tables
+_HISTORY_OBJECTS = (
+    "SELECT name FROM sqlite_master "
+    "WHERE tbl_name IN ('places', 'visits') OR name LIKE 'places_fts%'"
+)
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """Turn free text into an FTS5 query where every word is a prefix term"""
+    tokens = _TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+class HistoryStore:
+    """Browsing history backed by SQLite with incremental full-text indexing.
+
+    The tables are created and upgraded by core.schema.
+    """
+
+    def __init__(self, database: Database):
+        self.db = database
+
+    def record_visit(self, url: str, title: str = "", typed: bool = False,
+                     visit_time: float = None, source_url: str = None):
+        """Record a single visit, updating the aggregate row and the index.
+
+        source_url is where the navigation came from, e.g. the first URL of a
+        redirect chain that ended at url.
+        """
+        if visit_time is None:
+            visit_time = time.time()
+        title = title or ""
+
+        with self.db.transaction() as conn:
+            place_id, score = self._upsert_place(conn, url, title, visit_time, typed)
+            conn.execute(
+                "INSERT INTO visits (place_id, visit_time, source_url) VALUES (?, ?, ?)",
+                (place_id, visit_time, source_url)
+            )
+        return score
+
+    def _upsert_place(self, conn, url: str, title: str, visit_time: float,
+                      typed: bool = False) -> tuple:
+        """Create or bump the aggregate row for a URL; returns (id, frecency)"""
+        row = conn.execute(
+            "SELECT id, title, last_visit, frecency FROM places WHERE url = ?", (url,)
+        ).fetchone()
+        weight = frecency.visit_weight(typed)
+
+        if row is None:
+            score = frecency.add_visit(None, visit_time, weight)
+            cursor = conn.execute(
+                "INSERT INTO places "
+                "(url, title, visit_count, last_visit, typed_count, frecency) "
+                "VALUES (?, ?, 1, ?, ?, ?)",
+                (url, title, visit_time, int(typed), score)
+            )
+            return cursor.lastrowid, score
+
+        score = frecency.add_visit(row["frecency"], visit_time, weight)
+        conn.execute(
+            "UPDATE places SET visit_count = visit_count + 1, "
+            "last_visit = MAX(last_visit, ?), typed_count = typed_count + ?, "
+            "frecency = ? WHERE id = ?",
+            (visit_time, int(typed), score, row["id"])
+        )
+        # Only touch the title when it changed so the index isn't rewritten, and
+        # never let an older visit (e.g. an imported one) overwrite a newer title
+        if title and title != row["title"] and visit_time >= row["last_visit"]:
+            conn.execute(
+                "UPDATE places SET title = ? WHERE id = ?", (title, row["id"])
+            )
+        return row["id"], score
+
+    def update_title(self, url: str, title: str):
+        """Update the stored title of a URL"""
+        if not title:
+            return
+        self.db.execute(
+            "UPDATE places SET title = ? WHERE url = ? AND title != ?",
+            (title, url, title)
+        )
+
+    def search(self, text: str, limit: int = 50) -> list:
+        """Search history by URL and title words, best matches first"""
+        match = build_match_query(text)
+        if match is None:
+            return []
+
+        rows = self.db.query(
+            "SELECT p.url, p.title, p.visit_count, p.last_visit, "
+            "p.typed_count, p.frecency "
+            "FROM places_fts JOIN places p ON p.id = places_fts.rowid "
+            "WHERE places_fts MATCH ? "
+            "ORDER BY p.frecency DESC LIMIT ?",
+            (match, limit)
+        )
+        return [self._place_dict(row) for row in rows]
+
+    def top_sites(self, limit: int = 8) -> list:
+        """Most used URLs by frecency, read straight off the frecency index"""
+        rows = self.db.query(
+            "SELECT url, title, visit_count, last_visit, typed_count, frecency "
+            "FROM places WHERE frecency IS NOT NULL "
+            "ORDER BY frecency DESC LIMIT ?",
+            (limit,)
+        )
+        return [self._place_dict(row) for row in rows]
+
+    def _place_dict(self, row) -> dict:
+        """Convert a places row to a dict with the current decayed score"""
+        place = dict(row)
+        place["score"] = frecency.current_score(place.pop("frecency"))
+        return place
+
+    def iter_places(self, batch_size: int = 5000):
+        """Yield every place as {url, title, frecency}, a batch at a time"""
+        last_id = 0
+        while True:
+            rows = self.db.query(
+                "SELECT id, url, title, frecency FROM places "
+                "WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, batch_size)
+            )
+            if not rows:
+                return
+            for row in rows:
+                yield {"url": row["url"], "title": row["title"],
+                       "frecency": row["frecency"]}
+            last_id = rows[-1]["id"]
+
+    def recent_visits(self, limit: int = 1000) -> list:
+        """Return the most recent visits, newest first"""
+        rows = self.db.query(
+            "SELECT p.url, p.title, v.visit_time "
+            "FROM visits v JOIN places p ON p.id = v.place_id "
+            "ORDER BY v.visit_time DESC LIMIT ?",
+            (limit,)
+        )
+        return [
+            {
+                "url": row["url"],
+                "title": row["title"],
+                "timestamp": datetime.fromtimestamp(row["visit_time"]).isoformat()
+            }
+            for row in rows
+        ]
+
+    def import_entries(self, entries: list, conn=None) -> list:
+        """Insert legacy history entries ({url, title, timestamp}).
+
+        Runs in its own transaction unless an open connection is passed in.
+        Returns the touched places as {url, title, frecency}.
+        """
+        if conn is None:
+            with self.db.transaction() as conn:
+                return self.import_entries(entries, conn)
+
+        places = {}
+        # Legacy lists are newest first; replay oldest first
+        for entry in reversed(entries):
+            url = entry.get("url")
+            if not url:
+                continue
+            visit_time = _parse_timestamp(entry.get("timestamp"))
+            title = entry.get("title") or ""
+            place_id, score = self._upsert_place(conn, url, title, visit_time)
+            conn.execute(
+                "INSERT INTO visits (place_id, visit_time) VALUES (?, ?)",
+                (place_id, visit_time)
+            )
+            places[url] = {"url": url, "title": title, "frecency": score}
+        return list(places.values())
+
+    # Retention
+    def visit_count(self) -> int:
+        """Number of recorded visits"""
+        return self.db.query_one("SELECT COUNT(*) FROM visits")[0]
+
+    def used_bytes(self) -> int:
+        """Bytes of database pages holding history (places, visits, search index).
+
+        Measured with SQLite's dbstat table. Where SQLite was built without
+        it, this falls back to every live page of the file, which also counts
+        bookmarks, settings and the saved session.
+        """
+        try:
+            row = self.db.query_one(
+                f"SELECT SUM(pgsize) FROM dbstat WHERE aggregate = TRUE "
+                f"AND name IN ({_HISTORY_OBJECTS})"
+            )
+            return row[0] or 0
+        except sqlite3.OperationalError:
+            pass
+        page_size = self.db.query_one("PRAGMA page_size")[0]
+        page_count = self.db.query_one("PRAGMA page_count")[0]
+        free_pages = self.db.query_one("PRAGMA freelist_count")[0]
+        return (page_count - free_pages) * page_size
+
+    def optimize_search_index(self):
+        """Merge the FTS index into one segment, dropping deleted entries.
+
+        FTS5 records each delete as a tombstone, so the index grows as
+        history is pruned until it is optimized.
+        """
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO places_fts(places_fts) VALUES ('optimize')")
+
+    def delete_visits_before(self, cutoff: float, batch_size: int = 500,
+                             should_stop=None) -> int:
+        """Delete visits older than cutoff, one batch per transaction"""
+        deleted = 0
+        while should_stop is None or not should_stop():
+            with self.db.transaction() as conn:
+                removed = conn.execute(
+                    "DELETE FROM visits WHERE id IN ("
+                    "SELECT id FROM visits WHERE visit_time < ? "
+                    "ORDER BY visit_time LIMIT ?)",
+                    (cutoff, batch_size)
+                ).rowcount
+            deleted += removed
+            if removed < batch_size:
+                break
+        return deleted
+
+    def delete_oldest_visits(self, count: int, batch_size: int = 500,
+                             should_stop=None) -> int:
+        """Delete the count oldest visits, one batch per transaction"""
+        deleted = 0
+        while deleted < count and (should_stop is None or not should_stop()):
+            with self.db.transaction() as conn:
+                removed = conn.execute(
+                    "DELETE FROM visits WHERE id IN ("
+                    "SELECT id FROM visits ORDER BY visit_time LIMIT ?)",
+                    (min(batch_size, count - deleted),)
+                ).rowcount
+            if not removed:
+                break
+            deleted += removed
+        return deleted
+
+    def delete_orphan_places(self, batch_size: int = 500, should_stop=None) -> list:
+        """Delete places with no visits left; returns their URLs.
+
+        Places keep lifetime visit_count/frecency, so pruning old visits of a
+        URL that is still visited leaves its ranking untouched.
+        """
+        urls = []
+        while should_stop is None or not should_stop():
+            with self.db.transaction() as conn:
+                rows = conn.execute(
+                    "SELECT id, url FROM places p WHERE NOT EXISTS "
+                    "(SELECT 1 FROM visits v WHERE v.place_id = p.id) LIMIT ?",
+                    (batch_size,)
+                ).fetchall()
+                conn.executemany(
+                    "DELETE FROM places WHERE id = ?", [(row["id"],) for row in rows]
+                )
+            urls.extend(row["url"] for row in rows)
+            if len(rows) < batch_size:
+                break
+        return urls
+
+    def vacuum(self, pages_per_step: int = 256, should_stop=None):
+        """Return free pages to the filesystem a few at a time.
+
+        Only works once the database uses incremental vacuum, which Storage
+        sets up at startup (see Database.enable_incremental_vacuum).
+        """
+        if self.db.query_one("PRAGMA auto_vacuum")[0] != 2:
+            return
+        while should_stop is None or not should_stop():
+            if not self.db.query_one("PRAGMA freelist_count")[0]:
+                break
+            self.db.query(f"PRAGMA incremental_vacuum({int(pages_per_step)})")
+
+    def clear(self):
+        """Delete all history"""
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM visits")
+            conn.execute("DELETE FROM places")
+            conn.execute("INSERT INTO places_fts(places_fts) VALUES ('rebuild')")
+
+
+def _parse_timestamp(value) -> float:
+    """Convert a legacy ISO timestamp to epoch seconds"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
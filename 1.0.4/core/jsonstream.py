@@ -0,0 +1,88 @@
+"""
+Aether Browser - Streaming JSON
+Reads items of a top-level JSON array without loading the whole file
+"""
+
+import json
+
+
+_WHITESPACE = " \t\r\n"
+
+
+def iter_array_items(file, chunk_size: int = 64 * 1024):
+    """Yield each element of a JSON array read incrementally from a text file"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    started = False
+
+    def fill():
+        nonlocal buffer, position, eof
+        chunk = file.read(chunk_size)
+        if not chunk:
+            eof = True
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    while True:
+        # Skip whitespace and separators, reading more when the buffer runs out
+        while position < len(buffer) and buffer[position] in _WHITESPACE + ",":
+            if buffer[position] == "," and not started:
+                raise ValueError("Unexpected ',' before array start")
+            position += 1
+        if position >= len(buffer):
+            if eof:
+                if started:
+                    raise ValueError("Unterminated JSON array")
+                return
+            fill()
+            continue
+
+        if not started:
+            if buffer[position] != "[":
+                raise ValueError("Expected a JSON array")
+            started = True
+            position += 1
+            continue
+
+        if buffer[position] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()
+            continue
+
+        # A value running to the very end of the buffer may be cut short (e.g. a number)
+        if end == len(buffer) and not eof:
+            fill()
+            continue
+
+        position = end
+        yield item
+
+
+class ArrayWriter:
+    """Writes a JSON array one element at a time"""
+
+    def __init__(self, file):
+        self.file = file
+        self.count = 0
+
+    def __enter__(self):
+        self.file.write("[")
+        return self
+
+    def write(self, item):
+        """Append one element"""
+        self.file.write(",\n" if self.count else "\n")
+        self.file.write(json.dumps(item, ensure_ascii=False))
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.file.write("\n]\n")
+        return False
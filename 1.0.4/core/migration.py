@@ -0,0 +1,164 @@
+"""
+Aether Browser - Legacy Data Migration
+Streams history and bookmarks from the JSON files of older versions into the database
+"""
+
+import itertools
+import threading
+
+from core import jsonstream
+
+
+# Legacy files moved into the database in the background, in this order
+LEGACY_FILES = ("history.json", "bookmarks.json")
+
+MIGRATED_SUFFIX = ".migrated"
+
+
+def import_progress(database, name: str) -> tuple:
+    """(items_done, completed) for a legacy file"""
+    row = database.query_one(
+        "SELECT items_done, completed FROM legacy_imports WHERE name = ?", (name,)
+    )
+    if row is None:
+        return 0, False
+    return row["items_done"], bool(row["completed"])
+
+
+def _save_progress(conn, name: str, items_done: int, completed: bool = False):
+    conn.execute(
+        "INSERT INTO legacy_imports (name, items_done, completed) VALUES (?, ?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET items_done = excluded.items_done, "
+        "completed = excluded.completed",
+        (name, items_done, int(completed))
+    )
+
+
+def _batches(items, size: int):
+    """Group an iterator into lists of at most size items"""
+    batch = []
+    try:
+        for item in items:
+            batch.append(item)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    except ValueError:
+        # Hand over what was read before a parse error, then report it
+        if batch:
+            yield batch
+        raise
+    if batch:
+        yield batch
+
+
+class LegacyMigration:
+    """Moves history.json and bookmarks.json into the database on a background thread.
+
+    Entries are read incrementally and written a batch per transaction. The
+    number of entries done is saved in the same transaction as the batch, so
+    an interrupted migration resumes where it stopped instead of starting
+    over or writing anything twice. Finished files are renamed to
+    *.json.migrated and kept as a backup.
+    """
+
+    def __init__(self, storage, batch_size: int = 500):
+        self.storage = storage
+        self.batch_size = batch_size
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def pending(self) -> list:
+        """Legacy files still to be migrated"""
+        return [
+            name for name in LEGACY_FILES
+            if (self.storage.storage_dir / name).exists()
+            and not import_progress(self.storage.database, name)[1]
+        ]
+
+    def start(self):
+        """Start migrating in the background if there is anything to do"""
+        if self._thread is not None or not self.pending():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, name="LegacyMigration", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Ask the thread to stop after its current batch and wait for it"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run(self):
+        """Migrate every pending file; returns the names that finished"""
+        importers = {
+            "history.json": self._import_history,
+            "bookmarks.json": self._import_bookmarks,
+        }
+        finished = []
+        for name in self.pending():
+            if self._stop_event.is_set():
+                break
+            try:
+                if self._migrate(name, importers[name]):
+                    finished.append(name)
+            except Exception as e:
+                print(f"[LegacyMigration] Migrating {name} failed: {e}")
+        return finished
+
+    def _migrate(self, name: str, import_batch) -> bool:
+        """Stream one file into the database; returns whether it completed"""
+        database = self.storage.database
+        path = self.storage.storage_dir / name
+        done, _ = import_progress(database, name)
+
+        try:
+            with open(path, 'r', encoding='utf-8-sig') as f:
+                items = jsonstream.iter_array_items(f)
+                # Entries imported by an interrupted run are read but not written again
+                for _ in itertools.islice(items, done):
+                    pass
+                for batch in _batches(items, self.batch_size):
+                    if self._stop_event.is_set():
+                        return False
+                    import_batch(name, batch, done)
+                    done += len(batch)
+        except ValueError as e:
+            # Keep what was readable; the file stays in place untouched
+            print(f"[LegacyMigration] {name} is damaged after {done} entries: {e}")
+            with database.transaction() as conn:
+                _save_progress(conn, name, done, completed=True)
+            return True
+
+        with database.transaction() as conn:
+            _save_progress(conn, name, done, completed=True)
+        try:
+            path.rename(path.with_name(path.name + MIGRATED_SUFFIX))
+        except OSError as e:
+            print(f"[LegacyMigration] Could not rename {path}: {e}")
+        return True
+
+    def _import_history(self, name: str, entries: list, done: int):
+        """Write one batch of legacy history entries"""
+        with self.storage.database.transaction() as conn:
+            places = self.storage.history.import_entries(
+                [entry for entry in entries if isinstance(entry, dict)], conn
+            )
+            _save_progress(conn, name, done + len(entries))
+        self.storage.history_imported(places)
+
+    def _import_bookmarks(self, name: str, entries: list, done: int):
+        """Write one batch of legacy bookmarks into the root folder"""
+        events = [
+            ("bookmark", entry.get("url"), entry.get("title") or "", None)
+            for entry in entries if isinstance(entry, dict)
+        ]
+        # Bookmark imports skip URLs already in the folder, so a batch repeated
+        # after a crash before the progress write adds nothing
+        added = self.storage.bookmarks.import_events(events)
+        with self.storage.database.transaction() as conn:
+            _save_progress(conn, name, done + len(entries))
+        self.storage.bookmarks_imported(added)
@@ -0,0 +1,73 @@
+"""
+Aether Browser - Renderer Process Model
+Chooses how Chromium assigns pages to renderer processes, applied through command-line flags
+"""
+
+import os
+
+
+FLAGS_VARIABLE = "QTWEBENGINE_CHROMIUM_FLAGS"
+
+# Setting value -> Chromium flags
+PROCESS_MODELS = {
+    # Chromium's default: a process per site instance. Two tabs on the same
+    # site get separate processes unless one opened the other, so one busy or
+    # crashing page doesn't affect the others. Uses the most memory.
+    "per-site-instance": [],
+    # Every tab on a site shares one process. Saves roughly one renderer's
+    # baseline (tens of MB) per extra tab on a site and opening another tab
+    # on an already open site skips process startup, but those tabs share
+    # a main thread, so a heavy page slows its siblings.
+    "per-site": ["--process-per-site"],
+}
+
+
+class ProcessModel:
+    """Process model settings and the flags they translate to.
+
+    renderer_process_limit caps the number of renderer processes; past the
+    cap new pages are put in existing processes regardless of site. 0
+    leaves the cap to Chromium, which scales it with system memory.
+
+    Flags are read when QtWebEngine starts, so changes apply on the next
+    launch. benchmarks/bench_tab_churn.py measures each model's memory and
+    load latency.
+    """
+
+    DEFAULTS = {
+        "process_model": "per-site-instance",
+        "renderer_process_limit": 0,
+    }
+
+    @staticmethod
+    def flags(model: str, process_limit: int = 0) -> list:
+        """Chromium flags for a process model and process cap"""
+        if model not in PROCESS_MODELS:
+            raise ValueError(f"Unknown process model: {model}")
+        flags = list(PROCESS_MODELS[model])
+        if process_limit:
+            flags.append(f"--renderer-process-limit={int(process_limit)}")
+        return flags
+
+    @classmethod
+    def apply(cls, settings) -> list:
+        """Add the configured flags to the environment; call before QApplication exists.
+
+        Flags already in the environment are kept, so a flag given there by
+        hand still wins. Returns the flags added.
+        """
+        model = settings.get("process_model", cls.DEFAULTS["process_model"])
+        limit = settings.get("renderer_process_limit", cls.DEFAULTS["renderer_process_limit"])
+        try:
+            flags = cls.flags(model, limit)
+        except (ValueError, TypeError) as e:
+            print(f"[ProcessModel] Ignoring process model setting: {e}")
+            return []
+
+        existing = os.environ.get(FLAGS_VARIABLE, "").split()
+        # Names of flags already given, e.g. --renderer-process-limit
+        given = {flag.split("=", 1)[0] for flag in existing}
+        added = [flag for flag in flags if flag.split("=", 1)[0] not in given]
+        if added:
+            os.environ[FLAGS_VARIABLE] = " ".join(existing + added)
+        return added
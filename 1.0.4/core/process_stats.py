@@ -0,0 +1,149 @@
+"""
+Aether Browser - Process Statistics
+Memory and CPU use of browser and renderer processes, read from /proc where available
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+
+try:
+    PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    PAGE_SIZE = 4096
+
+try:
+    CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+except (AttributeError, ValueError, OSError):
+    CLOCK_TICKS = 100
+
+
+def rss_bytes(pid: int) -> Optional[int]:
+    """Resident memory of a process, or None if it can't be read on this platform"""
+    if not pid:
+        return None
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def total_rss_bytes(pids) -> Optional[int]:
+    """Combined resident memory of several processes, each counted once.
+
+    Processes that can't be read (pid 0, exited, or no /proc) are left
+    out; None only if none of them could be read.
+    """
+    total = None
+    for pid in set(pids):
+        rss = rss_bytes(pid)
+        if rss is not None:
+            total = (total or 0) + rss
+    return total
+
+
+def cpu_seconds(pid: int) -> Optional[float]:
+    """User plus system CPU time a process has used, or None if unavailable"""
+    if not pid:
+        return None
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # The command name may contain spaces; fields resume after its ')'
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class CpuMeter:
+    """CPU usage of processes between successive samples"""
+
+    def __init__(self):
+        # pid -> (cpu seconds, monotonic time) at the last sample
+        self._last = {}
+
+    def sample(self, pids) -> dict:
+        """pid -> percent of one core used since the previous sample (None at first)"""
+        now = time.monotonic()
+        usage = {}
+        seen = {}
+        for pid in set(pids):
+            cpu = cpu_seconds(pid)
+            if cpu is None:
+                continue
+            seen[pid] = (cpu, now)
+            previous = self._last.get(pid)
+            if previous is None or now <= previous[1]:
+                usage[pid] = None
+            else:
+                usage[pid] = 100.0 * (cpu - previous[0]) / (now - previous[1])
+        self._last = seen
+        return usage
+
+
+class ProcessMonitor:
+    """Samples CPU and memory of a set of processes on a background thread.
+
+    Owners set which pids to watch, each under its own group name so they
+    don't replace each other's; latest() returns the most recent sample
+    without touching /proc, so callers on the GUI thread never block.
+    """
+
+    def __init__(self, interval: float = 2.0):
+        self.interval = interval
+        # Group name -> pids
+        self._pids = {}
+        self._latest = {}
+        self._lock = threading.Lock()
+        self._meter = CpuMeter()
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def watch(self, pids, group: str = ""):
+        """Set the processes to sample for one group"""
+        with self._lock:
+            self._pids[group] = {pid for pid in pids if pid}
+
+    def latest(self) -> dict:
+        """pid -> {cpu_percent, memory} from the last sample"""
+        with self._lock:
+            return dict(self._latest)
+
+    def start(self):
+        """Start the background thread"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ProcessMonitor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the thread and wait for it"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        """Thread body"""
+        while True:
+            self.sample()
+            if self._stop_event.wait(self.interval):
+                return
+
+    def sample(self) -> dict:
+        """Take a sample now"""
+        with self._lock:
+            pids = set().union(*self._pids.values())
+        cpu = self._meter.sample(pids)
+        sample = {
+            pid: {"cpu_percent": cpu.get(pid), "memory": rss_bytes(pid)}
+            for pid in pids
+        }
+        with self._lock:
+            self._latest = sample
+        return sample
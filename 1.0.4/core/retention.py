@@ -0,0 +1,127 @@
+"""
+Aether Browser - History Retention
+Settings-driven limits on history, enforced by a background pruning thread
+"""
+
+import threading
+import time
+
+
+class RetentionPolicy:
+    """Limits on how much history is kept; None or 0 disables a limit"""
+
+    DEFAULTS = {
+        "history_max_age_days": 90,
+        "history_max_entries": 100000,
+        "history_max_size_mb": 100,
+    }
+
+    def __init__(self, max_age_days: float = None, max_entries: int = None,
+                 max_size_mb: float = None):
+        self.max_age_days = max_age_days
+        self.max_entries = max_entries
+        self.max_size_mb = max_size_mb
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> "RetentionPolicy":
+        """Build a policy from the browser settings"""
+        values = {key: settings.get(key, default) for key, default in cls.DEFAULTS.items()}
+        return cls(
+            max_age_days=values["history_max_age_days"],
+            max_entries=values["history_max_entries"],
+            max_size_mb=values["history_max_size_mb"],
+        )
+
+    def cutoff_time(self, now: float = None) -> float:
+        """Visits older than this are expired, or None for no age limit"""
+        if not self.max_age_days:
+            return None
+        if now is None:
+            now = time.time()
+        return now - self.max_age_days * 24 * 60 * 60
+
+    @property
+    def max_size_bytes(self) -> int:
+        return int(self.max_size_mb * 1024 * 1024) if self.max_size_mb else None
+
+
+class HistoryPruner:
+    """Periodically applies the retention policy on a background thread.
+
+    Deletes run in small batches, each in its own transaction, so the GUI
+    thread never waits on more than one batch when it records a visit.
+    """
+
+    def __init__(self, storage, interval: float = 15 * 60, initial_delay: float = 60,
+                 batch_size: int = 500):
+        self.storage = storage
+        self.interval = interval
+        self.initial_delay = initial_delay
+        self.batch_size = batch_size
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the background thread"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="HistoryPruner", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Ask the thread to stop after its current batch and wait for it"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        """Thread body"""
+        delay = self.initial_delay
+        while not self._stop_event.wait(delay):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"[HistoryPruner] Pruning failed: {e}")
+            delay = self.interval
+
+    def run_once(self) -> int:
+        """Apply the policy now; returns the number of visits deleted"""
+        policy = RetentionPolicy.from_settings(self.storage.load_settings())
+        history = self.storage.history
+        should_stop = self._stop_event.is_set
+
+        deleted = 0
+        cutoff = policy.cutoff_time()
+        if cutoff is not None:
+            deleted += history.delete_visits_before(cutoff, self.batch_size, should_stop)
+
+        if policy.max_entries:
+            deleted += history.delete_oldest_visits(
+                history.visit_count() - policy.max_entries, self.batch_size, should_stop
+            )
+
+        if policy.max_size_bytes:
+            # Trim the oldest tenth at a time until the live data fits
+            size = history.used_bytes()
+            while not should_stop() and size > policy.max_size_bytes:
+                chunk = max(self.batch_size, history.visit_count() // 10)
+                removed = history.delete_oldest_visits(chunk, self.batch_size, should_stop)
+                if not removed:
+                    break
+                deleted += removed
+                self.storage.history_pruned(
+                    history.delete_orphan_places(self.batch_size, should_stop)
+                )
+                # Deletes leave tombstones in the search index until it is merged
+                history.optimize_search_index()
+                # Stop if pruning no longer shrinks history rather than empty it
+                previous, size = size, history.used_bytes()
+                if size >= previous:
+                    break
+
+        self.storage.history_pruned(history.delete_orphan_places(self.batch_size, should_stop))
+        history.vacuum(should_stop=should_stop)
+        return deleted
@@ -0,0 +1,210 @@
+"""
+Aether Browser - Database Schema
+Versioned schema migrations for aether.db, tracked with PRAGMA user_version
+"""
+
+import sqlite3
+
+from core import frecency
+
+
+def _run_script(conn, script: str):
+    """Run SQL statements one at a time; executescript() would commit the open transaction"""
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ""
+
+
+def _v1_history(conn, from_version: int):
+    """History: one row per URL, one row per visit, FTS5 index over places"""
+    _run_script(conn, """
+        CREATE TABLE places (
+            id INTEGER PRIMARY KEY,
+            url TEXT NOT NULL UNIQUE,
+            title TEXT NOT NULL DEFAULT '',
+            visit_count INTEGER NOT NULL DEFAULT 0,
+            last_visit REAL NOT NULL DEFAULT 0
+        );
+
+        CREATE TABLE visits (
+            id INTEGER PRIMARY KEY,
+            place_id INTEGER NOT NULL REFERENCES places(id) ON DELETE CASCADE,
+            visit_time REAL NOT NULL
+        );
+
+        CREATE INDEX visits_time_idx ON visits(visit_time);
+        CREATE INDEX visits_place_idx ON visits(place_id);
+
+        -- External-content FTS5 index over places, kept in sync by the triggers below
+        CREATE VIRTUAL TABLE places_fts USING fts5(
+            url, title,
+            content='places', content_rowid='id',
+            prefix='2 3'
+        );
+
+        CREATE TRIGGER places_fts_insert AFTER INSERT ON places BEGIN
+            INSERT INTO places_fts(rowid, url, title) VALUES (new.id, new.url, new.title);
+        END;
+
+        CREATE TRIGGER places_fts_delete AFTER DELETE ON places BEGIN
+            INSERT INTO places_fts(places_fts, rowid, url, title)
+            VALUES ('delete', old.id, old.url, old.title);
+        END;
+
+        CREATE TRIGGER places_fts_update AFTER UPDATE OF url, title ON places BEGIN
+            INSERT INTO places_fts(places_fts, rowid, url, title)
+            VALUES ('delete', old.id, old.url, old.title);
+            INSERT INTO places_fts(rowid, url, title) VALUES (new.id, new.url, new.title);
+        END;
+    """)
+
+
+def _v2_frecency(conn, from_version: int):
+    """Per-URL typed count and decayed frecency, indexed for top-N queries"""
+    conn.execute("ALTER TABLE places ADD COLUMN typed_count INTEGER NOT NULL DEFAULT 0")
+    conn.execute("ALTER TABLE places ADD COLUMN frecency REAL")
+    conn.execute("CREATE INDEX places_frecency_idx ON places(frecency DESC)")
+
+    # Score existing rows once from their recorded visits
+    scores = {}
+    for row in conn.execute("SELECT place_id, visit_time FROM visits"):
+        scores[row["place_id"]] = frecency.add_visit(scores.get(row["place_id"]), row["visit_time"])
+    conn.executemany(
+        "UPDATE places SET frecency = ? WHERE id = ?",
+        [(score, place_id) for place_id, score in scores.items()]
+    )
+
+
+def _v3_visit_source(conn, from_version: int):
+    """Where a visit came from (first URL of a redirect chain, or the previous page)"""
+    conn.execute("ALTER TABLE visits ADD COLUMN source_url TEXT")
+
+
+def _v4_bookmarks(conn, from_version: int):
+    """Bookmark tree with stable ids"""
+    _run_script(conn, """
+        CREATE TABLE bookmarks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            parent_id INTEGER REFERENCES bookmarks(id) ON DELETE CASCADE,
+            kind TEXT NOT NULL CHECK (kind IN ('folder', 'bookmark')),
+            title TEXT NOT NULL DEFAULT '',
+            url TEXT,
+            position INTEGER NOT NULL DEFAULT 0,
+            date_added REAL NOT NULL
+        );
+
+        CREATE INDEX bookmarks_parent_idx ON bookmarks(parent_id, position);
+    """)
+
+
+def _v5_settings_and_legacy(conn, from_version: int):
+    """Settings as key/value rows, and progress of legacy JSON imports"""
+    _run_script(conn, """
+        CREATE TABLE settings (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+
+        CREATE TABLE legacy_imports (
+            name TEXT PRIMARY KEY,
+            items_done INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0
+        );
+    """)
+    if from_version > 0:
+        # Databases from before versioning imported history/bookmarks JSON on creation
+        conn.executemany(
+            "INSERT INTO legacy_imports (name, completed) VALUES (?, 1)",
+            [("history.json",), ("bookmarks.json",)]
+        )
+
+
+def _v6_session(conn, from_version: int):
+    """Open windows and tabs, rewritten incrementally while the browser runs"""
+    _run_script(conn, """
+        CREATE TABLE session_windows (
+            id INTEGER PRIMARY KEY,
+            position INTEGER NOT NULL DEFAULT 0,
+            geometry BLOB,
+            current_tab INTEGER
+        );
+
+        CREATE TABLE session_tabs (
+            id INTEGER PRIMARY KEY,
+            window_id INTEGER NOT NULL REFERENCES session_windows(id) ON DELETE CASCADE,
+            position INTEGER NOT NULL DEFAULT 0,
+            url TEXT NOT NULL,
+            title TEXT NOT NULL DEFAULT '',
+            history BLOB,
+            scroll_x REAL NOT NULL DEFAULT 0,
+            scroll_y REAL NOT NULL DEFAULT 0
+        );
+
+        CREATE INDEX session_tabs_window_idx ON session_tabs(window_id, position);
+    """)
+
+
+# Index + 1 is the schema version each migration produces
+MIGRATIONS = [
+    _v1_history,
+    _v2_frecency,
+    _v3_visit_source,
+    _v4_bookmarks,
+    _v5_settings_and_legacy,
+    _v6_session,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def _table_columns(conn, table: str) -> set:
+    """Column names of a table (empty if it doesn't exist)"""
+    return {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _detect_unversioned(conn) -> int:
+    """Work out the version of a database created before user_version was set"""
+    places = _table_columns(conn, "places")
+    if not places:
+        return 0
+    if "frecency" not in places:
+        return 1
+    if "source_url" not in _table_columns(conn, "visits"):
+        return 2
+    if not _table_columns(conn, "bookmarks"):
+        return 3
+    return 4
+
+
+def schema_version(database) -> int:
+    """Current schema version of a database"""
+    with database.lock:
+        return database.connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(database) -> int:
+    """Bring the database up to SCHEMA_VERSION; returns the version it started at.
+
+    Each migration runs in its own transaction together with the user_version
+    bump, so an interrupted upgrade resumes at the first unfinished step.
+    """
+    with database.lock:
+        conn = database.connection
+        start = conn.execute("PRAGMA user_version").fetchone()[0]
+        if start == 0:
+            start = _detect_unversioned(conn)
+
+        if start > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"Database schema version {start} is newer than this browser supports "
+                f"({SCHEMA_VERSION})"
+            )
+
+        for version in range(start + 1, SCHEMA_VERSION + 1):
+            with database.transaction():
+                MIGRATIONS[version - 1](conn, start)
+                conn.execute(f"PRAGMA user_version = {version}")
+        return start
@@ -0,0 +1,170 @@
+"""
+Aether Browser - Session Store
+Open windows and tabs kept in SQLite, written incrementally by a background thread
+"""
+
+import threading
+
+from core.database import Database
+
+
+class SessionChanges:
+    """Window and tab rows to write or delete, merged until they are written.
+
+    windows: window id -> {position, geometry, current_tab, tabs: [tab ids in order]}
+    tabs: tab id -> {window_id, position, url, title, history, scroll_x, scroll_y}
+    """
+
+    def __init__(self):
+        self.windows = {}
+        self.tabs = {}
+        self.removed_windows = set()
+        self.removed_tabs = set()
+        # Replace the whole stored session instead of updating it
+        self.replace = False
+
+    def __bool__(self):
+        return bool(self.windows or self.tabs or self.removed_windows
+                    or self.removed_tabs or self.replace)
+
+    def merge(self, newer: "SessionChanges"):
+        """Fold later changes into these; the later state of a row wins"""
+        if newer.replace:
+            self.__init__()
+            self.replace = True
+        for window_id in newer.removed_windows:
+            self.windows.pop(window_id, None)
+        for tab_id in newer.removed_tabs:
+            self.tabs.pop(tab_id, None)
+        self.removed_windows |= newer.removed_windows
+        self.removed_tabs |= newer.removed_tabs
+        self.removed_windows -= set(newer.windows)
+        self.removed_tabs -= set(newer.tabs)
+        self.windows.update(newer.windows)
+        self.tabs.update(newer.tabs)
+
+
+class SessionStore:
+    """Reads and writes the saved session"""
+
+    def __init__(self, database: Database):
+        self.db = database
+
+    def load(self) -> list:
+        """Saved windows in order, each {id, geometry, current_tab, tabs: [tab dicts]}"""
+        windows = [
+            dict(row, tabs=[]) for row in self.db.query(
+                "SELECT id, geometry, current_tab FROM session_windows ORDER BY position, id"
+            )
+        ]
+        by_id = {window["id"]: window for window in windows}
+        rows = self.db.query(
+            "SELECT id, window_id, url, title, history, scroll_x, scroll_y "
+            "FROM session_tabs ORDER BY window_id, position, id"
+        )
+        for row in rows:
+            window = by_id.get(row["window_id"])
+            if window is not None:
+                window["tabs"].append(dict(row))
+        return [window for window in windows if window["tabs"]]
+
+    def apply(self, changes: SessionChanges):
+        """Write a batch of changes in one transaction"""
+        with self.db.transaction() as conn:
+            if changes.replace:
+                conn.execute("DELETE FROM session_windows")
+            if changes.removed_windows:
+                conn.executemany(
+                    "DELETE FROM session_windows WHERE id = ?",
+                    [(window_id,) for window_id in changes.removed_windows]
+                )
+            if changes.removed_tabs:
+                conn.executemany(
+                    "DELETE FROM session_tabs WHERE id = ?",
+                    [(tab_id,) for tab_id in changes.removed_tabs]
+                )
+            for window_id, window in changes.windows.items():
+                conn.execute(
+                    "INSERT INTO session_windows (id, position, geometry, current_tab) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET "
+                    "position = excluded.position, geometry = excluded.geometry, "
+                    "current_tab = excluded.current_tab",
+                    (window_id, window["position"], window["geometry"], window["current_tab"])
+                )
+                # Order and ownership of tabs whose content didn't change
+                conn.executemany(
+                    "UPDATE session_tabs SET window_id = ?, position = ? WHERE id = ?",
+                    [(window_id, position, tab_id)
+                     for position, tab_id in enumerate(window["tabs"])]
+                )
+            conn.executemany(
+                "INSERT INTO session_tabs "
+                "(id, window_id, position, url, title, history, scroll_x, scroll_y) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET "
+                "window_id = excluded.window_id, position = excluded.position, "
+                "url = excluded.url, title = excluded.title, history = excluded.history, "
+                "scroll_x = excluded.scroll_x, scroll_y = excluded.scroll_y",
+                [(tab_id, tab["window_id"], tab["position"], tab["url"], tab["title"],
+                  tab["history"], tab["scroll_x"], tab["scroll_y"])
+                 for tab_id, tab in changes.tabs.items()]
+            )
+
+    def clear(self):
+        """Forget the saved session"""
+        self.db.execute("DELETE FROM session_windows")
+
+
+class SessionWriter:
+    """Writes session changes on a background thread.
+
+    Changes submitted while a write is in progress are merged, so a burst of
+    updates costs one transaction and the GUI thread never waits on disk.
+    """
+
+    def __init__(self, store: SessionStore):
+        self.store = store
+        self._pending = SessionChanges()
+        self._writing = False
+        self._stopping = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="SessionWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, changes: SessionChanges):
+        """Queue changes for writing"""
+        if not changes:
+            return
+        with self._condition:
+            self._pending.merge(changes)
+            self._condition.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything submitted so far is written"""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._writing, timeout
+            )
+
+    def stop(self, timeout: float = 5.0):
+        """Write what's pending and end the thread"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Thread body"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._stopping)
+                if not self._pending and self._stopping:
+                    return
+                changes, self._pending = self._pending, SessionChanges()
+                self._writing = True
+            try:
+                self.store.apply(changes)
+            except Exception as e:
+                print(f"[SessionWriter] Saving session failed: {e}")
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
@@ -0,0 +1,77 @@
+"""
+Aether Browser - Settings Store
+Browser settings as JSON-encoded key/value rows with an in-memory cache
+"""
+
+import json
+import threading
+from typing import Any
+
+from core.database import Database
+
+
+class SettingsStore:
+    """Key/value settings kept in SQLite.
+
+    All settings are cached in memory, so reads never touch the database and
+    writes only rewrite the keys whose value changed.
+    """
+
+    def __init__(self, database: Database):
+        self.db = database
+        self.lock = threading.RLock()
+        self._values = {
+            row["key"]: json.loads(row["value"])
+            for row in self.db.query("SELECT key, value FROM settings")
+        }
+
+    def all(self) -> dict:
+        """A copy of every setting"""
+        with self.lock:
+            return dict(self._values)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Value of one setting"""
+        with self.lock:
+            return self._values.get(key, default)
+
+    def set(self, key: str, value: Any):
+        """Change one setting"""
+        self.update({key: value})
+
+    def update(self, values: dict):
+        """Change several settings in one transaction"""
+        with self.lock:
+            changed = {
+                key: value for key, value in values.items()
+                if key not in self._values or self._values[key] != value
+            }
+            if not changed:
+                return
+            with self.db.transaction() as conn:
+                conn.executemany(
+                    "INSERT INTO settings (key, value) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    [(key, json.dumps(value)) for key, value in changed.items()]
+                )
+            self._values.update(changed)
+
+    def replace(self, values: dict):
+        """Make the stored settings exactly values"""
+        with self.lock:
+            removed = [key for key in self._values if key not in values]
+            if removed:
+                with self.db.transaction() as conn:
+                    conn.executemany(
+                        "DELETE FROM settings WHERE key = ?", [(key,) for key in removed]
+                    )
+                for key in removed:
+                    del self._values[key]
+            self.update(values)
+
+    def set_defaults(self, defaults: dict):
+        """Store defaults for settings that have no value yet"""
+        with self.lock:
+            self.update({
+                key: value for key, value in defaults.items() if key not in self._values
+            })
@@ -8,6 +8,16 @@ import os
 from typing import Any, Optional
 from pathlib import Path
 
+from core.database import Database
+from core import schema
+from core.settings import SettingsStore
+from core.history import HistoryStore
+from core.bookmarks import BookmarkStore
+from core import bookmark_io
+from core.migration import LegacyMigration, MIGRATED_SUFFIX
+from core.retention import RetentionPolicy
+from core.process_model import ProcessModel
+
 
 class Storage:
     """Manages persistent storage for browser data"""
@@ -22,29 +32,50 @@ class Storage:
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         
-        # Storage files
+        # Settings file of older versions, imported once into the database
         self.settings_file = self.storage_dir / "settings.json"
-        self.history_file = self.storage_dir / "history.json"
-        self.bookmarks_file = self.storage_dir / "bookmarks.json"
+        
+        # Settings, history and bookmarks live in SQLite so changes only write what changed
+        self.database = Database(self.storage_dir / "aether.db")
+        schema.migrate(self.database)
+        self.database.enable_incremental_vacuum()
+        self.settings = SettingsStore(self.database)
+        self.history = HistoryStore(self.database)
+        self.bookmarks = BookmarkStore(self.database)
+        
+        # Streams legacy history/bookmarks JSON in the background (see start_legacy_migration)
+        self.legacy_migration = LegacyMigration(self)
+        
+        # Objects notified of data changes (see _notify)
+        self.observers = []
         
         # Initialize storage
         self._init_storage()
     
     def _init_storage(self):
-        """Initialize storage files if they don't exist"""
-        if not self.settings_file.exists():
-            self.save_settings({
-                "dark_mode": False,
-                "accent_color": "#4285f4",
-                "home_url": "https://www.google.com",
-                "default_zoom": 1.0
-            })
-        
-        if not self.history_file.exists():
-            self.save_history([])
+        """Import legacy settings and fill in defaults for missing settings"""
+        # Settings are small and needed before the window opens, so import them now
+        if self.settings_file.exists():
+            legacy_settings = self._read_json(self.settings_file)
+            if isinstance(legacy_settings, dict):
+                self.settings.set_defaults(legacy_settings)
+                self.settings_file.rename(
+                    self.settings_file.with_name(self.settings_file.name + MIGRATED_SUFFIX)
+                )
         
-        if not self.bookmarks_file.exists():
-            self.save_bookmarks([])
+        self.settings.set_defaults({
+            "dark_mode": False,
+            "accent_color": "#4285f4",
+            "home_url": "https://www.google.com",
+            "default_zoom": 1.0,
+            "vertical_tabs": False,
+            **RetentionPolicy.DEFAULTS,
+            **ProcessModel.DEFAULTS
+        })
+    
+    def start_legacy_migration(self):
+        """Move history and bookmarks left by older versions into the database"""
+        self.legacy_migration.start()
     
     def _read_json(self, file_path: Path) -> Any:
         """Read JSON file"""
@@ -55,80 +86,133 @@ class Storage:
             print(f"Error reading {file_path}: {e}")
             return None
     
-    def _write_json(self, file_path: Path, data: Any):
-        """Write JSON file"""
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error writing {file_path}: {e}")
+    # Observers
+    def add_observer(self, observer):
+        """Register an object to be told about history and bookmark changes.
+        
+        Hooks may be called from background threads (history pruning), so
+        observers must be thread-safe.
+        """
+        self.observers.append(observer)
+    
+    def remove_observer(self, observer):
+        """Unregister an observer"""
+        if observer in self.observers:
+            self.observers.remove(observer)
+    
+    def _notify(self, event: str, *args):
+        """Call the named hook on every observer that implements it"""
+        for observer in list(self.observers):
+            handler = getattr(observer, event, None)
+            if handler is not None:
+                handler(*args)
     
     # Settings
     def load_settings(self) -> dict:
         """Load browser settings"""
-        return self._read_json(self.settings_file) or {}
+        return self.settings.all()
     
     def save_settings(self, settings: dict):
         """Save browser settings"""
-        self._write_json(self.settings_file, settings)
+        self.settings.replace(settings)
     
     def get_setting(self, key: str, default: Any = None) -> Any:
         """Get a specific setting"""
-        settings = self.load_settings()
-        return settings.get(key, default)
+        return self.settings.get(key, default)
     
     def set_setting(self, key: str, value: Any):
         """Set a specific setting"""
-        settings = self.load_settings()
-        settings[key] = value
-        self.save_settings(settings)
+        self.settings.set(key, value)
     
     # History
-    def load_history(self) -> list:
-        """Load browsing history"""
-        return self._read_json(self.history_file) or []
+    def load_history(self, limit: int = 1000) -> list:
+        """Load browsing history, newest first"""
+        return self.history.recent_visits(limit)
     
     def save_history(self, history: list):
-        """Save browsing history"""
-        self._write_json(self.history_file, history)
+        """Replace browsing history"""
+        self.clear_history()
+        self.history_imported(self.history.import_entries(history))
     
-    def add_history_entry(self, url: str, title: str):
+    def add_history_entry(self, url: str, title: str, typed: bool = False,
+                          source_url: str = None):
         """Add entry to browsing history"""
-        from datetime import datetime
-        
-        history = self.load_history()
-        entry = {
-            "url": url,
-            "title": title,
-            "timestamp": datetime.now().isoformat()
-        }
-        history.insert(0, entry)
-        
-        # Keep only last 1000 entries
-        history = history[:1000]
-        self.save_history(history)
+        score = self.history.record_visit(url, title, typed, source_url=source_url)
+        self._notify("visit_recorded", url, title, score)
+    
+    def update_history_title(self, url: str, title: str):
+        """Update the title of a URL already in history"""
+        self.history.update_title(url, title)
+        self._notify("history_title_changed", url, title)
+    
+    def history_imported(self, places: list):
+        """Tell observers about places ({url, title, frecency}) added in bulk"""
+        if places:
+            self._notify("history_imported", places)
+    
+    def history_pruned(self, urls: list):
+        """Tell observers that URLs were dropped from history"""
+        if urls:
+            self._notify("history_removed", urls)
+    
+    def clear_history(self):
+        """Delete all browsing history"""
+        self.history.clear()
+        self._notify("history_cleared")
+    
+    def top_sites(self, limit: int = 8) -> list:
+        """Most used sites ranked by frecency"""
+        return self.history.top_sites(limit)
+    
+    def search_history(self, query: str, limit: int = 50) -> list:
+        """Full-text search over history URLs and titles"""
+        return self.history.search(query, limit)
     
     # Bookmarks
     def load_bookmarks(self) -> list:
-        """Load bookmarks"""
-        return self._read_json(self.bookmarks_file) or []
+        """Load all bookmarks in tree order"""
+        return self.bookmarks.all_bookmarks()
     
     def save_bookmarks(self, bookmarks: list):
-        """Save bookmarks"""
-        self._write_json(self.bookmarks_file, bookmarks)
-    
-    def add_bookmark(self, url: str, title: str):
-        """Add a bookmark"""
-        bookmarks = self.load_bookmarks()
-        bookmark = {
-            "url": url,
-            "title": title
-        }
-        bookmarks.append(bookmark)
-        self.save_bookmarks(bookmarks)
+        """Replace all bookmarks"""
+        for url in {b["url"] for b in self.bookmarks.all_bookmarks()}:
+            self._notify("bookmark_removed", url)
+        self.bookmarks.clear()
+        for bookmark in bookmarks:
+            self.add_bookmark(bookmark["url"], bookmark.get("title", ""))
+    
+    def add_bookmark(self, url: str, title: str, folder_id: int = None) -> int:
+        """Add a bookmark, returning its id (existing if already in the folder)"""
+        was_bookmarked = self.bookmarks.is_bookmarked(url)
+        bookmark_id = self.bookmarks.add_bookmark(url, title, folder_id)
+        if not was_bookmarked:
+            self._notify("bookmark_added", url, title)
+        return bookmark_id
     
     def remove_bookmark(self, url: str):
-        """Remove a bookmark"""
-        bookmarks = self.load_bookmarks()
-        bookmarks = [b for b in bookmarks if b["url"] != url]
-        self.save_bookmarks(bookmarks)
+        """Remove every bookmark of a URL"""
+        if self.bookmarks.remove_url(url):
+            self._notify("bookmark_removed", url)
+    
+    def import_bookmarks(self, path: str, folder_id: int = None) -> int:
+        """Import a Netscape HTML or JSON bookmark file; returns bookmarks added"""
+        added = self.bookmarks.import_events(bookmark_io.iter_file(path), folder_id)
+        self.bookmarks_imported(added)
+        return len(added)
+    
+    def bookmarks_imported(self, bookmarks: list):
+        """Tell observers about bookmarks ((url, title, date_added)) added in bulk"""
+        if bookmarks:
+            self._notify("bookmarks_imported", bookmarks)
+    
+    def export_bookmarks(self, path: str):
+        """Export all bookmarks; .json gets JSON, anything else Netscape HTML"""
+        with open(path, 'w', encoding='utf-8') as f:
+            if str(path).lower().endswith('.json'):
+                bookmark_io.write_json(self.bookmarks, f)
+            else:
+                bookmark_io.write_netscape_html(self.bookmarks, f)
+    
+    def is_bookmarked(self, url: str) -> bool:
+        """Check whether a URL is bookmarked"""
+        return self.bookmarks.is_bookmarked(url)
@@ -0,0 +1,57 @@
+"""
+Aether Browser - Tab State
+Pinned, muted and audible flags of open tabs, indexed by flag
+"""
+
+
+# Flags a tab can have
+PINNED = "pinned"
+MUTED = "muted"
+AUDIBLE = "audible"
+
+FLAGS = (PINNED, MUTED, AUDIBLE)
+
+
+class TabStateIndex:
+    """Which open tabs have each flag, by tab id.
+
+    Policies that exempt some tabs (discarding, bulk closing) ask for the
+    ids with a flag instead of asking every tab's page, so the question
+    costs the same however many tabs are open.
+    """
+
+    def __init__(self):
+        # Flag -> ids of tabs that have it
+        self._tab_ids = {flag: set() for flag in FLAGS}
+
+    def set(self, flag: str, tab_id: int, value: bool) -> bool:
+        """Give a tab a flag or take it away; returns whether that changed anything"""
+        tab_ids = self._tab_ids[flag]
+        if value == (tab_id in tab_ids):
+            return False
+        if value:
+            tab_ids.add(tab_id)
+        else:
+            tab_ids.discard(tab_id)
+        return True
+
+    def has(self, flag: str, tab_id: int) -> bool:
+        """Whether a tab has a flag"""
+        return tab_id in self._tab_ids[flag]
+
+    def tab_ids(self, *flags) -> frozenset:
+        """Ids of tabs having any of the flags"""
+        return frozenset().union(*(self._tab_ids[flag] for flag in flags))
+
+    def count(self, flag: str) -> int:
+        """Number of tabs with a flag"""
+        return len(self._tab_ids[flag])
+
+    def state(self, tab_id: int) -> dict:
+        """Every flag of one tab"""
+        return {flag: tab_id in tab_ids for flag, tab_ids in self._tab_ids.items()}
+
+    def remove(self, tab_id: int):
+        """Forget a closed tab"""
+        for tab_ids in self._tab_ids.values():
+            tab_ids.discard(tab_id)
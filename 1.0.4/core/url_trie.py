@@ -0,0 +1,235 @@
+"""
+Aether Browser - URL Prefix Trie
+Compressed prefix trie over normalized URLs with cached top-k per node
+"""
+
+import re
+from typing import Optional
+
+
+# How many best entries each node remembers for its subtree
+NODE_CAPACITY = 16
+
+_SCHEME_RE = re.compile(r"^[a-z][a-z0-9+.-]*://")
+
+
+def normalize_url(url: str) -> str:
+    """Reduce a URL (or typed text) to the form used as a trie key.
+
+    The scheme and a leading ``www.`` are dropped and everything is lowercased,
+    so ``https://www.GitHub.com/x`` and a typed ``github.com/x`` share a key.
+    """
+    key = url.strip().lower()
+    key = _SCHEME_RE.sub("", key, count=1)
+    if key.startswith("www."):
+        key = key[4:]
+    return key
+
+
+class _Node:
+    """Trie node; ``label`` is the edge text leading into it"""
+
+    __slots__ = ("label", "children", "urls", "top")
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.children = {}
+        # url -> score for URLs whose key ends exactly here
+        self.urls = {}
+        # [(score, url)] best entries of the whole subtree, highest first
+        self.top = []
+
+
+class UrlTrie:
+    """Radix trie mapping normalized URL prefixes to their best-scored URLs.
+
+    Every node caches the highest scoring URLs below it, so a lookup is a walk
+    down the typed prefix followed by reading one list, independent of how many
+    URLs share the prefix. Scores only need to be comparable with each other.
+    """
+
+    def __init__(self, capacity: int = NODE_CAPACITY):
+        self.capacity = capacity
+        self.root = _Node()
+        # url -> (key, score)
+        self._keys = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._keys
+
+    def score(self, url: str) -> Optional[float]:
+        """Current score of a URL, or None"""
+        entry = self._keys.get(url)
+        return entry[1] if entry else None
+
+    def insert(self, url: str, score: float):
+        """Add a URL or change its score"""
+        previous = self._keys.get(url)
+        if previous is not None and previous[1] > score:
+            # Lowering a score can evict it from cached lists; rebuild its path
+            self.remove(url)
+
+        key = normalize_url(url)
+        self._keys[url] = (key, score)
+
+        path = self._insert_path(key)
+        path[-1].urls[url] = score
+        for node in path:
+            self._offer(node, url, score)
+
+    def insert_many(self, items):
+        """Add many (url, score) pairs, then rebuild the caches they touched.
+
+        Only nodes on the inserted keys' paths are rebuilt, each once and
+        children before parents, so a batch costs about its own size rather
+        than the size of the whole trie.
+        """
+        # id(node) -> (key length at the node, node) of every node whose cache is stale
+        dirty = {}
+        for url, score in items:
+            previous = self._keys.get(url)
+            if previous is not None:
+                if previous[1] >= score:
+                    continue
+                old_path = self._find_path(previous[0])
+                old_path[-1].urls.pop(url, None)
+                self._mark(dirty, old_path)
+            key = normalize_url(url)
+            self._keys[url] = (key, score)
+            path = self._insert_path(key)
+            path[-1].urls[url] = score
+            self._mark(dirty, path)
+        # A node's key is longer than its parent's, and splitting an edge
+        # later in the batch doesn't change the key length of nodes below it
+        for _, node in sorted(dirty.values(), key=lambda entry: entry[0], reverse=True):
+            self._rebuild_top(node)
+
+    @staticmethod
+    def _mark(dirty: dict, path: list):
+        """Add the nodes of a path to a set of stale caches"""
+        length = 0
+        for node in path:
+            length += len(node.label)
+            dirty[id(node)] = (length, node)
+
+    def remove(self, url: str):
+        """Drop a URL from the trie"""
+        entry = self._keys.pop(url, None)
+        if entry is None:
+            return
+
+        path = self._find_path(entry[0])
+        if path is None:
+            return
+        path[-1].urls.pop(url, None)
+
+        # Prune empty leaves, then rebuild caches bottom-up along the path
+        for depth in range(len(path) - 1, 0, -1):
+            node, parent = path[depth], path[depth - 1]
+            if not node.urls and not node.children:
+                del parent.children[node.label[0]]
+        for node in reversed(path):
+            self._rebuild_top(node)
+
+    def complete(self, prefix: str, limit: int = 8) -> list:
+        """Best URLs whose normalized form starts with the prefix, as (score, url)"""
+        node = self._find_prefix_node(normalize_url(prefix))
+        if node is None:
+            return []
+        return node.top[:limit]
+
+    def _insert_path(self, key: str) -> list:
+        """Walk (creating/splitting nodes as needed) to the node for key"""
+        node = self.root
+        path = [node]
+        i = 0
+        while i < len(key):
+            child = node.children.get(key[i])
+            if child is None:
+                leaf = _Node(key[i:])
+                node.children[key[i]] = leaf
+                path.append(leaf)
+                return path
+
+            label = child.label
+            common = _common_prefix_length(label, key, i)
+            if common < len(label):
+                # Split the edge; the new middle node inherits the child's cache
+                middle = _Node(label[:common])
+                child.label = label[common:]
+                middle.children[child.label[0]] = child
+                middle.top = list(child.top)
+                node.children[key[i]] = middle
+                child = middle
+
+            node = child
+            path.append(node)
+            i += common
+        return path
+
+    def _find_path(self, key: str) -> Optional[list]:
+        """Path to the node whose key is exactly key"""
+        node = self.root
+        path = [node]
+        i = 0
+        while i < len(key):
+            child = node.children.get(key[i])
+            if child is None or not key.startswith(child.label, i):
+                return None
+            node = child
+            path.append(node)
+            i += len(child.label)
+        return path
+
+    def _find_prefix_node(self, prefix: str) -> Optional[_Node]:
+        """Highest node whose subtree holds every key starting with prefix"""
+        node = self.root
+        i = 0
+        while i < len(prefix):
+            child = node.children.get(prefix[i])
+            if child is None:
+                return None
+            rest = len(prefix) - i
+            if rest <= len(child.label):
+                # Prefix ends inside (or at the end of) this edge
+                return child if child.label.startswith(prefix[i:]) else None
+            if not prefix.startswith(child.label, i):
+                return None
+            node = child
+            i += len(child.label)
+        return node
+
+    def _offer(self, node: _Node, url: str, score: float):
+        """Merge one (score, url) into a node's cached best list"""
+        top = node.top
+        for index, (_, existing) in enumerate(top):
+            if existing == url:
+                top[index] = (score, url)
+                top.sort(reverse=True)
+                return
+        if len(top) < self.capacity:
+            top.append((score, url))
+            top.sort(reverse=True)
+        elif score > top[-1][0]:
+            top[-1] = (score, url)
+            top.sort(reverse=True)
+
+    def _rebuild_top(self, node: _Node):
+        """Recompute a node's cache from its own URLs and its children's caches"""
+        candidates = [(score, url) for url, score in node.urls.items()]
+        for child in node.children.values():
+            candidates.extend(child.top)
+        candidates.sort(reverse=True)
+        node.top = candidates[:self.capacity]
+
+
+def _common_prefix_length(label: str, key: str, start: int) -> int:
+    """Length of the common prefix of label and key[start:]"""
+    limit = min(len(label), len(key) - start)
+    i = 0
+    while i < limit and label[i] == key[start + i]:
+        i += 1
+    return i
@@ -0,0 +1,82 @@
+"""
+Aether Browser - History Dialog
+Lists recent history and searches it through the full-text index
+"""
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLineEdit,
+                             QListWidget, QListWidgetItem, QPushButton)
+from PyQt6.QtCore import Qt, pyqtSignal
+
+
+class HistoryDialog(QDialog):
+    """Searchable browsing history window"""
+
+    open_url_requested = pyqtSignal(str)
+
+    def __init__(self, storage, parent=None):
+        super().__init__(parent)
+        self.storage = storage
+
+        self.setWindowTitle("History")
+        self.setMinimumSize(600, 500)
+
+        self._setup_ui()
+        self._show_recent()
+
+    def _setup_ui(self):
+        """Setup history UI"""
+        layout = QVBoxLayout(self)
+
+        # Search box
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search history")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self._on_search_changed)
+        layout.addWidget(self.search_edit)
+
+        # Results
+        self.results_list = QListWidget()
+        self.results_list.itemActivated.connect(self._on_item_activated)
+        layout.addWidget(self.results_list)
+
+        # Buttons
+        buttons_layout = QHBoxLayout()
+        clear_btn = QPushButton("Clear History")
+        clear_btn.clicked.connect(self._on_clear_clicked)
+        buttons_layout.addWidget(clear_btn)
+        buttons_layout.addStretch()
+
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        buttons_layout.addWidget(close_btn)
+        layout.addLayout(buttons_layout)
+
+    def _show_recent(self):
+        """Show the most recent visits"""
+        self._populate(self.storage.load_history(limit=200))
+
+    def _populate(self, entries: list):
+        """Fill the results list"""
+        self.results_list.clear()
+        for entry in entries:
+            title = entry.get("title") or entry["url"]
+            item = QListWidgetItem(f"{title}\n{entry['url']}")
+            item.setData(Qt.ItemDataRole.UserRole, entry["url"])
+            self.results_list.addItem(item)
+
+    def _on_search_changed(self, text: str):
+        """Run a search as the user types"""
+        if text.strip():
+            self._populate(self.storage.search_history(text, limit=200))
+        else:
+            self._show_recent()
+
+    def _on_item_activated(self, item: QListWidgetItem):
+        """Open the selected entry"""
+        self.open_url_requested.emit(item.data(Qt.ItemDataRole.UserRole))
+        self.accept()
+
+    def _on_clear_clicked(self):
+        """Delete all history"""
+        self.storage.clear_history()
+        self.results_list.clear()
@@ -18,6 +18,8 @@ class MenuManager(QObject):
     mute_tab_requested = pyqtSignal(int)
     close_other_tabs_requested = pyqtSignal(int)
     close_tabs_right_requested = pyqtSignal(int)
+    close_duplicate_tabs_requested = pyqtSignal()
+    close_site_tabs_requested = pyqtSignal(int)
     
     # Main menu signals
     new_window_requested = pyqtSignal()
@@ -26,6 +28,11 @@ class MenuManager(QObject):
     history_requested = pyqtSignal()
     downloads_requested = pyqtSignal()
     bookmarks_requested = pyqtSignal()
+    import_bookmarks_requested = pyqtSignal()
+    export_bookmarks_requested = pyqtSignal()
+    task_manager_requested = pyqtSignal()
+    vertical_tabs_toggled = pyqtSignal(bool)
+    search_tabs_requested = pyqtSignal()
     extensions_requested = pyqtSignal()
     print_requested = pyqtSignal()
     find_requested = pyqtSignal()
@@ -39,6 +46,8 @@ class MenuManager(QObject):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Checked state of the Vertical Tabs action, kept by the window
+        self.vertical_tabs = False
     
     def show_about_dialog(self):
         """Show About Aether dialog"""
@@ -173,6 +182,16 @@ class MenuManager(QObject):
         close_right_action.triggered.connect(lambda: self.close_tabs_right_requested.emit(tab_index))
         menu.addAction(close_right_action)
         
+        # Close duplicate tabs
+        close_duplicates_action = QAction("Close Duplicate Tabs", menu)
+        close_duplicates_action.triggered.connect(self.close_duplicate_tabs_requested.emit)
+        menu.addAction(close_duplicates_action)
+        
+        # Close tabs from the same site
+        close_site_action = QAction("Close Tabs from This Site", menu)
+        close_site_action.triggered.connect(lambda: self.close_site_tabs_requested.emit(tab_index))
+        menu.addAction(close_site_action)
+        
         menu.addSeparator()
         
         # Close tab
@@ -224,8 +243,36 @@ class MenuManager(QObject):
         bookmarks_action.triggered.connect(self.bookmarks_requested.emit)
         menu.addAction(bookmarks_action)
         
+        # Import/export bookmarks
+        import_bookmarks_action = QAction("Import Bookmarks...", menu)
+        import_bookmarks_action.triggered.connect(self.import_bookmarks_requested.emit)
+        menu.addAction(import_bookmarks_action)
+        
+        export_bookmarks_action = QAction("Export Bookmarks...", menu)
+        export_bookmarks_action.triggered.connect(self.export_bookmarks_requested.emit)
+        menu.addAction(export_bookmarks_action)
+        
+        # Task Manager
+        task_manager_action = QAction("Task Manager", menu)
+        task_manager_action.setShortcut(QKeySequence("Shift+Esc"))
+        task_manager_action.triggered.connect(self.task_manager_requested.emit)
+        menu.addAction(task_manager_action)
+        
         menu.addSeparator()
         
+        # Search Tabs
+        search_tabs_action = QAction("Search Tabs...", menu)
+        search_tabs_action.setShortcut(QKeySequence("Ctrl+Shift+A"))
+        search_tabs_action.triggered.connect(self.search_tabs_requested.emit)
+        menu.addAction(search_tabs_action)
+        
+        # Vertical Tabs
+        vertical_tabs_action = QAction("Vertical Tabs", menu)
+        vertical_tabs_action.setCheckable(True)
+        vertical_tabs_action.setChecked(self.vertical_tabs)
+        vertical_tabs_action.toggled.connect(self.vertical_tabs_toggled.emit)
+        menu.addAction(vertical_tabs_action)
+        
         # Zoom submenu
         zoom_menu = menu.addMenu("Zoom")
         
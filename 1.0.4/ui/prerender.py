@@ -0,0 +1,195 @@
+"""
+Aether Browser - Prerendering
+Loads the address bar's most likely destination in a hidden page before Enter is pressed
+"""
+
+from PyQt6.QtCore import QObject, QTimer, QUrl
+from PyQt6.QtWebEngineCore import QWebEnginePage
+
+from core.url_trie import normalize_url
+
+
+def _url_key(url: str) -> str:
+    """Form of a URL used to decide whether a navigation is the prerendered one"""
+    return normalize_url(url).rstrip("/")
+
+
+class _Prerender:
+    __slots__ = ("url", "key", "page", "profile")
+
+    def __init__(self, url: str, page, profile):
+        self.url = url
+        self.key = _url_key(url)
+        self.page = page
+        self.profile = profile
+
+
+class Prerenderer(QObject):
+    """Speculative loading of one likely next page.
+
+    A suggestion is likely when it is a history or bookmark URL that starts
+    with the typed text, has at least MIN_SCORE frecency and DOMINANCE times
+    the score of any other such suggestion. It is loaded muted in a hidden
+    page of the tab's profile. If Enter navigates to it, the window swaps that page into
+    the tab (see BrowserTab.adopt_page). Otherwise the prerender is a waste.
+
+    Limits: at most MAX_PRERENDERS hidden pages exist at a time. Nothing
+    starts while the tab lifecycle manager reports memory over budget. A
+    prerender is dropped once its renderer passes MAX_MEMORY_MB or after
+    EXPIRE_MS unused. Renderer memory comes from the lifecycle manager's
+    ProcessMonitor, which samples prerendered pages too.
+
+    stats counts started, used (swapped in), warmed (navigated to without a
+    swap, so only the network cache was warmed) and wasted prerenders.
+    """
+
+    MAX_PRERENDERS = 1
+    MAX_MEMORY_MB = 300
+    EXPIRE_MS = 30 * 1000
+    CHECK_INTERVAL_MS = 1000
+
+    MIN_TEXT_LENGTH = 2
+    MIN_SCORE = 3.0
+    DOMINANCE = 2.0
+
+    def __init__(self, tab_lifecycle=None, page_factory=None, parent=None):
+        super().__init__(parent)
+        self.tab_lifecycle = tab_lifecycle
+        self.page_factory = page_factory or (lambda profile: QWebEnginePage(profile, self))
+        self.enabled = True
+        self._prerenders = []
+        self.stats = {"started": 0, "used": 0, "warmed": 0, "wasted": 0, "over_memory": 0}
+
+        # Memory and age checks while anything is prerendering
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._check)
+        self._ages = {}
+
+    # Deciding
+    def likely_url(self, text: str, suggestions: list) -> str:
+        """The suggestion worth prerendering for typed text, or None"""
+        typed = _url_key(text)
+        if len(typed) < self.MIN_TEXT_LENGTH or " " in typed:
+            return None
+        candidates = [
+            suggestion for suggestion in suggestions
+            if suggestion.get("source") in ("history", "bookmarks")
+            and suggestion["url"].startswith(("http://", "https://"))
+            and _url_key(suggestion["url"]).startswith(typed)
+        ]
+        if not candidates:
+            return None
+        # Bookmarks carry no score; a bookmark counts as just likely enough
+        bookmark_score = self.MIN_SCORE
+        scores = sorted(
+            (candidate.get("score")
+             or (bookmark_score if candidate["source"] == "bookmarks" else 0.0), index)
+            for index, candidate in enumerate(candidates)
+        )
+        best, best_index = scores[-1]
+        runner_up = scores[-2][0] if len(scores) > 1 else 0.0
+        if best >= self.MIN_SCORE and best >= self.DOMINANCE * runner_up:
+            return candidates[best_index]["url"]
+        return None
+
+    def suggestions_changed(self, text: str, suggestions: list, profile):
+        """Prerender the likely suggestion for what's typed, replacing any other"""
+        if not self.enabled:
+            return
+        url = self.likely_url(text, suggestions)
+        if url is None:
+            return
+        key = _url_key(url)
+        if any(prerender.key == key and prerender.profile is profile
+               for prerender in self._prerenders):
+            return
+        self.start(url, profile)
+
+    def start(self, url: str, profile):
+        """Load url in a hidden page, dropping the oldest prerender if at the limit"""
+        if self.tab_lifecycle is not None:
+            budget = self.tab_lifecycle.budget_bytes
+            if budget and self.tab_lifecycle.memory_in_use() > budget:
+                return
+        while len(self._prerenders) >= self.MAX_PRERENDERS:
+            self._drop(self._prerenders[0], "wasted")
+
+        page = self.page_factory(profile)
+        page.setAudioMuted(True)
+        page.setUrl(QUrl(url))
+        self._prerenders.append(_Prerender(url, page, profile))
+        self._ages[page] = 0
+        self.stats["started"] += 1
+        if not self.timer.isActive():
+            self.timer.start(self.CHECK_INTERVAL_MS)
+
+    # Using
+    def take(self, url: str, profile, adopt: bool = True):
+        """The hidden page for a navigation to url, or None.
+
+        With adopt False the caller will load the URL normally; a matching
+        prerender is then dropped and counted as warmed rather than used.
+        Every other prerender is dropped as wasted, since the user has
+        committed to a different page.
+        """
+        key = _url_key(url)
+        page = None
+        for prerender in list(self._prerenders):
+            if prerender.key == key and prerender.profile is profile:
+                if adopt:
+                    self._forget(prerender)
+                    prerender.page.setAudioMuted(False)
+                    self.stats["used"] += 1
+                    page = prerender.page
+                else:
+                    self._drop(prerender, "warmed")
+            else:
+                self._drop(prerender, "wasted")
+        return page
+
+    def cancel(self):
+        """Drop every prerender"""
+        for prerender in list(self._prerenders):
+            self._drop(prerender, "wasted")
+
+    def hit_rate(self) -> float:
+        """Share of finished prerenders that were navigated to"""
+        hits = self.stats["used"] + self.stats["warmed"]
+        finished = hits + self.stats["wasted"] + self.stats["over_memory"]
+        return hits / finished if finished else 0.0
+
+    # Housekeeping
+    def _forget(self, prerender: _Prerender):
+        self._prerenders.remove(prerender)
+        self._ages.pop(prerender.page, None)
+        if not self._prerenders:
+            self.timer.stop()
+        self._watch()
+
+    def _watch(self):
+        """Have the process monitor sample the renderers of prerendered pages"""
+        if self.tab_lifecycle is not None:
+            self.tab_lifecycle.monitor.watch(
+                [prerender.page.renderProcessPid() for prerender in self._prerenders],
+                "prerender"
+            )
+
+    def _drop(self, prerender: _Prerender, outcome: str):
+        self._forget(prerender)
+        self.stats[outcome] += 1
+        prerender.page.deleteLater()
+
+    def _check(self):
+        """Drop prerenders that grew too large or went unused too long"""
+        limit = self.MAX_MEMORY_MB * 1024 * 1024
+        usage = self.tab_lifecycle.monitor.latest() if self.tab_lifecycle is not None else {}
+        for prerender in list(self._prerenders):
+            page = prerender.page
+            self._ages[page] += self.CHECK_INTERVAL_MS
+            rss = usage.get(page.renderProcessPid(), {}).get("memory")
+            if rss is not None and rss > limit:
+                self._drop(prerender, "over_memory")
+            elif self._ages[page] >= self.EXPIRE_MS:
+                self._drop(prerender, "wasted")
+        # A page's renderer starts once its load begins, so its pid can appear late
+        self._watch()
@@ -0,0 +1,132 @@
+"""
+Aether Browser - Application Services
+Per-process objects shared by every browser window
+"""
+
+from PyQt6.QtCore import QObject
+from PyQt6.QtGui import QColor
+
+from ui.theme import Theme
+from ui.webview import WebViewManager
+from ui.visit_recorder import VisitRecorder
+from ui.tab_lifecycle import TabLifecycleManager
+from ui.session import SessionManager
+from ui.tab_registry import TabRegistry
+from ui.prerender import Prerenderer
+from core.storage import Storage
+from core.autocomplete import AutocompleteIndex
+from core.retention import HistoryPruner
+
+
+class BrowserServices(QObject):
+    """Storage, theme, web engine profiles and the ad blocker, created once.
+
+    Every window gets the same instances, so all windows see the same
+    in-memory state and there is exactly one writer to the storage files.
+    Background work is started with the first window and stopped when the
+    last one closes.
+    """
+
+    _instance = None
+
+    def __init__(self, storage_dir: str = None, storage: Storage = None, parent=None):
+        super().__init__(parent)
+
+        # Initialize storage, unless it was opened before the application started
+        self.storage = storage or Storage(storage_dir)
+        self.autocomplete = AutocompleteIndex(self.storage)
+        self.autocomplete.load_in_background()
+
+        # Carry over history and bookmarks from older versions without blocking startup
+        self.storage.start_legacy_migration()
+
+        # Writes one history entry per real navigation, for tabs of any window
+        self.visit_recorder = VisitRecorder(self.storage, self)
+
+        # Enforce history retention off the GUI thread
+        self.history_pruner = HistoryPruner(self.storage)
+        self.history_pruner.start()
+
+        # Profiles and the ad blocker's filter lists are loaded once for all windows
+        self.webview_manager = WebViewManager()
+        self.webview_manager.start_pool()
+
+        self.theme = Theme()
+        self._load_settings()
+        self.theme.theme_changed.connect(self.save_settings)
+
+        # Open windows, which also keeps them from being garbage collected
+        self.windows = []
+        self._next_window_id = 1
+
+        # Every open tab by id and by web view
+        self.tabs = TabRegistry()
+
+        # Saves windows and tabs as they change so they can be restored
+        self.session = SessionManager(self.storage.database, self)
+
+        # Freeze idle background tabs and discard old ones when memory runs short
+        self.storage.settings.set_defaults(TabLifecycleManager.DEFAULTS)
+        self.tab_lifecycle = TabLifecycleManager(
+            self.storage, lambda: [window.tab_widget for window in self.windows], self.tabs, self
+        )
+        self.tab_lifecycle.track_downloads(self.webview_manager.default_profile)
+        self.tab_lifecycle.track_downloads(self.webview_manager.private_profile)
+        self.tab_lifecycle.start()
+
+        # Loads the address bar's likely destination before Enter is pressed
+        self.prerenderer = Prerenderer(self.tab_lifecycle, parent=self)
+
+    @classmethod
+    def instance(cls, storage: Storage = None) -> "BrowserServices":
+        """The services of this process, created on first use"""
+        if cls._instance is None:
+            cls._instance = cls(storage=storage)
+        return cls._instance
+
+    def _load_settings(self):
+        """Apply saved settings to the theme"""
+        settings = self.storage.load_settings()
+        self.theme.dark_mode = settings.get('dark_mode', False)
+        self.theme.accent_color = QColor(settings.get('accent_color', '#4285f4'))
+
+    def save_settings(self):
+        """Save the theme settings"""
+        self.storage.settings.update({
+            'dark_mode': self.theme.dark_mode,
+            'accent_color': self.theme.accent_color.name(),
+        })
+
+    def new_window_id(self, window_id: int = None) -> int:
+        """An id for a new window, or reserve a restored window's id"""
+        if window_id is None:
+            window_id = self._next_window_id
+        self._next_window_id = max(self._next_window_id, window_id + 1)
+        return window_id
+
+    def window_opened(self, window):
+        """Track a new window"""
+        if window not in self.windows:
+            self.windows.append(window)
+        self.session.window_opened(window)
+
+    def window_closed(self, window):
+        """Forget a closed window; shut down background work after the last one"""
+        last = self.windows == [window]
+        # The last window's tabs are the session to restore next time
+        self.session.window_closed(window, last)
+        self.tabs.remove_window(window)
+        if window in self.windows:
+            self.windows.remove(window)
+        if not self.windows:
+            self.shutdown()
+
+    def shutdown(self):
+        """Save settings and stop background threads"""
+        self.save_settings()
+        self.prerenderer.cancel()
+        self.webview_manager.clear_pool()
+        self.tab_lifecycle.stop()
+        self.history_pruner.stop()
+        self.storage.legacy_migration.stop()
+        self.session.close()
@@ -0,0 +1,166 @@
+"""
+Aether Browser - Session Manager
+Saves open windows and tabs as they change and restores them on startup
+"""
+
+from PyQt6.QtCore import QObject, QTimer
+
+from core.session import SessionChanges, SessionStore, SessionWriter
+
+
+class SessionManager(QObject):
+    """Incremental session snapshots for every window.
+
+    Windows and tabs report changes by marking themselves dirty. After
+    DEBOUNCE_MS the dirty ones are snapshotted on the GUI thread (history
+    serialization needs the page) and handed to a SessionWriter, which
+    writes them to SQLite on its own thread. Unchanged tabs are never
+    rewritten. Restored tabs are placeholders; only each window's current
+    tab loads.
+    """
+
+    DEBOUNCE_MS = 1000
+
+    def __init__(self, database, parent=None):
+        super().__init__(parent)
+        self.store = SessionStore(database)
+        self.writer = SessionWriter(self.store)
+        self.windows = []
+
+        self._dirty_windows = set()
+        self._dirty_tabs = set()
+        self._removed = SessionChanges()
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.save_changes)
+
+    # Tracking
+    def window_opened(self, window):
+        """Start saving a window"""
+        if window not in self.windows:
+            self.windows.append(window)
+        tab_widget = window.tab_widget
+        tab_widget.tab_changed.connect(lambda _: self.window_changed(window))
+        tab_widget.tabBar().tabMoved.connect(lambda *_: self.window_changed(window))
+        self.window_changed(window)
+
+    def window_closed(self, window, last: bool):
+        """Stop saving a window; the last window's tabs are kept for the next start"""
+        if last:
+            self.save_all()
+            return
+        if window in self.windows:
+            self.windows.remove(window)
+        self._dirty_windows.discard(window)
+        self._removed.removed_windows.add(window.window_id)
+        for tab in self._window_tabs(window):
+            self._dirty_tabs.discard(tab)
+        self._schedule()
+
+    def tab_added(self, window, tab, saved: bool = False):
+        """Start saving a tab; saved tabs come from the stored session and aren't rewritten"""
+        tab.changed.connect(lambda: self.tab_changed(tab))
+        if not saved:
+            self._dirty_tabs.add(tab)
+            self.window_changed(window)
+
+    def tab_removed(self, window, tab):
+        """Stop saving a closed tab"""
+        self._dirty_tabs.discard(tab)
+        self._removed.removed_tabs.add(tab.tab_id)
+        self.window_changed(window)
+
+    def tab_changed(self, tab):
+        """A tab's URL, title or history changed"""
+        self._dirty_tabs.add(tab)
+        self._schedule()
+
+    def window_changed(self, window):
+        """A window's tab order, current tab or geometry changed"""
+        self._dirty_windows.add(window)
+        self._schedule()
+
+    def _schedule(self):
+        # Not restarted on every change, so a steady stream of changes still saves
+        if not self.timer.isActive():
+            self.timer.start(self.DEBOUNCE_MS)
+
+    # Saving
+    def _window_tabs(self, window) -> list:
+        tab_widget = window.tab_widget
+        return [tab_widget.widget(index) for index in range(tab_widget.count())]
+
+    def _window_snapshot(self, window) -> dict:
+        tabs = self._window_tabs(window)
+        current = window.tab_widget.currentWidget()
+        return {
+            "position": self.windows.index(window),
+            "geometry": bytes(window.saveGeometry()),
+            "current_tab": current.tab_id if current is not None else None,
+            "tabs": [tab.tab_id for tab in tabs],
+        }
+
+    def _collect(self, windows, tabs) -> SessionChanges:
+        """Snapshot windows and tabs into a change set"""
+        changes = SessionChanges()
+        # Where each tab is, for tab rows written before their window's next snapshot
+        placement = {}
+        for window in self.windows:
+            for position, tab in enumerate(self._window_tabs(window)):
+                placement[tab] = (window.window_id, position)
+        for window in windows:
+            if window in self.windows:
+                changes.windows[window.window_id] = self._window_snapshot(window)
+        for tab in tabs:
+            if tab not in placement:
+                continue
+            window_id, position = placement[tab]
+            changes.tabs[tab.tab_id] = dict(tab.snapshot(), window_id=window_id,
+                                            position=position)
+        return changes
+
+    def save_changes(self):
+        """Snapshot what changed since the last save and queue it for writing"""
+        self.timer.stop()
+        # The current tabs are included to pick up scroll positions
+        tabs = self._dirty_tabs | {
+            window.tab_widget.currentWidget() for window in self.windows
+        }
+        changes = self._removed
+        changes.merge(self._collect(self._dirty_windows, tabs))
+        self._dirty_windows, self._dirty_tabs = set(), set()
+        self._removed = SessionChanges()
+        self.writer.submit(changes)
+
+    def save_all(self):
+        """Snapshot every window and tab, replacing the stored session"""
+        self.timer.stop()
+        changes = SessionChanges()
+        changes.replace = True
+        changes.merge(self._collect(
+            self.windows, [tab for window in self.windows for tab in self._window_tabs(window)]
+        ))
+        self._dirty_windows, self._dirty_tabs = set(), set()
+        self._removed = SessionChanges()
+        self.writer.submit(changes)
+
+    def close(self):
+        """Write everything pending and stop the writer thread"""
+        self.writer.stop()
+
+    # Restoring
+    def restore(self, create_window) -> list:
+        """Reopen the saved windows and tabs; returns the new windows.
+
+        create_window(window_id) must return an empty window; its tabs are
+        added as placeholders and only the current tab of each window loads.
+        """
+        windows = []
+        for saved in self.store.load():
+            window = create_window(saved["id"])
+            if saved["geometry"]:
+                window.restoreGeometry(saved["geometry"])
+            window.restore_tabs(saved["tabs"], saved["current_tab"])
+            windows.append(window)
+        return windows
@@ -0,0 +1,230 @@
+"""
+Aether Browser - Address Bar Suggestions
+Runs suggestion providers on a thread pool and merges their results
+"""
+
+import time
+from urllib.parse import quote_plus
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+# How many latency samples to keep per provider
+LATENCY_SAMPLES = 200
+
+
+class SuggestionProvider:
+    """Base class for a source of address bar suggestions.
+
+    ``prepare`` runs on the GUI thread and may snapshot GUI state; ``suggest``
+    runs on a worker thread and must only touch thread-safe objects.
+    """
+
+    name = "provider"
+    # Lower values are listed first when merging
+    priority = 50
+
+    def prepare(self, text: str):
+        """Collect whatever GUI-thread state suggest() needs"""
+        return None
+
+    def suggest(self, text: str, limit: int, context) -> list:
+        """Return suggestions as {url, title, score} dicts"""
+        raise NotImplementedError
+
+
+class HistoryProvider(SuggestionProvider):
+    """URL prefix completions, topped up with full-text title matches"""
+
+    name = "history"
+    priority = 20
+
+    def __init__(self, autocomplete, storage):
+        self.autocomplete = autocomplete
+        self.storage = storage
+
+    def suggest(self, text: str, limit: int, context) -> list:
+        results = self.autocomplete.complete(text, limit)
+        if len(results) < limit:
+            seen = {result["url"] for result in results}
+            for place in self.storage.search_history(text, limit):
+                if place["url"] not in seen:
+                    results.append(place)
+        return results[:limit]
+
+
+class BookmarkProvider(SuggestionProvider):
+    """Bookmarks whose title or URL contains the typed text"""
+
+    name = "bookmarks"
+    priority = 10
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    def suggest(self, text: str, limit: int, context) -> list:
+        return [
+            {"url": bookmark["url"], "title": bookmark["title"]}
+            for bookmark in self.storage.bookmarks.search(text, limit)
+        ]
+
+
+class OpenTabsProvider(SuggestionProvider):
+    """Tabs already open in the window"""
+
+    name = "tabs"
+    priority = 0
+
+    def __init__(self, tabs_source):
+        # Callable returning [(url, title)], only ever called on the GUI thread
+        self.tabs_source = tabs_source
+
+    def prepare(self, text: str):
+        return list(self.tabs_source())
+
+    def suggest(self, text: str, limit: int, context) -> list:
+        needle = text.lower()
+        results = []
+        for url, title in context:
+            if url.startswith('file://'):
+                continue
+            if needle in url.lower() or needle in title.lower():
+                results.append({"url": url, "title": title})
+                if len(results) >= limit:
+                    break
+        return results
+
+
+class SearchProvider(SuggestionProvider):
+    """A web search for the typed text"""
+
+    name = "search"
+    priority = 90
+
+    search_url = "https://www.google.com/search?q={}"
+
+    def suggest(self, text: str, limit: int, context) -> list:
+        return [{
+            "url": self.search_url.format(quote_plus(text)),
+            "title": f"Search Google for \"{text}\""
+        }]
+
+
+class _ProviderTask(QRunnable):
+    """Runs one provider for one query on the thread pool"""
+
+    def __init__(self, pipeline, provider, generation: int, text: str, limit: int, context):
+        super().__init__()
+        self.pipeline = pipeline
+        self.provider = provider
+        self.generation = generation
+        self.text = text
+        self.limit = limit
+        self.context = context
+
+    def run(self):
+        # Skip the work entirely if the user has typed since this was queued
+        if self.generation != self.pipeline.generation:
+            return
+
+        started = time.perf_counter()
+        try:
+            results = self.provider.suggest(self.text, self.limit, self.context)
+        except Exception as e:
+            print(f"[Suggestions] {self.provider.name} failed: {e}")
+            results = []
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        # Queued back to the GUI thread, where stale generations are dropped
+        self.pipeline.provider_finished.emit(
+            self.generation, self.provider.name, results, elapsed_ms
+        )
+
+
+class SuggestionPipeline(QObject):
+    """Fans a query out to every provider and merges results as they arrive"""
+
+    # Merged suggestions for the current query, re-emitted as providers finish
+    suggestions_changed = pyqtSignal(list)
+    # Internal: (generation, provider name, results, latency in ms)
+    provider_finished = pyqtSignal(int, str, list, float)
+
+    def __init__(self, providers: list, limit: int = 8, parent=None):
+        super().__init__(parent)
+        self.providers = {provider.name: provider for provider in providers}
+        self.limit = limit
+
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max(2, len(providers)))
+
+        self.generation = 0
+        self.text = ""
+        self._results = {}
+        self.latencies = {provider.name: [] for provider in providers}
+
+        self.provider_finished.connect(self._on_provider_finished)
+
+    def query(self, text: str):
+        """Start a new query, abandoning any in flight"""
+        self.generation += 1
+        self.text = text
+        self._results = {}
+
+        # Drop tasks for older queries that haven't started yet
+        self.thread_pool.clear()
+
+        if not text.strip():
+            self.suggestions_changed.emit([])
+            return
+
+        for provider in self.providers.values():
+            context = provider.prepare(text)
+            self.thread_pool.start(
+                _ProviderTask(self, provider, self.generation, text, self.limit, context)
+            )
+
+    def cancel(self):
+        """Abandon the current query"""
+        self.generation += 1
+        self._results = {}
+        self.thread_pool.clear()
+
+    def _on_provider_finished(self, generation: int, name: str, results: list, elapsed_ms: float):
+        """Record latency and merge results if they belong to the current query"""
+        samples = self.latencies[name]
+        samples.append(elapsed_ms)
+        if len(samples) > LATENCY_SAMPLES:
+            del samples[0]
+
+        if generation != self.generation:
+            return
+        self._results[name] = results
+        self.suggestions_changed.emit(self._merge())
+
+    def _merge(self) -> list:
+        """Combine provider results by priority, keeping the first of each URL"""
+        merged = []
+        seen = set()
+        ordered = sorted(self._results, key=lambda name: self.providers[name].priority)
+        for name in ordered:
+            for result in self._results[name]:
+                if result["url"] in seen:
+                    continue
+                seen.add(result["url"])
+                merged.append(dict(result, source=name))
+        return merged[:self.limit]
+
+    def latency_report(self) -> dict:
+        """Per-provider latency percentiles in milliseconds"""
+        report = {}
+        for name, samples in self.latencies.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            report[name] = {
+                "count": len(ordered),
+                "p50": ordered[len(ordered) // 2],
+                "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                "max": ordered[-1],
+            }
+        return report
@@ -0,0 +1,341 @@
+"""
+Aether Browser - Browser Tab
+A tab that holds its URL and title and only creates a web view when shown
+"""
+
+from typing import Optional
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+from PyQt6.QtGui import QIcon
+from PyQt6.QtCore import pyqtSignal, QByteArray, QDataStream, QIODevice
+from PyQt6.QtWebEngineCore import QWebEnginePage
+
+
+# Page lifecycle states (Qt 5.14+); without them a discard destroys the view
+LifecycleState = getattr(QWebEnginePage, "LifecycleState", None)
+
+
+def serialize_history(page: QWebEnginePage) -> Optional[bytes]:
+    """A page's back/forward history as bytes, or None if it can't be saved"""
+    data = QByteArray()
+    stream = QDataStream(data, QIODevice.OpenModeFlag.WriteOnly)
+    try:
+        stream << page.history()
+    except TypeError:
+        # This PyQt build doesn't expose QWebEngineHistory streaming
+        return None
+    return bytes(data)
+
+
+def restore_history(page: QWebEnginePage, data: bytes) -> bool:
+    """Load saved history into a page, which navigates to its current entry"""
+    stream = QDataStream(QByteArray(data))
+    try:
+        stream >> page.history()
+    except TypeError:
+        return False
+    return stream.status() == QDataStream.Status.Ok
+
+
+class BrowserTab(QWidget):
+    """Placeholder-first browser tab.
+
+    Until it is activated a tab is just its URL, title and favicon: no
+    QWebEngineView, renderer process or network request exists for it.
+    ensure_loaded() creates the web view with the factory it was given and
+    loads the URL, so opening or restoring many tabs costs next to nothing.
+    """
+
+    # Emitted once the real web view exists
+    view_created = pyqtSignal(object)
+    # Emitted with the web view before a discarded page is reloaded
+    restoring = pyqtSignal(object)
+    # Emitted with the web view when a discard had to destroy it
+    view_destroyed = pyqtSignal(object)
+    # Emitted when the URL, title or navigation history changed
+    changed = pyqtSignal()
+
+    # Ids are unique within the process and kept across session restores
+    _next_id = 1
+
+    def __init__(self, view_factory, url: str, title: str = "", icon: QIcon = None,
+                 tab_id: int = None, parent=None):
+        super().__init__(parent)
+        if tab_id is None:
+            tab_id = BrowserTab._next_id
+        BrowserTab._next_id = max(BrowserTab._next_id, tab_id + 1)
+        self.tab_id = tab_id
+
+        self._view_factory = view_factory
+        self.url = url
+        self.title = title
+        self.icon = icon or QIcon()
+        self.webview = None
+        self.discarded = False
+        self.scroll_position = None
+        # Serialized back/forward history to apply when the view is created
+        self.history_state = None
+
+        # Work that must keep running in the background (see can_freeze)
+        self.downloads = []
+        # (origin, feature) capture requests the page has made and not withdrawn
+        self.capture_requests = set()
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the web view has been created"""
+        return self.webview is not None
+
+    @property
+    def is_live(self) -> bool:
+        """Whether the tab has a running page (loaded and not discarded)"""
+        return self.webview is not None and not self.discarded
+
+    @property
+    def is_frozen(self) -> bool:
+        """Whether the page is alive but its scripts and timers are suspended"""
+        return (self.is_live and LifecycleState is not None
+                and self.webview.page().lifecycleState() == LifecycleState.Frozen)
+
+    @property
+    def state(self) -> str:
+        """unloaded, active, frozen or discarded"""
+        if self.discarded:
+            return "discarded"
+        if self.webview is None:
+            return "unloaded"
+        return "frozen" if self.is_frozen else "active"
+
+    def ensure_loaded(self):
+        """Create the web view and load the URL if that hasn't happened yet.
+
+        A frozen tab is resumed and a discarded tab brought back to life here.
+        """
+        if self.discarded:
+            return self._restore()
+        if self.webview is None:
+            return self._create_view()
+        if self.is_frozen:
+            self.webview.page().setLifecycleState(LifecycleState.Active)
+        return self.webview
+
+    @property
+    def active_downloads(self) -> int:
+        """Downloads started from this page that haven't finished"""
+        active = []
+        for download in self.downloads:
+            try:
+                if not download.isFinished():
+                    active.append(download)
+            except RuntimeError:
+                # Qt already deleted a cancelled request
+                pass
+        self.downloads = active
+        return len(active)
+
+    def can_freeze(self) -> bool:
+        """Whether suspending the page would break something the user relies on"""
+        return (self.is_live and LifecycleState is not None and not self.is_frozen
+                and not self.is_audible() and not self.active_downloads
+                and not self.uses_media_capture and not self.webview.page().isLoading())
+
+    def freeze(self) -> bool:
+        """Suspend the page's scripts, timers and animations; returns whether it froze"""
+        if not self.can_freeze():
+            return False
+        page = self.webview.page()
+        page.setLifecycleState(LifecycleState.Frozen)
+        return page.lifecycleState() == LifecycleState.Frozen
+
+    def _create_view(self):
+        """Create the web view and start loading the URL"""
+        webview = self._view_factory()
+        self.webview = webview
+        self.layout().addWidget(webview)
+
+        # Keep the placeholder state current so it survives without the view
+        webview.urlChanged.connect(self._on_url_changed)
+        webview.titleChanged.connect(self._on_title_changed)
+        webview.iconChanged.connect(self._on_icon_changed)
+        webview.loadFinished.connect(self.changed.emit)
+        webview.loadStarted.connect(self.capture_requests.clear)
+        self._watch_permissions(webview.page())
+
+        self.view_created.emit(webview)
+        history, self.history_state = self.history_state, None
+        if self.discarded or history is not None:
+            # Bringing back a page the user already had open, not a new visit
+            self.discarded = False
+            self.restoring.emit(webview)
+            self._restore_scroll_after_load(webview)
+        # Views from the new tab pool arrive already showing their page
+        if ((history is None or not restore_history(webview.page(), history))
+                and webview.get_url() != self.url):
+            webview.load_url(self.url)
+        return webview
+
+    def can_adopt_page(self) -> bool:
+        """Whether replacing the page would lose nothing the user can go back to"""
+        return self.is_live and self.webview.page().history().count() <= 1
+
+    def adopt_page(self, page: QWebEnginePage):
+        """Show a page loaded elsewhere (a prerender) in place of the current one"""
+        webview = self.webview
+        old_page = webview.page()
+        page.setParent(webview)
+        webview.setPage(page)
+        self.capture_requests.clear()
+        self._watch_permissions(page)
+        old_page.deleteLater()
+        self.changed.emit()
+
+    def restore_state(self, history: Optional[bytes], scroll_position: tuple = None):
+        """Set saved history and scroll position to apply when the view is created"""
+        self.history_state = history
+        self.scroll_position = scroll_position
+
+    def snapshot(self) -> dict:
+        """URL, title, serialized history and scroll position, for session saving"""
+        history, scroll = self.history_state, self.scroll_position
+        if self.webview is not None:
+            page = self.webview.page()
+            history = serialize_history(page)
+            if self.is_live:
+                position = page.scrollPosition()
+                scroll = (position.x(), position.y())
+        scroll_x, scroll_y = scroll or (0, 0)
+        return {
+            "url": self.get_url(),
+            "title": self.title,
+            "history": history,
+            "scroll_x": scroll_x,
+            "scroll_y": scroll_y,
+        }
+
+    def discard(self) -> bool:
+        """Free the page's renderer, keeping what's needed to bring it back.
+
+        With lifecycle states the page is put in the Discarded state, which
+        keeps its back/forward history; otherwise the history is serialized
+        and the view destroyed. Returns whether the tab was discarded.
+        """
+        if not self.is_live:
+            return False
+        page = self.webview.page()
+        position = page.scrollPosition()
+        self.scroll_position = (position.x(), position.y())
+        self.url = self.get_url()
+        self.title = self.webview.title() or self.title
+        self.capture_requests.clear()
+
+        if LifecycleState is not None:
+            page.setLifecycleState(LifecycleState.Discarded)
+            if page.lifecycleState() == LifecycleState.Discarded:
+                self.discarded = True
+                return True
+
+        self.history_state = serialize_history(page)
+        webview, self.webview = self.webview, None
+        self.layout().removeWidget(webview)
+        self.view_destroyed.emit(webview)
+        webview.deleteLater()
+        self.discarded = True
+        return True
+
+    def _restore(self):
+        """Reactivate a discarded tab"""
+        if self.webview is None:
+            return self._create_view()
+        self.discarded = False
+        self.restoring.emit(self.webview)
+        self._restore_scroll_after_load(self.webview)
+        # Going back to Active reloads the page from its saved history entry
+        self.webview.page().setLifecycleState(LifecycleState.Active)
+        return self.webview
+
+    def _restore_scroll_after_load(self, webview):
+        """Scroll back to where the page was when it was discarded"""
+        if not self.scroll_position:
+            return
+        x, y = self.scroll_position
+        self.scroll_position = None
+
+        def restore(ok):
+            webview.loadFinished.disconnect(restore)
+            if ok:
+                webview.page().runJavaScript(f"window.scrollTo({x}, {y});")
+        webview.loadFinished.connect(restore)
+
+    def render_process_pid(self) -> int:
+        """Process id of the page's renderer (0 if it has none)"""
+        if not self.is_live:
+            return 0
+        return self.webview.page().renderProcessPid()
+
+    def is_audible(self) -> bool:
+        """Whether the page has played sound recently"""
+        return self.is_live and self.webview.page().recentlyAudible()
+
+    def navigate(self, url: str):
+        """Load a URL now, creating the web view if needed"""
+        self.url = url
+        if self.discarded:
+            # A new navigation replaces the discarded page instead of restoring it
+            self.discarded = False
+            self.scroll_position = None
+            self.history_state = None
+            if self.webview is not None:
+                self.webview.page().setLifecycleState(LifecycleState.Active)
+        if self.webview is None:
+            # The URL replaces whatever a restored tab would have shown
+            self.history_state = None
+            self.scroll_position = None
+            self._create_view()
+        else:
+            self.webview.load_url(url)
+
+    def get_url(self) -> str:
+        """Current URL, whether or not the view exists"""
+        if self.webview is not None and not self.webview.url().isEmpty():
+            return self.webview.get_url()
+        return self.url
+
+    def get_title(self) -> str:
+        """Current title, whether or not the view exists"""
+        if self.webview is not None:
+            return self.webview.get_title()
+        return self.title or "New Tab"
+
+    def _on_url_changed(self, url):
+        if not url.isEmpty():
+            self.url = url.toString()
+            self.changed.emit()
+
+    def _on_title_changed(self, title: str):
+        if title:
+            self.title = title
+            self.changed.emit()
+
+    def _on_icon_changed(self, icon: QIcon):
+        self.icon = icon
+
+    @property
+    def uses_media_capture(self) -> bool:
+        """Whether the page wants camera, microphone or screen capture (WebRTC)"""
+        return bool(self.capture_requests)
+
+    def _watch_permissions(self, page: QWebEnginePage):
+        """Follow a page's capture requests; the requests themselves are left unanswered"""
+        page.featurePermissionRequested.connect(self._on_permission_requested)
+        page.featurePermissionRequestCanceled.connect(self._on_permission_request_canceled)
+
+    def _on_permission_requested(self, origin, feature):
+        if "Capture" in feature.name:
+            self.capture_requests.add((origin.toString(), feature))
+
+    def _on_permission_request_canceled(self, origin, feature):
+        self.capture_requests.discard((origin.toString(), feature))
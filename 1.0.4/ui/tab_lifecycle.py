@@ -0,0 +1,268 @@
+"""
+Aether Browser - Tab Lifecycle
+Freezes idle background tabs and discards least recently used ones under memory pressure
+"""
+
+import os
+import time
+
+from PyQt6.QtCore import QObject, QTimer
+
+from core import process_stats
+from core.tab_state import PINNED, AUDIBLE
+
+
+class TabLifecycleManager(QObject):
+    """Policy engine for background tabs of every window.
+
+    Freezing: a background tab that hasn't been shown for tab_freeze_after_s
+    is put in the Frozen lifecycle state, which stops its JavaScript timers,
+    animations and network polling. Tabs playing audio, downloading, using
+    camera/microphone capture (WebRTC) or still loading are left running.
+
+    Discarding: while the resident memory of live tabs' renderer processes is
+    over tab_memory_budget_mb, the least recently active background tab is
+    discarded. Pinned tabs and tabs playing audio are never discarded; they
+    are looked up in the tab registry's state index. Discarded tabs keep
+    their URL, title, scroll position and back/forward history and reload
+    when activated (see BrowserTab.discard).
+    Memory figures come from the ProcessMonitor's latest sample; a tab whose
+    renderer hasn't been sampled or can't be read counts as ESTIMATED_TAB_MB.
+
+    Both are undone by BrowserTab.ensure_loaded when the tab is shown.
+
+    It is also the query API for per-tab resource use (usage_report,
+    tab_usage, browser_usage): renderer CPU and memory are sampled from /proc
+    by a ProcessMonitor thread, so queries never read /proc themselves.
+    """
+
+    DEFAULTS = {
+        "tab_memory_budget_mb": 2048,
+        "tab_freeze_after_s": 5 * 60,
+    }
+
+    CHECK_INTERVAL_MS = 10 * 1000
+    ESTIMATED_TAB_MB = 150
+
+    def __init__(self, storage, tab_widgets, tab_registry, parent=None):
+        super().__init__(parent)
+        self.storage = storage
+        # Callable returning the TabWidget of every open window
+        self.tab_widgets = tab_widgets
+        self.tab_registry = tab_registry
+        self.stats = {"checks": 0, "frozen": 0, "discarded": 0}
+        self.monitor = process_stats.ProcessMonitor()
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check)
+
+    def start(self):
+        """Start periodic checks and resource sampling"""
+        self.timer.start(self.CHECK_INTERVAL_MS)
+        self._watch_renderers(self._tabs())
+        self.monitor.start()
+
+    def stop(self):
+        """Stop periodic checks and resource sampling"""
+        self.timer.stop()
+        self.monitor.stop()
+
+    def track_downloads(self, profile):
+        """Count downloads per tab so downloading tabs aren't frozen"""
+        profile.downloadRequested.connect(self._on_download_requested)
+
+    def _on_download_requested(self, download):
+        page = download.page()
+        for _, tab, _ in self._tabs():
+            if tab.webview is not None and tab.webview.page() is page:
+                tab.downloads.append(download)
+                break
+
+    def _setting(self, key: str):
+        return self.storage.get_setting(key, self.DEFAULTS[key])
+
+    @property
+    def budget_bytes(self) -> int:
+        budget = self._setting("tab_memory_budget_mb")
+        return int(budget * 1024 * 1024) if budget else None
+
+    def _tabs(self) -> list:
+        """(last active time, tab, tab widget) of every tab"""
+        tabs = []
+        for tab_widget in self.tab_widgets():
+            for index in range(tab_widget.count()):
+                tab = tab_widget.widget(index)
+                if tab is not None:
+                    tabs.append((tab_widget.last_active(tab), tab, tab_widget))
+        return tabs
+
+    def _live_tabs(self) -> list:
+        """(last active time, tab, tab widget) of every tab with a running page"""
+        return [entry for entry in self._tabs() if entry[1].is_live]
+
+    def memory_in_use(self, tabs: list = None) -> int:
+        """Bytes used by the renderers of live tabs, as of the latest sample.
+
+        A renderer shared by several tabs is counted once. Tabs whose
+        renderer can't be read (not started yet, crashed, not sampled yet,
+        or no /proc) count as ESTIMATED_TAB_MB each.
+        """
+        if tabs is None:
+            tabs = [tab for _, tab, _ in self._live_tabs()]
+        return self._memory([tab.render_process_pid() for tab in tabs], self.monitor.latest())
+
+    def _memory(self, pids, usage: dict) -> int:
+        """Bytes used by renderer pids according to a monitor sample"""
+        used = 0
+        counted = set()
+        for pid in pids:
+            memory = usage.get(pid, {}).get("memory")
+            if memory is None:
+                used += self.ESTIMATED_TAB_MB * 1024 * 1024
+            elif pid not in counted:
+                counted.add(pid)
+                used += memory
+        return used
+
+    def check(self):
+        """Apply the freeze and discard policies once"""
+        self.stats["checks"] += 1
+        self.freeze_idle_tabs()
+        self.discard_over_budget()
+        self._watch_renderers(self._tabs())
+
+    def _watch_renderers(self, tabs: list) -> dict:
+        """Point the monitor at current renderer processes; returns tab -> pid"""
+        pids = {tab: tab.render_process_pid() for _, tab, _ in tabs}
+        self.monitor.watch(list(pids.values()) + [os.getpid()])
+        return pids
+
+    def freeze_idle_tabs(self) -> int:
+        """Freeze background tabs hidden for longer than the grace period"""
+        grace = self._setting("tab_freeze_after_s")
+        if not grace:
+            return 0
+        now = time.monotonic()
+        frozen = 0
+        for last_active, tab, tab_widget in self._live_tabs():
+            if tab is tab_widget.currentWidget() or now - last_active < grace:
+                continue
+            if tab.freeze():
+                frozen += 1
+        self.stats["frozen"] += frozen
+        return frozen
+
+    def discard_over_budget(self) -> int:
+        """Discard background tabs until under budget; returns how many were discarded"""
+        budget = self.budget_bytes
+        if not budget:
+            return 0
+
+        live = self._live_tabs()
+        usage = self.monitor.latest()
+        pids = {tab: tab.render_process_pid() for _, tab, _ in live}
+        if self._memory(pids.values(), usage) <= budget:
+            return 0
+
+        # Oldest first; the tab showing in each window is never a candidate
+        exempt = self.tab_registry.state.tab_ids(PINNED, AUDIBLE)
+        candidates = sorted(
+            (entry for entry in live
+             if entry[1] is not entry[2].currentWidget() and entry[1].tab_id not in exempt),
+            key=lambda entry: entry[0]
+        )
+        discarded = 0
+        for _, tab, _ in candidates:
+            if not tab.discard():
+                continue
+            discarded += 1
+            # Re-estimated from the same sample; the next check sees the real effect
+            del pids[tab]
+            if self._memory(pids.values(), usage) <= budget:
+                break
+        self.stats["discarded"] += discarded
+        return discarded
+
+    def usage_report(self) -> list:
+        """Per-tab state, renderer and CPU/memory use from the latest sample.
+
+        Tabs sharing a renderer process share its figures; "shared" says how
+        many tabs that is. CPU is percent of one core; figures are None until
+        a renderer has been sampled twice or where /proc isn't available.
+        """
+        tabs = self._tabs()
+        pids = self._watch_renderers(tabs)
+        usage = self.monitor.latest()
+        sharing = {}
+        for pid in pids.values():
+            if pid:
+                sharing[pid] = sharing.get(pid, 0) + 1
+
+        rows = []
+        for last_active, tab, tab_widget in tabs:
+            pid = pids[tab]
+            sample = usage.get(pid, {})
+            rows.append({
+                "tab": tab,
+                "tab_widget": tab_widget,
+                "title": tab.get_title(),
+                "url": tab.get_url(),
+                "state": tab.state,
+                "current": tab is tab_widget.currentWidget(),
+                "pid": pid,
+                "shared": sharing.get(pid, 0),
+                "cpu_percent": sample.get("cpu_percent"),
+                "memory": sample.get("memory"),
+                "idle_s": time.monotonic() - last_active if last_active else None,
+            })
+        return rows
+
+    def tab_usage(self, tab) -> dict:
+        """Latest {pid, cpu_percent, memory} of one tab's renderer"""
+        pid = tab.render_process_pid()
+        sample = self.monitor.latest().get(pid, {})
+        return {"pid": pid, "cpu_percent": sample.get("cpu_percent"),
+                "memory": sample.get("memory")}
+
+    def browser_usage(self) -> dict:
+        """Latest {pid, cpu_percent, memory} of the browser process itself"""
+        pid = os.getpid()
+        sample = self.monitor.latest().get(pid, {})
+        return {"pid": pid, "cpu_percent": sample.get("cpu_percent"),
+                "memory": sample.get("memory")}
+
+    # Actions
+    def _find(self, tab):
+        """The tab widget holding a tab, or None"""
+        for tab_widget in self.tab_widgets():
+            if tab_widget.tab_index(tab) >= 0:
+                return tab_widget
+        return None
+
+    def freeze_tab(self, tab) -> bool:
+        """Freeze a background tab now"""
+        tab_widget = self._find(tab)
+        if tab_widget is None or tab is tab_widget.currentWidget():
+            return False
+        if tab.freeze():
+            self.stats["frozen"] += 1
+            return True
+        return False
+
+    def discard_tab(self, tab) -> bool:
+        """Discard a background tab now"""
+        tab_widget = self._find(tab)
+        if tab_widget is None or tab is tab_widget.currentWidget():
+            return False
+        if tab.discard():
+            self.stats["discarded"] += 1
+            return True
+        return False
+
+    def close_tab(self, tab) -> bool:
+        """Close a tab the same way its close button does"""
+        tab_widget = self._find(tab)
+        if tab_widget is None:
+            return False
+        tab_widget.tab_close_requested.emit(tab_widget.tab_index(tab))
+        return True
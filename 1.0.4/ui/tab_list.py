@@ -0,0 +1,164 @@
+"""
+Aether Browser - Vertical Tab List
+A virtualized sidebar list of a window's tabs, for when there are too many for the tab bar
+"""
+
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PyQt6.QtCore import (Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent,
+                          pyqtSignal)
+
+from ui.toolbar import IconLoader
+
+
+class TabListModel(QAbstractListModel):
+    """The tabs of a TabWidget as list rows.
+
+    Row order follows the tab widget, including tabs moved in the tab bar.
+    Titles and icons are the ones the tab widget drew, so the list gets the
+    same batched updates as the tab bar.
+    """
+
+    def __init__(self, tab_widget, parent=None):
+        super().__init__(parent)
+        self.tab_widget = tab_widget
+        # Tab widgets in row order, mirrored so removals can be announced
+        self._tabs = [tab_widget.widget(index) for index in range(tab_widget.count())]
+
+        tab_widget.tab_inserted.connect(self._on_tab_inserted)
+        tab_widget.tab_removed.connect(self._on_tab_removed)
+        tab_widget.tab_bar.tabMoved.connect(self._on_tab_moved)
+        tab_widget.tabs_updated.connect(self._on_tabs_updated)
+        tab_widget.tabs_reset.connect(self._on_tabs_reset)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._tabs)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._tabs):
+            return None
+        tab = self._tabs[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.tab_widget.tab_label(tab) or tab.get_title()
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self.tab_widget.tabIcon(index.row())
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return tab.get_url()
+        return None
+
+    def tab_at(self, row: int):
+        """Tab widget shown in a row"""
+        return self._tabs[row] if 0 <= row < len(self._tabs) else None
+
+    def _on_tab_inserted(self, index: int):
+        self.beginInsertRows(QModelIndex(), index, index)
+        self._tabs.insert(index, self.tab_widget.widget(index))
+        self.endInsertRows()
+
+    def _on_tab_removed(self, index: int):
+        self.beginRemoveRows(QModelIndex(), index, index)
+        del self._tabs[index]
+        self.endRemoveRows()
+
+    def _on_tabs_reset(self):
+        self.beginResetModel()
+        self._tabs = [self.tab_widget.widget(index) for index in range(self.tab_widget.count())]
+        self.endResetModel()
+
+    def _on_tab_moved(self, source: int, target: int):
+        # Qt's destination row is the row the item lands before
+        destination = target + 1 if target > source else target
+        self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), destination)
+        self._tabs.insert(target, self._tabs.pop(source))
+        self.endMoveRows()
+
+    def _on_tabs_updated(self, tabs: list):
+        for tab in tabs:
+            row = self.tab_widget.tab_index(tab)
+            if row >= 0:
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+
+class TabListDelegate(QStyledItemDelegate):
+    """Paints a row with a close icon; clicks on the icon close the tab"""
+
+    ROW_HEIGHT = 32
+    CLOSE_SIZE = 16
+
+    close_requested = pyqtSignal(int)
+
+    def _close_rect(self, rect: QRect) -> QRect:
+        size = self.CLOSE_SIZE
+        return QRect(rect.right() - size - 8, rect.center().y() - size // 2, size, size)
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        if option.state & (QStyle.StateFlag.State_MouseOver | QStyle.StateFlag.State_Selected):
+            icon = IconLoader.load_icon('close.svg', size=10)
+            icon.paint(painter, self._close_rect(option.rect).adjusted(3, 3, -3, -3))
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        if event.type() == QEvent.Type.MouseButtonRelease:
+            on_close = self._close_rect(option.rect).contains(event.position().toPoint())
+            if (event.button() == Qt.MouseButton.MiddleButton
+                    or (event.button() == Qt.MouseButton.LeftButton and on_close)):
+                self.close_requested.emit(index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+class TabListView(QListView):
+    """Vertical tab sidebar.
+
+    Rows are painted by a delegate rather than built from widgets, and with
+    uniform row heights only the visible rows are laid out, so hundreds of
+    tabs cost about as much as a screenful.
+    """
+
+    WIDTH = 240
+
+    def __init__(self, tab_widget, parent=None):
+        super().__init__(parent)
+        self.tab_widget = tab_widget
+        self.tab_model = TabListModel(tab_widget, self)
+        self.setModel(self.tab_model)
+
+        self.delegate = TabListDelegate(self)
+        self.delegate.close_requested.connect(tab_widget.tab_close_requested.emit)
+        self.setItemDelegate(self.delegate)
+
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.setFixedWidth(self.WIDTH)
+        self.setIconSize(QSize(16, 16))
+        self.setTextElideMode(Qt.TextElideMode.ElideRight)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setDragDropMode(QAbstractItemView.DragDropMode.NoDragDrop)
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+
+        # Selecting a row shows its tab; showing a tab selects its row
+        self.clicked.connect(lambda index: tab_widget.setCurrentIndex(index.row()))
+        self.customContextMenuRequested.connect(self._show_context_menu)
+        tab_widget.tab_changed.connect(self._select_current)
+        self.tab_model.rowsInserted.connect(lambda *_: self._select_current())
+        self.tab_model.modelReset.connect(self._select_current)
+        self._select_current()
+
+    def _select_current(self, *args):
+        row = self.tab_widget.currentIndex()
+        if row < 0:
+            return
+        index = self.tab_model.index(row)
+        self.setCurrentIndex(index)
+        self.scrollTo(index)
+
+    def _show_context_menu(self, position):
+        index = self.indexAt(position)
+        if index.isValid():
+            self.tab_widget.tab_context_menu_requested.emit(
+                index.row(), self.viewport().mapToGlobal(position)
+            )
@@ -0,0 +1,148 @@
+"""
+Aether Browser - Tab Registry
+Every open tab of every window by stable id, and by web view
+"""
+
+import time
+
+from core.tab_search import TabSearchIndex
+from core.tab_state import TabStateIndex, PINNED, MUTED, AUDIBLE
+
+
+class TabRecord:
+    """An open tab and the window it belongs to"""
+
+    __slots__ = ("tab_id", "tab", "window")
+
+    def __init__(self, tab, window):
+        self.tab_id = tab.tab_id
+        self.tab = tab
+        self.window = window
+
+
+class TabRegistry:
+    """Constant-time lookups from tab id or web view to a tab.
+
+    Windows route web view signals by tab id and look the tab up here, so
+    handling a title or URL change costs the same with 5 tabs or 500. Tab
+    ids never change while the tab is open (see BrowserTab.tab_id), unlike
+    its index in the tab bar.
+
+    It also keeps the tab switcher's search index current as tabs open,
+    close, change title or URL, and are activated.
+
+    Pinned, muted and audible flags live here too (see TabStateIndex).
+    Muting is applied to the tab's page whenever it gets one, so it
+    survives discarding and prerendered page swaps; audible follows the
+    page's recentlyAudibleChanged signal via the window.
+    """
+
+    def __init__(self):
+        self._records = {}
+        # Web view -> tab id, for views that currently exist
+        self._views = {}
+        self.search_index = TabSearchIndex()
+        self.state = TabStateIndex()
+
+    def add(self, tab, window) -> TabRecord:
+        """Register an open tab"""
+        record = TabRecord(tab, window)
+        self._records[tab.tab_id] = record
+        if tab.webview is not None:
+            self._views[tab.webview] = tab.tab_id
+        self.search_index.update(tab.tab_id, tab.get_title(), tab.get_url())
+        tab.changed.connect(lambda: self._on_tab_changed(tab.tab_id))
+        return record
+
+    def remove(self, tab):
+        """Forget a closed tab"""
+        record = self._records.pop(tab.tab_id, None)
+        if record is not None and tab.webview is not None:
+            self._views.pop(tab.webview, None)
+        self.search_index.remove(tab.tab_id)
+        self.state.remove(tab.tab_id)
+
+    def remove_window(self, window):
+        """Forget every tab of a closed window"""
+        for record in [r for r in self._records.values() if r.window is window]:
+            self.remove(record.tab)
+
+    def _on_tab_changed(self, tab_id: int):
+        record = self._records.get(tab_id)
+        if record is not None:
+            self.search_index.update(tab_id, record.tab.get_title(), record.tab.get_url())
+
+    def activated(self, tab):
+        """Note that a tab was shown, for ranking search results by recency"""
+        self.search_index.touch(tab.tab_id, time.monotonic())
+
+    def search(self, text: str, limit: int = 50) -> list:
+        """Records of open tabs matching text, best first (see TabSearchIndex.search)"""
+        return [self._records[tab_id]
+                for tab_id in self.search_index.search(text, limit)
+                if tab_id in self._records]
+
+    def view_created(self, tab, webview):
+        """Map a tab's new web view to the tab"""
+        self._views[webview] = tab.tab_id
+
+    def view_destroyed(self, webview):
+        """Forget a web view that was deleted"""
+        tab_id = self._views.pop(webview, None)
+        if tab_id is not None:
+            self.state.set(AUDIBLE, tab_id, False)
+
+    # Pinned, muted and audible state
+    def page_attached(self, tab_id: int, page):
+        """Bring a tab's new page in line with its state"""
+        page.setAudioMuted(self.state.has(MUTED, tab_id))
+        self.state.set(AUDIBLE, tab_id, page.recentlyAudible())
+
+    def set_pinned(self, tab, pinned: bool) -> bool:
+        """Pin or unpin a tab; returns whether that changed anything"""
+        return self.state.set(PINNED, tab.tab_id, pinned)
+
+    def set_muted(self, tab, muted: bool) -> bool:
+        """Mute or unmute a tab's page; returns whether that changed anything"""
+        if tab.webview is not None:
+            tab.webview.page().setAudioMuted(muted)
+        return self.state.set(MUTED, tab.tab_id, muted)
+
+    def set_audible(self, tab_id: int, audible: bool) -> bool:
+        """Record that a tab's page started or stopped making sound"""
+        return tab_id in self._records and self.state.set(AUDIBLE, tab_id, audible)
+
+    def is_pinned(self, tab) -> bool:
+        return self.state.has(PINNED, tab.tab_id)
+
+    def is_muted(self, tab) -> bool:
+        return self.state.has(MUTED, tab.tab_id)
+
+    def is_audible(self, tab) -> bool:
+        return self.state.has(AUDIBLE, tab.tab_id)
+
+    def pinned(self, window=None) -> list:
+        """Records of pinned tabs, optionally of one window only"""
+        records = (self._records.get(tab_id) for tab_id in self.state.tab_ids(PINNED))
+        return [record for record in records
+                if record is not None and (window is None or record.window is window)]
+
+    def get(self, tab_id: int) -> TabRecord:
+        """Record of an open tab, or None"""
+        return self._records.get(tab_id)
+
+    def tab(self, tab_id: int):
+        """An open tab by id, or None"""
+        record = self._records.get(tab_id)
+        return record.tab if record is not None else None
+
+    def for_view(self, webview) -> TabRecord:
+        """Record of the tab showing a web view, or None"""
+        tab_id = self._views.get(webview)
+        return self._records.get(tab_id) if tab_id is not None else None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(list(self._records.values()))
@@ -0,0 +1,84 @@
+"""
+Aether Browser - Tab Switcher
+Keyboard tab search across every window
+"""
+
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem
+from PyQt6.QtCore import Qt, QEvent
+
+
+class TabSwitcherDialog(QDialog):
+    """Type to filter open tabs, Enter to switch to one.
+
+    Results come from the TabRegistry's search index, which is kept up to
+    date as tabs change, so each keystroke is a single in-memory search.
+    """
+
+    LIMIT = 50
+
+    def __init__(self, tab_registry, parent=None):
+        super().__init__(parent)
+        self.tab_registry = tab_registry
+
+        self.setWindowTitle("Search Tabs")
+        self.setMinimumSize(500, 400)
+
+        self._setup_ui()
+        self._on_search_changed("")
+
+    def _setup_ui(self):
+        """Setup switcher UI"""
+        layout = QVBoxLayout(self)
+
+        # Search box; arrow keys move through the results without leaving it
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search open tabs")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self._on_search_changed)
+        self.search_edit.returnPressed.connect(self._on_return_pressed)
+        self.search_edit.installEventFilter(self)
+        layout.addWidget(self.search_edit)
+
+        # Results
+        self.results_list = QListWidget()
+        self.results_list.itemActivated.connect(self._on_item_activated)
+        layout.addWidget(self.results_list)
+
+    def eventFilter(self, obj, event) -> bool:
+        if (obj is self.search_edit and event.type() == QEvent.Type.KeyPress
+                and event.key() in (Qt.Key.Key_Up, Qt.Key.Key_Down)):
+            step = -1 if event.key() == Qt.Key.Key_Up else 1
+            row = self.results_list.currentRow() + step
+            if 0 <= row < self.results_list.count():
+                self.results_list.setCurrentRow(row)
+            return True
+        return super().eventFilter(obj, event)
+
+    def _on_search_changed(self, text: str):
+        """Show the tabs matching the search"""
+        self.results_list.clear()
+        for record in self.tab_registry.search(text, self.LIMIT):
+            tab = record.tab
+            item = QListWidgetItem(f"{tab.get_title()}\n{tab.get_url()}")
+            item.setIcon(tab.icon)
+            item.setData(Qt.ItemDataRole.UserRole, record.tab_id)
+            self.results_list.addItem(item)
+        if self.results_list.count():
+            self.results_list.setCurrentRow(0)
+
+    def _on_return_pressed(self):
+        item = self.results_list.currentItem()
+        if item is not None:
+            self._on_item_activated(item)
+
+    def _on_item_activated(self, item: QListWidgetItem):
+        """Bring the chosen tab and its window to the front"""
+        record = self.tab_registry.get(item.data(Qt.ItemDataRole.UserRole))
+        if record is not None:
+            window = record.window
+            index = window.tab_widget.tab_index(record.tab)
+            if index >= 0:
+                window.tab_widget.setCurrentIndex(index)
+            window.raise_()
+            window.activateWindow()
+        self.accept()
@@ -0,0 +1,146 @@
+"""
+Aether Browser - Task Manager
+Shows lifecycle state, CPU and memory of every tab's renderer
+"""
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView)
+from PyQt6.QtCore import Qt, QTimer
+
+
+def _format_cpu(percent) -> str:
+    return "-" if percent is None else f"{percent:.1f}"
+
+
+def _format_memory(size) -> str:
+    return "-" if size is None else f"{size / (1024 * 1024):.0f} MB"
+
+
+class TaskManagerDialog(QDialog):
+    """Per-tab CPU accounting, refreshed every REFRESH_MS.
+
+    Figures come from TabLifecycleManager.usage_report, so frozen and
+    discarded tabs can be compared with running ones directly. The selected
+    tab can be frozen, discarded or closed from here.
+    """
+
+    REFRESH_MS = 2000
+    COLUMNS = ("Tab", "State", "Process", "CPU %", "Memory")
+
+    def __init__(self, tab_lifecycle, parent=None):
+        super().__init__(parent)
+        self.tab_lifecycle = tab_lifecycle
+        self.rows = []
+
+        self.setWindowTitle("Task Manager")
+        self.setMinimumSize(700, 400)
+
+        self._setup_ui()
+        self.refresh()
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(self.REFRESH_MS)
+
+    def _setup_ui(self):
+        """Setup task manager UI"""
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for column in range(1, len(self.COLUMNS)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.ResizeToContents)
+        self.table.itemSelectionChanged.connect(self._update_buttons)
+        layout.addWidget(self.table)
+
+        self.totals_label = QLabel()
+        layout.addWidget(self.totals_label)
+
+        # Actions
+        bottom_layout = QHBoxLayout()
+        self.freeze_btn = QPushButton("Freeze")
+        self.freeze_btn.clicked.connect(lambda: self._act(self.tab_lifecycle.freeze_tab))
+        bottom_layout.addWidget(self.freeze_btn)
+
+        self.discard_btn = QPushButton("Discard")
+        self.discard_btn.clicked.connect(lambda: self._act(self.tab_lifecycle.discard_tab))
+        bottom_layout.addWidget(self.discard_btn)
+
+        self.close_tab_btn = QPushButton("Close Tab")
+        self.close_tab_btn.clicked.connect(lambda: self._act(self.tab_lifecycle.close_tab))
+        bottom_layout.addWidget(self.close_tab_btn)
+        bottom_layout.addStretch()
+
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        bottom_layout.addWidget(close_btn)
+        layout.addLayout(bottom_layout)
+
+    def _selected_row(self):
+        """Report row of the selected tab, or None"""
+        index = self.table.currentRow()
+        if not self.table.selectedItems() or not 0 <= index < len(self.rows):
+            return None
+        return self.rows[index]
+
+    def _update_buttons(self):
+        row = self._selected_row()
+        background = row is not None and not row["current"]
+        self.freeze_btn.setEnabled(background and row["state"] == "active")
+        self.discard_btn.setEnabled(background and row["state"] != "discarded")
+        self.close_tab_btn.setEnabled(row is not None)
+
+    def _act(self, action):
+        """Apply a TabLifecycleManager action to the selected tab"""
+        row = self._selected_row()
+        if row is not None:
+            action(row["tab"])
+            self.refresh()
+
+    def refresh(self):
+        """Redraw the table from the latest usage sample"""
+        selected = self._selected_row()
+        rows = self.rows = self.tab_lifecycle.usage_report()
+        self.table.setRowCount(len(rows))
+        for row_index, row in enumerate(rows):
+            process = str(row["pid"]) if row["pid"] else "-"
+            if row["shared"] > 1:
+                process += f" (shared by {row['shared']})"
+            state = row["state"] + (" (current)" if row["current"] else "")
+            values = (row["title"], state, process,
+                      _format_cpu(row["cpu_percent"]), _format_memory(row["memory"]))
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column >= 3:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                if column == 0:
+                    item.setToolTip(row["url"])
+                self.table.setItem(row_index, column, item)
+            if selected is not None and row["tab"] is selected["tab"]:
+                self.table.selectRow(row_index)
+        if selected is not None and self._selected_row() is None:
+            self.table.clearSelection()
+        self._update_buttons()
+
+        # Each renderer counted once, however many tabs share it
+        renderers = {row["pid"]: row for row in rows if row["pid"]}
+        renderer_cpu = sum(row["cpu_percent"] or 0 for row in renderers.values())
+        renderer_memory = sum(row["memory"] or 0 for row in renderers.values())
+        browser = self.tab_lifecycle.browser_usage()
+        states = [row["state"] for row in rows]
+        self.totals_label.setText(
+            f"{len(rows)} tabs ({states.count('active')} running, "
+            f"{states.count('frozen')} frozen, {states.count('discarded')} discarded)   "
+            f"Renderers: {renderer_cpu:.1f}% CPU, {_format_memory(renderer_memory)}   "
+            f"Browser: {_format_cpu(browser['cpu_percent'])}% CPU, "
+            f"{_format_memory(browser['memory'])}"
+        )
+
+    def done(self, result: int):
+        self.timer.stop()
+        super().done(result)
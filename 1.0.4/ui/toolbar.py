@@ -5,11 +5,12 @@ Enhanced with Firefox-inspired professional styling
 """
 
 import os
+import time
 from PyQt6.QtWidgets import (QToolBar, QLineEdit, QPushButton, QWidget, 
                              QHBoxLayout, QTabWidget, QTabBar, QVBoxLayout, QLabel,
-                             QGraphicsDropShadowEffect)
-from PyQt6.QtCore import pyqtSignal, Qt, QSize, QPropertyAnimation, QEasingCurve, pyqtProperty
-from PyQt6.QtGui import QKeyEvent, QIcon, QFont, QColor
+                             QGraphicsDropShadowEffect, QCompleter)
+from PyQt6.QtCore import pyqtSignal, Qt, QSize, QTimer, QPropertyAnimation, QEasingCurve, pyqtProperty
+from PyQt6.QtGui import QKeyEvent, QIcon, QFont, QColor, QStandardItemModel, QStandardItem
 from PyQt6.QtSvg import QSvgRenderer
 from PyQt6.QtGui import QPixmap, QPainter
 
@@ -107,10 +108,69 @@ class AddressBar(QLineEdit):
         shadow.setOffset(0, 1)
         self.setGraphicsEffect(shadow)
         
+        # Suggestion popup; the pipeline does the matching, so show its results as-is.
+        # Rows display "title - url" and complete to the URL stored in UserRole.
+        self.suggestion_pipeline = None
+        self.suggestion_model = QStandardItemModel(self)
+        self.completer = QCompleter(self.suggestion_model, self)
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.completer.setCompletionRole(Qt.ItemDataRole.UserRole)
+        self.completer.activated.connect(self._on_suggestion_activated)
+        self._ignore_activation = False
+        self.setCompleter(self.completer)
+        self.textEdited.connect(self._on_text_edited)
+    
+    def set_suggestion_pipeline(self, pipeline):
+        """Set the SuggestionPipeline that feeds the popup"""
+        self.suggestion_pipeline = pipeline
+        pipeline.suggestions_changed.connect(self._on_suggestions_changed)
+    
+    def _on_text_edited(self, text: str):
+        """Ask for suggestions for the typed text; results arrive asynchronously"""
+        if self.suggestion_pipeline is not None:
+            self.suggestion_pipeline.query(text)
+    
+    def _on_suggestions_changed(self, suggestions: list):
+        """Show the latest merged suggestions"""
+        self.suggestion_model.clear()
+        for suggestion in suggestions:
+            title = suggestion.get("title") or suggestion["url"]
+            item = QStandardItem(f"{title} - {suggestion['url']}")
+            item.setData(suggestion["url"], Qt.ItemDataRole.UserRole)
+            self.suggestion_model.appendRow(item)
+        
+        if suggestions and self.hasFocus():
+            self.completer.complete()
+        else:
+            self.completer.popup().hide()
+        
     def _on_return_pressed(self):
         """Handle return key press"""
+        # Enter on a highlighted suggestion also makes the completer emit activated,
+        # which navigates; navigating here too would load the page twice
+        popup = self.completer.popup()
+        if popup.isVisible():
+            if popup.selectionModel().hasSelection():
+                return
+            # Nothing highlighted: go where typed; the completer still activates
+            # its current row after this key press, which must not navigate
+            self._ignore_activation = True
+            QTimer.singleShot(0, self._end_ignore_activation)
+        if self.suggestion_pipeline is not None:
+            self.suggestion_pipeline.cancel()
         self.return_pressed_signal.emit(self.text())
     
+    def _end_ignore_activation(self):
+        self._ignore_activation = False
+    
+    def _on_suggestion_activated(self, url: str):
+        """Navigate to a suggestion picked with Enter or the mouse"""
+        if self._ignore_activation:
+            return
+        if self.suggestion_pipeline is not None:
+            self.suggestion_pipeline.cancel()
+        self.return_pressed_signal.emit(url)
+    
     def set_url(self, url: str):
         """Set the address bar URL"""
         # Don't show internal URLs
@@ -192,6 +252,7 @@ class NavigationToolbar(QToolBar):
     home_clicked = pyqtSignal()
     new_tab_clicked = pyqtSignal()  # NEW TAB SIGNAL
     menu_clicked = pyqtSignal()
+    bookmark_clicked = pyqtSignal()
     
     # Address bar signal
     navigate_to_url = pyqtSignal(str)
@@ -260,6 +321,11 @@ class NavigationToolbar(QToolBar):
         self.address_bar.return_pressed_signal.connect(self.navigate_to_url.emit)
         self.addWidget(address_container)
         
+        # Bookmark star for the current page
+        self.bookmark_btn = IconButton('star.svg', "Bookmark this page")
+        self.bookmark_btn.clicked.connect(self.bookmark_clicked.emit)
+        self.addWidget(self.bookmark_btn)
+        
         # Spacer after address bar
         spacer2 = QWidget()
         spacer2.setFixedWidth(10)
@@ -289,6 +355,15 @@ class NavigationToolbar(QToolBar):
         """Set address bar URL"""
         self.address_bar.set_url(url)
     
+    def set_bookmarked(self, bookmarked: bool):
+        """Update the bookmark star for the current page"""
+        if bookmarked:
+            self.bookmark_btn.update_icon('star_filled.svg')
+            self.bookmark_btn.setToolTip("Remove bookmark")
+        else:
+            self.bookmark_btn.update_icon('star.svg')
+            self.bookmark_btn.setToolTip("Bookmark this page")
+    
     def set_loading(self, loading: bool):
         """Update UI for loading state"""
         if loading:
@@ -304,6 +379,8 @@ class TabBar(QTabBar):
     
     tab_close_requested_signal = pyqtSignal(int)
     tab_context_menu_requested = pyqtSignal(int, object)
+    # Emitted when the mouse button is released, ending any tab drag
+    drag_finished = pyqtSignal()
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -315,6 +392,9 @@ class TabBar(QTabBar):
         self.setUsesScrollButtons(True)
         self.setDrawBase(False)
         
+        # While set, returned as every tab's size (see TabWidget.close_tabs)
+        self.placeholder_size = None
+        
         # Beautiful light tab styling
         self.setStyleSheet("""
             QTabBar {
@@ -373,8 +453,14 @@ class TabBar(QTabBar):
         if index >= 0:
             self.tab_context_menu_requested.emit(index, self.mapToGlobal(position))
     
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        self.drag_finished.emit()
+    
     def tabSizeHint(self, index):
         """Custom tab size"""
+        if self.placeholder_size is not None:
+            return self.placeholder_size
         size = super().tabSizeHint(index)
         size.setHeight(34)
         return size
@@ -412,13 +498,32 @@ class TabCloseButton(QPushButton):
 
 
 class TabWidget(QTabWidget):
-    """Custom tab widget for browser tabs with modern design"""
+    """Custom tab widget for browser tabs with modern design.
+    
+    Title, favicon, loading and audio changes are queued with queue_update
+    and drawn together once per frame, so a page animating its title doesn't
+    relayout the tab bar on every change. Background tabs are redrawn at
+    most once every BACKGROUND_UPDATE_MS.
+    """
+    
+    FRAME_MS = 16
+    BACKGROUND_UPDATE_MS = 1000
     
     # Signals
     new_tab_requested = pyqtSignal()
     tab_changed = pyqtSignal(int)
     tab_close_requested = pyqtSignal(int)
     tab_context_menu_requested = pyqtSignal(int, object)
+    # Emitted with the tab widgets redrawn by a batch of queued updates
+    tabs_updated = pyqtSignal(list)
+    # Emitted after a tab was inserted at or removed from an index
+    tab_inserted = pyqtSignal(int)
+    tab_removed = pyqtSignal(int)
+    # Emitted instead of tab_removed after close_tabs removed several tabs at once
+    tabs_reset = pyqtSignal()
+    
+    # Closed tabs deleted per event loop pass after a bulk close
+    DELETE_BATCH = 10
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -443,7 +548,33 @@ class TabWidget(QTabWidget):
             }
         """)
         
+        # Tab widget -> monotonic time it was last the current tab
+        self._last_active = {}
+        self._current = None
+        
+        # Tab widget -> index, rebuilt on first lookup after tabs are added, removed or moved
+        self._indexes = None
+        
+        # Tab widget -> {title, icon, loading, audible, muted, pinned} not drawn yet, and what was drawn
+        self._pending = {}
+        self._drawn = {}
+        # Tab widget -> monotonic time it was last redrawn
+        self._last_drawn = {}
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self.flush_updates)
+        
+        # Whether tabs are shown in the tab bar (False when a tab list replaces it)
+        self.strip_visible = True
+        
+        # Tabs removed by close_tabs, waiting to be deleted
+        self._doomed = []
+        self._delete_timer = QTimer(self)
+        self._delete_timer.timeout.connect(self._delete_batch)
+        
         # Connect signals
+        self.tab_bar.tabMoved.connect(self._invalidate_indexes)
+        self.currentChanged.connect(self._on_current_changed)
         self.currentChanged.connect(self.tab_changed.emit)
         self.tab_bar.tab_close_requested_signal.connect(self.tab_close_requested.emit)
         self.tab_bar.tab_context_menu_requested.connect(self.tab_context_menu_requested.emit)
@@ -451,17 +582,81 @@ class TabWidget(QTabWidget):
         # No corner widget (new tab button is in toolbar now)
         self.setCornerWidget(None)
     
-    def add_tab(self, widget: QWidget, title: str) -> int:
+    def _on_current_changed(self, index: int):
+        """Stamp the tab being left and the tab being shown as active now"""
+        now = time.monotonic()
+        if self._current is not None and self._current in self._last_active:
+            self._last_active[self._current] = now
+        self._current = self.widget(index)
+        if self._current is not None:
+            self._last_active[self._current] = now
+            # A tab coming to the front shows its queued changes without the background delay
+            if self._current in self._pending:
+                self._update_timer.start(self.FRAME_MS)
+    
+    def _invalidate_indexes(self, *args):
+        self._indexes = None
+    
+    def tabInserted(self, index: int):
+        super().tabInserted(index)
+        self._indexes = None
+        self.tab_inserted.emit(index)
+    
+    def tabRemoved(self, index: int):
+        super().tabRemoved(index)
+        self._indexes = None
+        self.tab_removed.emit(index)
+    
+    def tab_index(self, widget: QWidget) -> int:
+        """Index of a tab (-1 if it isn't here), without scanning every tab"""
+        if self._indexes is None:
+            self._indexes = {self.widget(i): i for i in range(self.count())}
+        return self._indexes.get(widget, -1)
+    
+    def last_active(self, widget: QWidget) -> float:
+        """When a tab was last the current tab (0 if never)"""
+        if widget is self.currentWidget():
+            return time.monotonic()
+        return self._last_active.get(widget, 0.0)
+    
+    def add_tab(self, widget: QWidget, title: str, activate: bool = True) -> int:
         """Add a new tab with custom close button"""
+        self._drawn[widget] = {"title": title, "label": title}
         index = self.addTab(widget, title)
+        if self.strip_visible:
+            self._add_close_button(widget, index)
         
-        # Add custom close button with close.svg icon
+        if activate:
+            self.setCurrentIndex(index)
+        return index
+    
+    def _add_close_button(self, widget: QWidget, index: int):
+        """Add custom close button with close.svg icon"""
         close_btn = TabCloseButton()
-        close_btn.clicked.connect(lambda: self.tab_close_requested.emit(index))
+        # The index is looked up on click since closing or moving other tabs changes it
+        close_btn.clicked.connect(lambda: self.tab_close_requested.emit(self.tab_index(widget)))
         self.tabBar().setTabButton(index, QTabBar.ButtonPosition.RightSide, close_btn)
-        
-        self.setCurrentIndex(index)
-        return index
+    
+    def set_strip_visible(self, visible: bool):
+        """Show or hide the tab bar; hidden, it holds no per-tab widgets"""
+        if visible == self.strip_visible:
+            return
+        self.strip_visible = visible
+        self.tab_bar.setTabsClosable(visible)
+        for index in range(self.count()):
+            if visible:
+                self._add_close_button(self.widget(index), index)
+            else:
+                button = self.tab_bar.tabButton(index, QTabBar.ButtonPosition.RightSide)
+                self.tab_bar.setTabButton(index, QTabBar.ButtonPosition.RightSide, None)
+                if button is not None:
+                    button.deleteLater()
+        self.tab_bar.setVisible(visible)
+    
+    def tab_label(self, widget: QWidget) -> str:
+        """A tab's full title as drawn, with its pin and audio indicators"""
+        state = self._drawn.get(widget)
+        return state["label"] if state else ""
     
     def update_tab_title(self, index: int, title: str):
         """Update tab title"""
@@ -471,10 +666,121 @@ class TabWidget(QTabWidget):
                 title = title[:22] + "..."
             self.setTabText(index, title)
     
+    def queue_update(self, widget: QWidget, **fields):
+        """Queue a tab's new title, icon, loading, audible, muted or pinned state for the next batch"""
+        self._pending.setdefault(widget, {}).update(fields)
+        # The timer may be waiting out a background tab's delay; the current tab can't wait
+        if (not self._update_timer.isActive()
+                or (widget is self.currentWidget()
+                    and self._update_timer.remainingTime() > self.FRAME_MS)):
+            self._update_timer.start(self.FRAME_MS)
+    
+    def flush_updates(self):
+        """Draw every queued update that is due, with one tab bar relayout"""
+        now = time.monotonic()
+        current = self.currentWidget()
+        due = []
+        next_due = None
+        for widget, fields in self._pending.items():
+            wait = self.BACKGROUND_UPDATE_MS / 1000 - (now - self._last_drawn.get(widget, 0.0))
+            if widget is current or wait <= 0:
+                due.append(widget)
+            elif next_due is None or wait < next_due:
+                next_due = wait
+        
+        if due:
+            self.tab_bar.setUpdatesEnabled(False)
+            try:
+                for widget in due:
+                    self._draw_tab(widget, self._pending.pop(widget))
+                    self._last_drawn[widget] = now
+            finally:
+                self.tab_bar.setUpdatesEnabled(True)
+            self.tabs_updated.emit(due)
+        
+        if next_due is not None:
+            self._update_timer.start(max(self.FRAME_MS, int(next_due * 1000)))
+    
+    def _draw_tab(self, widget: QWidget, fields: dict):
+        """Apply queued changes to a tab's label and icon"""
+        index = self.tab_index(widget)
+        if index < 0:
+            return
+        state = self._drawn.setdefault(widget, {})
+        state.update(fields)
+        
+        if fields.keys() & {"title", "audible", "muted", "pinned"}:
+            title = state.get("title", self.tabText(index))
+            prefix = "\U0001F4CC " if state.get("pinned") else ""
+            if state.get("muted"):
+                prefix += "\U0001F507 "
+            elif state.get("audible"):
+                prefix += "\U0001F50A "
+            state["label"] = prefix + title
+            self.update_tab_title(index, state["label"])
+            self.setTabToolTip(index, title)
+        if "icon" in fields or "loading" in fields:
+            if state.get("loading"):
+                self.setTabIcon(index, IconLoader.load_icon('refresh.svg', size=16))
+            else:
+                self.setTabIcon(index, state.get("icon") or QIcon())
+    
+    def _forget_tab(self, widget: QWidget):
+        self._last_active.pop(widget, None)
+        self._pending.pop(widget, None)
+        self._drawn.pop(widget, None)
+        self._last_drawn.pop(widget, None)
+    
     def close_tab(self, index: int):
         """Close a tab"""
         if 0 <= index < self.count():
             widget = self.widget(index)
             self.removeTab(index)
             if widget:
+                self._forget_tab(widget)
                 widget.deleteLater()
+    
+    def close_tabs(self, widgets: list):
+        """Close several tabs with one tab bar relayout and one model update.
+        
+        The current tab must not be among them; the caller picks the tab to
+        show first. Closed tabs are hidden at once and deleted DELETE_BATCH
+        per event loop pass, so tearing down their web views and renderers
+        doesn't freeze the window.
+        """
+        indexes = sorted((self.tab_index(widget) for widget in widgets), reverse=True)
+        current = self.currentWidget()
+        self.setUpdatesEnabled(False)
+        # Each removal re-measures every remaining tab; a fixed size makes that
+        # cheap, and the real layout is done once afterwards
+        self.tab_bar.placeholder_size = QSize(120, 34)
+        # Index shifts of the current tab and per-tab removals are announced once below
+        self.blockSignals(True)
+        try:
+            for index in indexes:
+                widget = self.widget(index)
+                if index < 0 or widget is current:
+                    continue
+                self.removeTab(index)
+                self._forget_tab(widget)
+                widget.hide()
+                self._doomed.append(widget)
+        finally:
+            self.blockSignals(False)
+            self.tab_bar.placeholder_size = None
+            # Any property change makes the tab bar measure its tabs again
+            self.tab_bar.setElideMode(self.tab_bar.elideMode())
+            self.setUpdatesEnabled(True)
+        
+        self.tabs_reset.emit()
+        self.tab_changed.emit(self.currentIndex())
+        if self._doomed and not self._delete_timer.isActive():
+            self._delete_timer.start(0)
+    
+    def _delete_batch(self):
+        """Delete the next few tabs closed by close_tabs"""
+        batch, self._doomed = self._doomed[:self.DELETE_BATCH], self._doomed[self.DELETE_BATCH:]
+        for widget in batch:
+            widget.deleteLater()
+        if not self._doomed:
+            self._delete_timer.stop()
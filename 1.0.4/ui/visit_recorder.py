@@ -0,0 +1,161 @@
+"""
+Aether Browser - Visit Recorder
+Turns per-tab navigation signals into one history write per real navigation
+"""
+
+import time
+
+from PyQt6.QtCore import QObject, QTimer
+
+
+# In-page URL changes (pushState, fragments) within this window collapse into one visit
+COALESCE_MS = 1500
+
+
+def is_recordable(url: str) -> bool:
+    """Only web pages go into history"""
+    return url.startswith(('http://', 'https://'))
+
+
+class _TabState:
+    """Navigation bookkeeping for one tab"""
+
+    __slots__ = ("loading", "chain", "title", "typed", "committed_url",
+                 "committed_at", "inpage_url", "inpage_timer", "skip_load")
+
+    def __init__(self):
+        self.loading = False
+        # URLs seen during the current load, in order (redirect hops)
+        self.chain = []
+        self.title = ""
+        self.typed = False
+        self.committed_url = None
+        self.committed_at = 0.0
+        self.inpage_url = None
+        self.inpage_timer = None
+        # The next load restores a page already in history (e.g. a discarded tab)
+        self.skip_load = False
+
+
+class VisitRecorder(QObject):
+    """Coalesces navigation events per tab before writing history.
+
+    A load's redirect hops are collected between loadStarted and loadFinished
+    and written as a single visit to the final URL, with the first URL as its
+    source. URL changes outside a load are in-page navigations and are written
+    once they have been quiet for COALESCE_MS. Title changes after a visit was
+    written only update that URL's title.
+    """
+
+    def __init__(self, storage, parent=None):
+        super().__init__(parent)
+        self.storage = storage
+        self._tabs = {}
+        self.stats = {"events": 0, "writes": 0}
+
+    def _state(self, tab) -> _TabState:
+        state = self._tabs.get(tab)
+        if state is None:
+            state = self._tabs[tab] = _TabState()
+        return state
+
+    def mark_typed(self, tab):
+        """The next navigation in this tab came from the address bar"""
+        self._state(tab).typed = True
+
+    def skip_next_load(self, tab):
+        """The next load in this tab brings back a page, it isn't a new visit"""
+        self._state(tab).skip_load = True
+
+    def load_started(self, tab):
+        """A navigation began"""
+        self.stats["events"] += 1
+        state = self._state(tab)
+        self._flush_inpage(tab, state)
+        state.loading = True
+        state.chain = []
+        state.title = ""
+
+    def url_changed(self, tab, url: str):
+        """The tab's URL changed, either mid-load (redirect) or in-page"""
+        self.stats["events"] += 1
+        state = self._state(tab)
+        if state.loading:
+            if not state.chain or state.chain[-1] != url:
+                state.chain.append(url)
+            return
+
+        if url == state.committed_url or not is_recordable(url):
+            return
+        state.inpage_url = url
+        if state.inpage_timer is None:
+            state.inpage_timer = QTimer(self)
+            state.inpage_timer.setSingleShot(True)
+            state.inpage_timer.timeout.connect(lambda: self._flush_inpage(tab, state))
+        state.inpage_timer.start(COALESCE_MS)
+
+    def title_changed(self, tab, title: str):
+        """The page title changed"""
+        self.stats["events"] += 1
+        state = self._state(tab)
+        if state.loading or state.inpage_url:
+            state.title = title
+        elif state.committed_url and title:
+            # Already written: fix up the title instead of adding a visit
+            self.storage.update_history_title(state.committed_url, title)
+
+    def load_finished(self, tab, ok: bool, final_url: str, title: str = ""):
+        """A navigation ended; write it if it succeeded"""
+        self.stats["events"] += 1
+        state = self._state(tab)
+        if not state.loading:
+            return
+        state.loading = False
+        chain = state.chain or [final_url]
+        if chain[-1] != final_url:
+            chain.append(final_url)
+        state.chain = []
+        # Only the one load is skipped, whether or not it is recorded
+        skip, state.skip_load = state.skip_load, False
+
+        if not ok or not is_recordable(final_url):
+            state.typed = False
+            return
+
+        if skip:
+            state.committed_url = final_url
+            state.committed_at = time.time()
+            return
+
+        # A reload or repeated load of the same page shortly after is not a new visit
+        now = time.time()
+        if final_url == state.committed_url and now - state.committed_at < COALESCE_MS / 1000:
+            return
+
+        source = next((url for url in chain if url != final_url and is_recordable(url)), None)
+        self._write(state, final_url, title or state.title, source)
+
+    def forget(self, tab):
+        """The tab was closed"""
+        state = self._tabs.pop(tab, None)
+        if state is not None:
+            self._flush_inpage(tab, state)
+            if state.inpage_timer is not None:
+                state.inpage_timer.stop()
+                state.inpage_timer.deleteLater()
+
+    def _flush_inpage(self, tab, state: _TabState):
+        """Write a pending in-page navigation"""
+        if state.inpage_timer is not None:
+            state.inpage_timer.stop()
+        url, state.inpage_url = state.inpage_url, None
+        if url and url != state.committed_url:
+            self._write(state, url, state.title, state.committed_url)
+
+    def _write(self, state: _TabState, url: str, title: str, source: str):
+        """Record one visit"""
+        self.storage.add_history_entry(url, title, typed=state.typed, source_url=source)
+        self.stats["writes"] += 1
+        state.typed = False
+        state.committed_url = url
+        state.committed_at = time.time()
@@ -5,11 +5,25 @@ Handles displaying website contents
 
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
-from PyQt6.QtCore import pyqtSignal, QUrl
+from PyQt6.QtCore import pyqtSignal, QUrl, QTimer
 from PyQt6.QtWebEngineCore import QWebEngineUrlRequestInterceptor
 import re
 import os
 
+
+def new_tab_url() -> str:
+    """URL of the bundled new tab page"""
+    new_tab_path = os.path.join(
+        os.path.dirname(__file__), 
+        "..", 
+        "utils", 
+        "browser_websites", 
+        "newtab.html"
+    )
+    new_tab_path = os.path.abspath(new_tab_path)
+    return f"file:///{new_tab_path.replace(os.sep, '/')}"
+
+
 class WebView(QWebEngineView):
     """Custom web view with additional functionality"""
     
@@ -21,9 +35,6 @@ class WebView(QWebEngineView):
     
     def __init__(self, profile=None, parent=None):
         super().__init__(parent)
-
-        # Attach adblocker
-        profile.setUrlRequestInterceptor(AdBlocker())
         
         if profile:
             page = QWebEnginePage(profile, self)
@@ -91,15 +102,33 @@ class WebView(QWebEngineView):
 
 
 class WebViewManager:
-    """Manages web view profiles and settings"""
+    """Manages web view profiles and settings.
+    
+    Keeps a pool of POOL_SIZE web views that already show the new tab page,
+    so opening a new tab doesn't wait for a view, page and renderer to be
+    created and the page read from disk. The pool is topped up
+    REFILL_DELAY_MS after a view is taken, one view at a time.
+    """
+    
+    POOL_SIZE = 2
+    REFILL_DELAY_MS = 1000
     
     def __init__(self):
         self.default_profile = QWebEngineProfile.defaultProfile()
         self.private_profile = QWebEngineProfile()
         
+        # One ad blocker for every view; its filter lists are loaded once
+        self.ad_blocker = AdBlocker()
+        
         # Configure profiles
         self._configure_profile(self.default_profile, False)
         self._configure_profile(self.private_profile, True)
+        
+        # Hidden web views showing the new tab page, oldest first
+        self._pool = []
+        self._refill_timer = QTimer()
+        self._refill_timer.setSingleShot(True)
+        self._refill_timer.timeout.connect(self._refill_pool)
     
     def _configure_profile(self, profile: QWebEngineProfile, is_private: bool):
         """Configure a web engine profile"""
@@ -108,6 +137,8 @@ class WebViewManager:
                 QWebEngineProfile.PersistentCookiesPolicy.NoPersistentCookies
             )
         
+        profile.setUrlRequestInterceptor(self.ad_blocker)
+        
         # Set user agent
         profile.setHttpUserAgent(
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
@@ -118,6 +149,37 @@ class WebViewManager:
         """Create a new web view"""
         profile = self.private_profile if is_private else self.default_profile
         return WebView(profile, parent)
+    
+    def start_pool(self):
+        """Start filling the new tab pool once the event loop is idle"""
+        self._refill_timer.start(0)
+    
+    def new_tab_view(self) -> WebView:
+        """A web view showing the new tab page, from the pool if one is ready"""
+        view = self._pool.pop(0) if self._pool else None
+        if not self._refill_timer.isActive():
+            self._refill_timer.start(self.REFILL_DELAY_MS)
+        if view is None:
+            view = self.create_web_view()
+            view.load_url(new_tab_url())
+        return view
+    
+    def _refill_pool(self):
+        """Add one view to the pool, and schedule the next if it's still short"""
+        if len(self._pool) >= self.POOL_SIZE:
+            return
+        view = self.create_web_view()
+        view.load_url(new_tab_url())
+        self._pool.append(view)
+        if len(self._pool) < self.POOL_SIZE:
+            self._refill_timer.start(self.REFILL_DELAY_MS)
+    
+    def clear_pool(self):
+        """Delete the pooled views"""
+        self._refill_timer.stop()
+        for view in self._pool:
+            view.deleteLater()
+        self._pool = []
 
 class AdBlocker(QWebEngineUrlRequestInterceptor):
     def __init__(self):
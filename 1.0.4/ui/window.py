@@ -5,25 +5,36 @@ Creates the browser window and manages the overall layout
 
 import sys
 import os
-from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget
-from PyQt6.QtGui import QIcon, QColor
+import json
+from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget,
+                             QFileDialog, QMessageBox)
+from PyQt6.QtGui import QIcon, QKeySequence, QShortcut
 from PyQt6.QtCore import Qt, QUrl
 
 # Import UI components
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from ui.theme import Theme
 from ui.menus import MenuManager
 from ui.toolbar import NavigationToolbar, TabWidget
-from ui.webview import WebView, WebViewManager
+from ui.webview import WebView, new_tab_url
+from ui.tab import BrowserTab
+from ui.tab_list import TabListView
+from ui.tab_switcher import TabSwitcherDialog
 from ui.settings_dialog import SettingsDialog
+from ui.history_dialog import HistoryDialog
+from ui.task_manager import TaskManagerDialog
+from ui.services import BrowserServices
 from core.storage import Storage
+from core.process_model import ProcessModel
+from ui.suggestions import (SuggestionPipeline, HistoryProvider, BookmarkProvider,
+                            OpenTabsProvider, SearchProvider)
 
 
 class BrowserWindow(QMainWindow):
     """Main browser window"""
     
-    def __init__(self):
+    def __init__(self, services: BrowserServices = None, window_id: int = None,
+                 initial_tab: bool = True):
         super().__init__()
 
         # Set icon directory for IconLoader
@@ -32,48 +43,40 @@ class BrowserWindow(QMainWindow):
         from ui.toolbar import IconLoader
         IconLoader.set_icon_directory(icon_dir)
         
-        # Initialize storage
-        self.storage = Storage()
+        # Storage, theme and profiles are shared with every other window
+        self.services = services or BrowserServices.instance()
+        self.window_id = self.services.new_window_id(window_id)
+        self.storage = self.services.storage
+        self.autocomplete = self.services.autocomplete
+        self.visit_recorder = self.services.visit_recorder
+        self.theme = self.services.theme
+        self.webview_manager = self.services.webview_manager
+        self.tabs = self.services.tabs
         
         # Initialize managers
-        self.theme = Theme()
         self.menu_manager = MenuManager()
-        self.webview_manager = WebViewManager()
-        
-        # Load saved settings
-        self._load_settings()
+        self.suggestion_pipeline = SuggestionPipeline([
+            OpenTabsProvider(self._open_tabs),
+            BookmarkProvider(self.storage),
+            HistoryProvider(self.autocomplete, self.storage),
+            SearchProvider(),
+        ], parent=self)
         
         # Setup window
         self._setup_window()
         self._setup_ui()
         self._connect_signals()
         self._apply_theme()
+        self.services.window_opened(self)
         
-        # Create first tab
-        self.create_new_tab()
+        # Create first tab (restored windows get theirs from restore_tabs)
+        self._restoring_tabs = False
+        # Whether a drag in the tab bar moved tabs, checked against pinned tabs when dropped
+        self._tabs_dragged = False
+        if initial_tab:
+            self.create_new_tab()
         self.toolbar.new_tab_clicked.connect(self.create_new_tab)
     
-    def _load_settings(self):
-        """Load settings from storage"""
-        settings = self.storage.load_settings()
-        
-        # Apply dark mode
-        self.theme.dark_mode = settings.get('dark_mode', False)
-        
-        # Apply accent color
-        accent_color_hex = settings.get('accent_color', '#4285f4')
-        self.theme.accent_color = QColor(accent_color_hex)
-    
-    def _save_settings(self):
-        """Save current settings to storage"""
-        settings = {
-            'dark_mode': self.theme.dark_mode,
-            'accent_color': self.theme.accent_color.name(),
-            'home_url': 'https://www.google.com',
-            'default_zoom': 1.0
-        }
-        self.storage.save_settings(settings)
-    
     def _setup_window(self):
         """Configure main window"""
         self.setWindowTitle("")
@@ -100,9 +103,16 @@ class BrowserWindow(QMainWindow):
         self.toolbar = NavigationToolbar()
         layout.addWidget(self.toolbar)
         
-        # Tab widget
+        # Tab widget, with an optional vertical tab list beside it
+        tabs_layout = QHBoxLayout()
+        tabs_layout.setContentsMargins(0, 0, 0, 0)
+        tabs_layout.setSpacing(0)
         self.tab_widget = TabWidget()
-        layout.addWidget(self.tab_widget)
+        self.tab_list = TabListView(self.tab_widget)
+        tabs_layout.addWidget(self.tab_list)
+        tabs_layout.addWidget(self.tab_widget)
+        layout.addLayout(tabs_layout)
+        self.set_vertical_tabs(self.storage.get_setting('vertical_tabs', False))
     
     def _connect_signals(self):
         """Connect all signals"""
@@ -112,29 +122,51 @@ class BrowserWindow(QMainWindow):
         self.toolbar.reload_clicked.connect(self._on_reload_clicked)
         self.toolbar.home_clicked.connect(self._on_home_clicked)
         self.toolbar.menu_clicked.connect(self._on_menu_clicked)
+        self.toolbar.bookmark_clicked.connect(self._on_bookmark_clicked)
         self.toolbar.navigate_to_url.connect(self._on_navigate_to_url)
+        self.toolbar.address_bar.set_suggestion_pipeline(self.suggestion_pipeline)
+        self.suggestion_pipeline.suggestions_changed.connect(self._on_suggestions_changed)
         
         # Tab widget signals
         self.tab_widget.new_tab_requested.connect(lambda: self.create_new_tab())
         self.tab_widget.tab_changed.connect(self._on_tab_changed)
         self.tab_widget.tab_close_requested.connect(self._on_tab_close_requested)
         self.tab_widget.tab_context_menu_requested.connect(self._on_tab_context_menu)
+        self.tab_widget.tabs_updated.connect(self._on_tabs_updated)
+        self.tab_widget.tab_bar.tabMoved.connect(self._on_tab_moved)
+        self.tab_widget.tab_bar.drag_finished.connect(self._on_tab_drag_finished)
         
         # Menu signals
         self.menu_manager.new_tab_requested.connect(lambda: self.create_new_tab())
         self.menu_manager.new_window_requested.connect(self._on_new_window)
         self.menu_manager.settings_requested.connect(self._on_settings)
+        self.menu_manager.history_requested.connect(self._on_history)
+        self.menu_manager.import_bookmarks_requested.connect(self._on_import_bookmarks)
+        self.menu_manager.export_bookmarks_requested.connect(self._on_export_bookmarks)
+        self.menu_manager.task_manager_requested.connect(self._on_task_manager)
+        self.menu_manager.vertical_tabs_toggled.connect(self._on_vertical_tabs_toggled)
+        self.menu_manager.search_tabs_requested.connect(self._on_search_tabs)
         self.menu_manager.quit_requested.connect(self.close)
         self.menu_manager.close_tab_requested.connect(self._on_tab_close_requested)
         self.menu_manager.reload_tab_requested.connect(self._on_reload_tab)
         self.menu_manager.duplicate_tab_requested.connect(self._on_duplicate_tab)
+        self.menu_manager.pin_tab_requested.connect(self._on_pin_tab)
+        self.menu_manager.mute_tab_requested.connect(self._on_mute_tab)
+        self.menu_manager.close_other_tabs_requested.connect(self._on_close_other_tabs)
+        self.menu_manager.close_tabs_right_requested.connect(self._on_close_tabs_right)
+        self.menu_manager.close_duplicate_tabs_requested.connect(self._on_close_duplicate_tabs)
+        self.menu_manager.close_site_tabs_requested.connect(self._on_close_site_tabs)
         self.menu_manager.zoom_in_requested.connect(self._on_zoom_in)
         self.menu_manager.zoom_out_requested.connect(self._on_zoom_out)
         self.menu_manager.zoom_reset_requested.connect(self._on_zoom_reset)
         
+        # Keyboard shortcuts; the main menu is built when opened, so the
+        # shortcuts shown on its actions only work while it is open
+        QShortcut(QKeySequence("Ctrl+Shift+A"), self, self._on_search_tabs)
+        QShortcut(QKeySequence("Shift+Esc"), self, self._on_task_manager)
+        
         # Theme signals
         self.theme.theme_changed.connect(self._apply_theme)
-        self.theme.theme_changed.connect(self._save_settings)
     
     def _apply_theme(self):
         """Apply current theme"""
@@ -142,49 +174,120 @@ class BrowserWindow(QMainWindow):
     
     def _get_new_tab_url(self) -> str:
         """Get the URL for new tab page"""
-        new_tab_path = os.path.join(
-            os.path.dirname(__file__), 
-            "..", 
-            "utils", 
-            "browser_websites", 
-            "newtab.html"
-        )
-        new_tab_path = os.path.abspath(new_tab_path)
-        return f"file:///{new_tab_path.replace(os.sep, '/')}"
+        return new_tab_url()
     
-    def create_new_tab(self, url: str = None) -> int:
-        """Create a new browser tab"""
+    def _is_new_tab_url(self, url: str) -> bool:
+        """Check whether a URL points at the bundled new tab page"""
+        return url.startswith('file://') and url.endswith('newtab.html')
+    
+    def create_new_tab(self, url: str = None, title: str = "", background: bool = False) -> int:
+        """Create a new browser tab.
+        
+        Background tabs stay placeholders (no web view, no network) until they
+        are first activated.
+        """
         if url is None:
             url = self._get_new_tab_url()
         
-        webview = self.webview_manager.create_web_view()
+        # A new tab page shown right away comes ready-made from the pool
+        factory = self.webview_manager.create_web_view
+        if url == self._get_new_tab_url() and not background:
+            factory = self.webview_manager.new_tab_view
+        tab = BrowserTab(factory, url, title)
+        index = self._add_tab(tab, background)
+        if not background:
+            tab.ensure_loaded()
+        return index
+    
+    def restore_tabs(self, tabs: list, current_tab_id: int = None):
+        """Add tabs from a saved session as placeholders; only the current one loads"""
+        current_index = 0
+        self._restoring_tabs = True
+        try:
+            for saved in tabs:
+                tab = BrowserTab(self.webview_manager.create_web_view, saved["url"],
+                                 saved["title"], tab_id=saved["id"])
+                scroll = (saved["scroll_x"], saved["scroll_y"])
+                tab.restore_state(saved["history"], scroll if any(scroll) else None)
+                index = self._add_tab(tab, background=True, saved=True)
+                if saved["id"] == current_tab_id:
+                    current_index = index
+        finally:
+            self._restoring_tabs = False
+        self.tab_widget.setCurrentIndex(current_index)
+        self._on_tab_changed(current_index)
+    
+    def _add_tab(self, tab: BrowserTab, background: bool, saved: bool = False) -> int:
+        """Put a tab in the tab widget and start tracking it"""
+        tab.view_created.connect(lambda webview: self._on_view_created(tab, webview))
+        tab.restoring.connect(self.visit_recorder.skip_next_load)
+        tab.view_destroyed.connect(self.visit_recorder.forget)
+        tab.view_destroyed.connect(self.tabs.view_destroyed)
+        tab.view_destroyed.connect(lambda: self.tab_widget.queue_update(tab, audible=False))
+        self.tabs.add(tab, self)
         
-        # Connect webview signals
+        index = self.tab_widget.add_tab(tab, tab.title or "New Tab", activate=not background)
+        self.services.session.tab_added(self, tab, saved)
+        return index
+    
+    def _on_view_created(self, tab: BrowserTab, webview: WebView):
+        """Connect a tab's web view once it exists; its signals are routed by tab id"""
+        self.tabs.view_created(tab, webview)
+        tab_id = tab.tab_id
         webview.title_changed_signal.connect(
-            lambda title: self._on_webview_title_changed(webview, title)
+            lambda title: self._on_webview_title_changed(tab_id, title)
         )
         webview.url_changed_signal.connect(
-            lambda url: self._on_webview_url_changed(webview, url)
+            lambda url: self._on_webview_url_changed(tab_id, url)
         )
         webview.loading_changed_signal.connect(
-            lambda loading: self._on_webview_loading_changed(webview, loading)
+            lambda loading: self._on_webview_loading_changed(tab_id, loading)
         )
+        webview.icon_changed_signal.connect(lambda: self._on_webview_icon_changed(tab_id))
+        self._connect_page(tab_id, webview.page())
         
-        # Add tab
-        index = self.tab_widget.add_tab(webview, "New Tab")
-        
-        # Load URL
-        webview.load_url(url)
-        
-        return index
+        # A pooled new tab page finished loading before it was connected
+        if self._is_new_tab_url(webview.get_url()) and not webview.page().isLoading():
+            self._show_top_sites(webview)
+        webview.loadStarted.connect(lambda: self.visit_recorder.load_started(webview))
+        webview.loadFinished.connect(
+            lambda ok: self.visit_recorder.load_finished(
+                webview, ok, webview.get_url(), webview.title()
+            )
+        )
+    
+    def _connect_page(self, tab_id: int, page):
+        """Connect signals the view doesn't forward from its page, and apply the tab's mute"""
+        self.tabs.page_attached(tab_id, page)
+        page.recentlyAudibleChanged.connect(
+            lambda audible: self._on_webview_audible_changed(tab_id, audible)
+        )
+    
+    def _open_tabs(self) -> list:
+        """(url, title) of every open tab, for tab suggestions"""
+        tabs = []
+        for index in range(self.tab_widget.count()):
+            tab = self.tab_widget.widget(index)
+            if tab:
+                tabs.append((tab.get_url(), tab.get_title()))
+        return tabs
+    
+    def _live_tab(self, tab_id: int) -> BrowserTab:
+        """The tab of this window with an id, if it still has a web view"""
+        record = self.tabs.get(tab_id)
+        if record is None or record.window is not self or record.tab.webview is None:
+            return None
+        return record.tab
     
     def _get_current_webview(self) -> WebView:
         """Get currently active webview"""
-        return self.tab_widget.currentWidget()
+        tab = self.tab_widget.currentWidget()
+        return tab.webview if tab else None
     
     def _get_webview_at(self, index: int) -> WebView:
-        """Get webview at specific index"""
-        return self.tab_widget.widget(index)
+        """Get webview at specific index (None for a tab not loaded yet)"""
+        tab = self.tab_widget.widget(index)
+        return tab.webview if tab else None
     
     # Toolbar action handlers
     def _on_back_clicked(self):
@@ -221,22 +324,67 @@ class BrowserWindow(QMainWindow):
             self.toolbar.menu_btn.rect().bottomLeft()
         ))
     
+    def _on_suggestions_changed(self, suggestions: list):
+        """Let the prerenderer warm up a likely destination"""
+        webview = self._get_current_webview()
+        if webview:
+            self.services.prerenderer.suggestions_changed(
+                self.suggestion_pipeline.text, suggestions, webview.page().profile()
+            )
+    
     def _on_navigate_to_url(self, url: str):
         """Handle URL navigation"""
+        tab = self.tab_widget.currentWidget()
         webview = self._get_current_webview()
         if webview:
-            webview.load_url(url)
-            # Add to history if it's a real URL
-            if url and not url.startswith('file://'):
-                self.storage.add_history_entry(url, webview.get_title())
+            # History is written by the visit recorder once the load finishes
+            self.visit_recorder.mark_typed(webview)
+            page = self.services.prerenderer.take(
+                url, webview.page().profile(), adopt=tab.can_adopt_page()
+            )
+            if page is None:
+                webview.load_url(url)
+                return
+            
+            # Swap in the prerendered page, recording it as this navigation
+            self.visit_recorder.load_started(webview)
+            tab.adopt_page(page)
+            self._connect_page(tab.tab_id, page)
+            self.toolbar.set_loading(page.isLoading())
+            if not page.isLoading():
+                self.visit_recorder.load_finished(webview, True, webview.get_url(), webview.title())
+    
+    def _on_bookmark_clicked(self):
+        """Toggle the bookmark for the current page"""
+        webview = self._get_current_webview()
+        if not webview:
+            return
+        url = webview.get_url()
+        if not url or url.startswith('file://'):
+            return
+        if self.storage.is_bookmarked(url):
+            self.storage.remove_bookmark(url)
+        else:
+            self.storage.add_bookmark(url, webview.get_title())
+        self._update_bookmark_state(url)
+    
+    def _update_bookmark_state(self, url: str):
+        """Show whether a URL is bookmarked (a dict lookup, cheap on every navigation)"""
+        self.toolbar.set_bookmarked(self.storage.is_bookmarked(url))
     
     # Tab action handlers
     def _on_tab_changed(self, index: int):
         """Handle tab change"""
-        webview = self._get_webview_at(index)
-        if webview:
+        tab = self.tab_widget.widget(index)
+        if tab and not self._restoring_tabs:
+            # First activation of a placeholder tab creates and loads its view
+            webview = tab.ensure_loaded()
+            
+            self.tabs.activated(tab)
+            
             # Update address bar
-            self.toolbar.set_address(webview.get_url())
+            self.toolbar.set_address(tab.get_url())
+            self._update_bookmark_state(tab.get_url())
             
             # Update navigation buttons
             self.toolbar.update_buttons(
@@ -249,56 +397,212 @@ class BrowserWindow(QMainWindow):
     
     def _on_tab_close_requested(self, index: int):
         """Handle tab close request"""
+        tab = self.tab_widget.widget(index)
+        if tab is None:
+            return
         if self.tab_widget.count() > 1:
+            if tab.webview:
+                self.visit_recorder.forget(tab.webview)
+            self.services.session.tab_removed(self, tab)
+            self.tabs.remove(tab)
             self.tab_widget.close_tab(index)
         else:
             # Don't close last tab, just navigate to new tab
-            webview = self._get_webview_at(index)
-            if webview:
-                webview.load_url(self._get_new_tab_url())
+            tab.navigate(self._get_new_tab_url())
+    
+    def close_tabs(self, tabs: list):
+        """Close several tabs at once (see TabWidget.close_tabs); pinned tabs stay open"""
+        closing = {tab for tab in tabs if not self.tabs.is_pinned(tab)}
+        if not closing:
+            return
+        open_tabs = self._tabs_in_order()
+        remaining = [tab for tab in open_tabs if tab not in closing]
+        if not remaining:
+            # Like closing the last tab: keep the current one, on the new tab page
+            current = self.tab_widget.currentWidget()
+            closing.discard(current)
+            current.navigate(self._get_new_tab_url())
+        elif self.tab_widget.currentWidget() in closing:
+            # Show the nearest tab that stays, preferring the right
+            position = open_tabs.index(self.tab_widget.currentWidget())
+            after = [tab for tab in open_tabs[position:] if tab not in closing]
+            self.tab_widget.setCurrentWidget(after[0] if after else remaining[-1])
+        
+        for tab in closing:
+            if tab.webview:
+                self.visit_recorder.forget(tab.webview)
+            self.services.session.tab_removed(self, tab)
+            self.tabs.remove(tab)
+        self.tab_widget.close_tabs(list(closing))
+    
+    def _tabs_in_order(self) -> list:
+        return [self.tab_widget.widget(index) for index in range(self.tab_widget.count())]
+    
+    def _on_close_other_tabs(self, index: int):
+        """Close every tab but one"""
+        keep = self.tab_widget.widget(index)
+        if keep is not None:
+            self.tab_widget.setCurrentWidget(keep)
+            self.close_tabs([tab for tab in self._tabs_in_order() if tab is not keep])
+    
+    def _on_close_tabs_right(self, index: int):
+        """Close the tabs after one"""
+        self.close_tabs(self._tabs_in_order()[index + 1:])
+    
+    def _on_close_duplicate_tabs(self):
+        """Close tabs showing the same page as another, keeping the current or first one"""
+        current = self.tab_widget.currentWidget()
+        kept = {}
+        for tab in self._tabs_in_order():
+            key = QUrl(tab.get_url()).adjusted(QUrl.UrlFormattingOption.RemoveFragment).toString()
+            if key not in kept or tab is current:
+                kept[key] = tab
+        keep = set(kept.values())
+        self.close_tabs([tab for tab in self._tabs_in_order() if tab not in keep])
+    
+    def _on_close_site_tabs(self, index: int):
+        """Close every tab on the same site as one"""
+        tab = self.tab_widget.widget(index)
+        if tab is None:
+            return
+        host = QUrl(tab.get_url()).host().removeprefix("www.")
+        if not host:
+            return
+        self.close_tabs([
+            other for other in self._tabs_in_order()
+            if QUrl(other.get_url()).host().removeprefix("www.") == host
+        ])
     
     def _on_tab_context_menu(self, index: int, position):
         """Handle tab context menu request"""
-        menu = self.menu_manager.create_tab_context_menu(index)
+        tab = self.tab_widget.widget(index)
+        if tab is None:
+            return
+        menu = self.menu_manager.create_tab_context_menu(
+            index, is_pinned=self.tabs.is_pinned(tab), is_muted=self.tabs.is_muted(tab)
+        )
         menu.exec(position)
     
+    def _on_pin_tab(self, index: int):
+        """Pin or unpin a tab; pinned tabs sit together at the start of the tab bar"""
+        tab = self.tab_widget.widget(index)
+        if tab is None:
+            return
+        pinned = not self.tabs.is_pinned(tab)
+        self.tabs.set_pinned(tab, pinned)
+        # Pinning moves the tab to the end of the pinned ones, unpinning to just after them
+        others = sum(1 for record in self.tabs.pinned(self) if record.tab is not tab)
+        if index != others:
+            self.tab_widget.tabBar().moveTab(index, others)
+        self.tab_widget.queue_update(tab, pinned=pinned)
+    
+    def _on_tab_moved(self, from_index: int, to_index: int):
+        """Keep pinned tabs first when tabs are moved"""
+        if QApplication.mouseButtons() & Qt.MouseButton.LeftButton:
+            # Mid-drag; moving tabs under the cursor would fight the drag
+            self._tabs_dragged = True
+        else:
+            self._keep_pinned_first()
+    
+    def _on_tab_drag_finished(self):
+        if self._tabs_dragged:
+            self._tabs_dragged = False
+            self._keep_pinned_first()
+    
+    def _keep_pinned_first(self):
+        """Move pinned tabs back in front of the others, keeping their order"""
+        pinned = [tab for tab in self._tabs_in_order() if self.tabs.is_pinned(tab)]
+        for position, tab in enumerate(pinned):
+            index = self.tab_widget.tab_index(tab)
+            if index != position:
+                # The tabMoved this causes finds nothing left out of place
+                self.tab_widget.tabBar().moveTab(index, position)
+    
+    def _on_mute_tab(self, index: int):
+        """Mute or unmute a tab's sound"""
+        tab = self.tab_widget.widget(index)
+        if tab is None:
+            return
+        muted = not self.tabs.is_muted(tab)
+        self.tabs.set_muted(tab, muted)
+        self.tab_widget.queue_update(tab, muted=muted)
+    
     # WebView event handlers
-    def _on_webview_title_changed(self, webview: WebView, title: str):
+    def _on_webview_title_changed(self, tab_id: int, title: str):
         """Handle webview title change"""
-        index = self.tab_widget.indexOf(webview)
-        if index >= 0:
-            self.tab_widget.update_tab_title(index, title)
-            
-            # Update window title if it's the current tab
-            if index == self.tab_widget.currentIndex():
-                self.setWindowTitle("Aether Browser")
+        tab = self._live_tab(tab_id)
+        if tab is None:
+            return
+        self.visit_recorder.title_changed(tab.webview, tab.webview.title())
+        # Drawn with the next batch of tab bar updates (see _on_tabs_updated)
+        self.tab_widget.queue_update(tab, title=title)
+    
+    def _on_webview_icon_changed(self, tab_id: int):
+        """Handle favicon change"""
+        tab = self._live_tab(tab_id)
+        if tab is not None:
+            self.tab_widget.queue_update(tab, icon=tab.webview.icon())
+    
+    def _on_webview_audible_changed(self, tab_id: int, audible: bool):
+        """Handle a page starting or stopping sound"""
+        self.tabs.set_audible(tab_id, audible)
+        tab = self._live_tab(tab_id)
+        if tab is not None:
+            self.tab_widget.queue_update(tab, audible=audible)
+    
+    def _on_tabs_updated(self, tabs: list):
+        """A batch of tab titles and icons was drawn"""
+        # Update window title if it's the current tab
+        if self.tab_widget.currentWidget() in tabs:
+            self.setWindowTitle("Aether Browser")
     
-    def _on_webview_url_changed(self, webview: WebView, url: QUrl):
+    def _on_webview_url_changed(self, tab_id: int, url: QUrl):
         """Handle webview URL change"""
-        if webview == self._get_current_webview():
+        tab = self._live_tab(tab_id)
+        if tab is None:
+            return
+        webview = tab.webview
+        self.visit_recorder.url_changed(webview, url.toString())
+        if tab is self.tab_widget.currentWidget():
             url_string = url.toString()
             self.toolbar.set_address(url_string)
+            self._update_bookmark_state(url_string)
             
             # Update navigation buttons
             self.toolbar.update_buttons(
                 webview.page().history().canGoBack(),
                 webview.page().history().canGoForward()
             )
-            
-            # Add to history if it's a real URL
-            if url_string and not url_string.startswith('file://'):
-                self.storage.add_history_entry(url_string, webview.get_title())
     
-    def _on_webview_loading_changed(self, webview: WebView, loading: bool):
+    def _on_webview_loading_changed(self, tab_id: int, loading: bool):
         """Handle webview loading state change"""
-        if webview == self._get_current_webview():
+        tab = self._live_tab(tab_id)
+        if tab is None:
+            return
+        webview = tab.webview
+        self.tab_widget.queue_update(tab, loading=loading)
+        if tab is self.tab_widget.currentWidget():
             # Update toolbar loading state
             self.toolbar.set_loading(loading)
+        
+        # Fill in the new tab page's top sites once it has loaded
+        if not loading and self._is_new_tab_url(webview.get_url()):
+            self._show_top_sites(webview)
+    
+    def _show_top_sites(self, webview: WebView):
+        """Pass the most used sites to the new tab page"""
+        sites = [
+            {"url": site["url"], "title": site["title"] or site["url"]}
+            for site in self.storage.top_sites(8)
+        ]
+        webview.page().runJavaScript(
+            f"window.showTopSites && window.showTopSites({json.dumps(sites)});"
+        )
     
     # Menu action handlers
     def _on_new_window(self):
         """Create new browser window"""
-        new_window = BrowserWindow()
+        new_window = BrowserWindow(self.services)
         new_window.show()
     
     def _on_settings(self):
@@ -306,6 +610,63 @@ class BrowserWindow(QMainWindow):
         dialog = SettingsDialog(self.theme, self)
         dialog.exec()
     
+    def _on_history(self):
+        """Open history dialog"""
+        dialog = HistoryDialog(self.storage, self)
+        dialog.open_url_requested.connect(self.create_new_tab)
+        dialog.exec()
+    
+    def _on_import_bookmarks(self):
+        """Import bookmarks from another browser's export"""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Bookmarks", "", "Bookmark files (*.html *.htm *.json);;All files (*)"
+        )
+        if not path:
+            return
+        try:
+            count = self.storage.import_bookmarks(path)
+        except Exception as e:
+            QMessageBox.warning(self, "Import Bookmarks", f"Could not import bookmarks: {e}")
+            return
+        QMessageBox.information(self, "Import Bookmarks", f"Imported {count} bookmarks.")
+        webview = self._get_current_webview()
+        if webview:
+            self._update_bookmark_state(webview.get_url())
+    
+    def _on_export_bookmarks(self):
+        """Export bookmarks to a file"""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Bookmarks", "bookmarks.html", "HTML (*.html);;JSON (*.json)"
+        )
+        if not path:
+            return
+        try:
+            self.storage.export_bookmarks(path)
+        except Exception as e:
+            QMessageBox.warning(self, "Export Bookmarks", f"Could not export bookmarks: {e}")
+    
+    def _on_task_manager(self):
+        """Show per-tab CPU and memory use"""
+        dialog = TaskManagerDialog(self.services.tab_lifecycle, self)
+        dialog.exec()
+    
+    def _on_search_tabs(self):
+        """Find an open tab in any window"""
+        dialog = TabSwitcherDialog(self.tabs, self)
+        dialog.exec()
+    
+    def set_vertical_tabs(self, enabled: bool):
+        """Show tabs in the sidebar list instead of the tab bar"""
+        self.tab_widget.set_strip_visible(not enabled)
+        self.tab_list.setVisible(enabled)
+        self.menu_manager.vertical_tabs = enabled
+    
+    def _on_vertical_tabs_toggled(self, enabled: bool):
+        """Switch every window between the tab bar and vertical tabs"""
+        self.storage.set_setting('vertical_tabs', enabled)
+        for window in self.services.windows:
+            window.set_vertical_tabs(enabled)
+    
     def _on_reload_tab(self, index: int):
         """Reload specific tab"""
         webview = self._get_webview_at(index)
@@ -314,9 +675,9 @@ class BrowserWindow(QMainWindow):
     
     def _on_duplicate_tab(self, index: int):
         """Duplicate specific tab"""
-        webview = self._get_webview_at(index)
-        if webview:
-            url = webview.get_url()
+        tab = self.tab_widget.widget(index)
+        if tab:
+            url = tab.get_url()
             if url.startswith('file://'):
                 url = self._get_new_tab_url()
             self.create_new_tab(url)
@@ -341,12 +702,17 @@ class BrowserWindow(QMainWindow):
     
     def closeEvent(self, event):
         """Handle window close event"""
-        self._save_settings()
+        self.theme.theme_changed.disconnect(self._apply_theme)
+        self.services.window_closed(self)
         event.accept()
 
 
 def main():
     """Main entry point"""
+    # The renderer process model is fixed when QtWebEngine starts
+    storage = Storage()
+    ProcessModel.apply(storage.settings)
+    
     app = QApplication(sys.argv)
     
     # Set application details
@@ -354,9 +720,15 @@ def main():
     app.setApplicationDisplayName("")
     app.setOrganizationName("")
     
-    # Create and show main window
-    window = BrowserWindow()
-    window.show()
+    # Reopen the last session, or start with one window
+    services = BrowserServices.instance(storage)
+    windows = services.session.restore(
+        lambda window_id: BrowserWindow(services, window_id, initial_tab=False)
+    )
+    if not windows:
+        windows = [BrowserWindow(services)]
+    for window in windows:
+        window.show()
     
     sys.exit(app.exec())
 